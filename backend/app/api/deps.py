@@ -1,7 +1,14 @@
-from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, AsyncIterator
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db, read_router
+from app.core.instrumentation import timed
+from app.core.rbac import resolve_role
+from app.core.replicas import PIN_COOKIE, read_pin, set_request_user
 from app.core.security import decode_access_token
+from app.schemas.user import UserRole
 # Placeholder for User model schema - normally we'd import simple Pydantic models here
 from pydantic import BaseModel
 from typing import List
@@ -22,12 +29,17 @@ class User(BaseModel):
     role: str
     is_active: bool = True
 
-def get_current_user(token: Annotated[str, Depends(reusable_oauth2)]) -> TokenData:
+async def get_current_user(
+    token: Annotated[str, Depends(reusable_oauth2)],
+    db: Annotated[AsyncSession, Depends(get_async_db)]
+) -> TokenData:
     """
     Depedency to validate the JWT from the Authorization header.
-    Decodes the token and extracts the user ID (stub).
+    Decodes the token, extracts the user ID and resolves the user's role.
+    The session is shared with the endpoint and only opens a connection on a role-cache miss.
     """
-    payload = decode_access_token(token)
+    with timed("jwt"):
+        payload = decode_access_token(token)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,14 +51,40 @@ def get_current_user(token: Annotated[str, Depends(reusable_oauth2)]) -> TokenDa
     user_id: str = payload.get("sub")
     if user_id is None:
         raise HTTPException(status_code=401, detail="Token missing subject (sub)")
+    # Writes this request commits keep the user's next reads on the primary
+    set_request_user(user_id)
     
-    # In a full impl, we would check DB here OR rely on app_metadata claim if custom claims are set up
-    # For now, we return basic token data
-    # role = payload.get("app_metadata", {}).get("role", "user") 
-    
-    return TokenData(id=user_id, email=payload.get("email"), role="authenticated") # Defaulting role for now
+    # app_metadata claim if custom claims are set up, otherwise public.users (cached)
+    role = await resolve_role(user_id, payload, db)
+
+    # Users without a public.users row yet keep Supabase's generic role
+    return TokenData(id=user_id, email=payload.get("email"), role=role or "authenticated")
+
+async def get_read_db(
+    request: Request,
+    current_user: Annotated[TokenData, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_async_db)]
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only endpoints: a replica (round-robin) when replicas are configured,
+    otherwise, or if the user committed a write within READ_AFTER_WRITE_WINDOW (on this
+    worker, or on any worker per their pin cookie), the request's primary session.
+    Never write through it.
+    """
+    written_at = read_pin(settings.JWT_SECRET, request.cookies.get(PIN_COOKIE), current_user.id)
+    engine = read_router.read_engine(current_user.id, written_at)
+    if engine is None:
+        yield db
+        return
+    with timed("get_db"):
+        replica = AsyncSessionLocal(bind=engine)
+    try:
+        yield replica
+    finally:
+        with timed("get_db"):
+            await replica.close()
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: Annotated[TokenData, Depends(get_current_user)]
 ) -> TokenData:
     """
@@ -55,14 +93,12 @@ def get_current_active_user(
     # Logic to check strict 'active' status would go here
     return current_user
 
-def get_current_brand_user(
+async def get_current_brand_user(
     current_user: Annotated[TokenData, Depends(get_current_user)]
 ) -> TokenData:
     """
     RBAC: Enforce that the user is a Brand.
     """
-    # In real app: fetch user from DB and check public.users.role == 'brand'
-    # For MVP design phase:
-    # if current_user.role != 'brand':
-    #     raise HTTPException(status_code=403, detail="Not enough permissions")
+    if current_user.role != UserRole.BRAND.value:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
     return current_user
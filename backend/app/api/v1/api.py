@@ -1,6 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users
+from app.api.v1.endpoints import users, ingestion, payments, discovery
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(ingestion.router, prefix="/ingestion", tags=["ingestion"])
+api_router.include_router(payments.router, prefix="/payment", tags=["payments"])
+api_router.include_router(discovery.router, prefix="/discovery", tags=["discovery"])
 # api_router.include_router(campaigns.router, prefix="/campaigns", tags=["campaigns"])
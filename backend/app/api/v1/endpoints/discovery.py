@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.models.campaign import Campaign
+from app.schemas.discovery import (
+    CampaignMatch, CampaignMatchRequest, CampaignMatchResponse, DiscoverySort,
+    InfluencerSearch, InfluencerSearchResponse, NicheMatch, SemanticMatch, SemanticSearchResponse,
+    SimilarInfluencer, SimilarInfluencersResponse
+)
+from app.services.discovery.catalog import InfluencerCatalog
+from app.services.discovery.matching import CampaignProfile, campaign_profile, matching_engine
+from app.services.discovery.search import InvalidCursor, build_search_query, page_from_rows
+from app.services.discovery.semantic import get_semantic_index
+from app.services.discovery.similarity import similarity_engine
+from typing import Any, List, Optional
+from uuid import UUID
+
+router = APIRouter()
+
+@router.get("/influencers", response_model=InfluencerSearchResponse)
+async def search_influencers(
+    db: AsyncSession = Depends(deps.get_read_db),
+    niche: List[str] = Query([]),
+    niche_match: NicheMatch = NicheMatch.ALL,
+    min_followers: Optional[int] = None,
+    max_followers: Optional[int] = None,
+    min_engagement: Optional[float] = None,
+    max_engagement: Optional[float] = None,
+    sort: DiscoverySort = DiscoverySort.FOLLOWERS,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Search influencers by niche tags, follower band and engagement range.
+    Pages are keyset-paginated: pass `next_cursor` back as `cursor` for the next one.
+    """
+    try:
+        search = InfluencerSearch(
+            niche=niche, niche_match=niche_match,
+            min_followers=min_followers, max_followers=max_followers,
+            min_engagement=min_engagement, max_engagement=max_engagement,
+            sort=sort, limit=limit, cursor=cursor
+        )
+        query = build_search_query(search)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+    rows = (await db.execute(query)).all()
+    items, next_cursor = page_from_rows(search, rows)
+    return InfluencerSearchResponse(items=items, next_cursor=next_cursor)
+
+def _require_catalog(catalog: InfluencerCatalog) -> None:
+    if not catalog.loaded:
+        raise HTTPException(status_code=503, detail="Influencer catalog is still loading")
+
+def _similar_response(matches) -> SimilarInfluencersResponse:
+    return SimilarInfluencersResponse(
+        items=[SimilarInfluencer(user_id=user_id, similarity=score) for user_id, score in matches]
+    )
+
+@router.get("/similar", response_model=SimilarInfluencersResponse)
+def similar_to_tags(
+    tags: List[str] = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Influencers whose niche tags overlap most with `tags` (Jaccard similarity).
+    """
+    _require_catalog(similarity_engine.catalog)
+    return _similar_response(similarity_engine.similar_to_tags(tags, limit))
+
+@router.get("/influencers/{user_id}/similar", response_model=SimilarInfluencersResponse)
+def similar_to_influencer(
+    user_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Influencers whose niche tags overlap most with the given influencer's.
+    """
+    _require_catalog(similarity_engine.catalog)
+    matches = similarity_engine.similar_to_influencer(user_id, limit)
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Influencer not found")
+    return _similar_response(matches)
+
+@router.get("/semantic", response_model=SemanticSearchResponse)
+def semantic_search(
+    q: str = Query(..., min_length=1, max_length=1000),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Influencers whose bios read most like `q` (cosine similarity of text embeddings).
+    """
+    index = get_semantic_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Semantic search is not configured")
+    return SemanticSearchResponse(
+        items=[SemanticMatch(user_id=user_id, similarity=score) for user_id, score in index.search(q, limit)]
+    )
+
+def _match_response(profile: CampaignProfile, limit: int) -> CampaignMatchResponse:
+    return CampaignMatchResponse(
+        tags=profile.tags,
+        items=[CampaignMatch(**match._asdict()) for match in matching_engine.match(profile, limit)]
+    )
+
+@router.post("/matches", response_model=CampaignMatchResponse)
+def match_campaign(
+    campaign: CampaignMatchRequest,
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Ranks influencers for a (draft) campaign by niche overlap, follower tier fit for the
+    budget and engagement.
+    """
+    _require_catalog(matching_engine.catalog)
+    return _match_response(campaign_profile(campaign.title, campaign.description, campaign.budget), campaign.limit)
+
+@router.get("/campaigns/{campaign_id}/matches", response_model=CampaignMatchResponse)
+async def match_saved_campaign(
+    campaign_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user),
+) -> Any:
+    """
+    Matches for one of the brand's campaigns, ranked on demand (cached per campaign revision
+    and catalog snapshot, like `match_campaign`).
+    """
+    _require_catalog(matching_engine.catalog)
+    campaign = await db.get(Campaign, campaign_id)
+    if campaign is None or str(campaign.brand_id) != current_user.id:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    profile = campaign_profile(campaign.title, campaign.description, float(campaign.budget))
+    # Ranking is CPU-bound numpy work: keep it off the event loop, as the sync endpoints are
+    return await run_in_threadpool(_match_response, profile, limit)
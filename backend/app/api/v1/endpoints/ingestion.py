@@ -0,0 +1,28 @@
+import csv
+from functools import partial
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.database import get_db
+from app.schemas.ingestion import IngestionReport
+from app.services.ingestion.csv_ingestion import ingest_csv, upsert_profiles
+from typing import Any
+
+router = APIRouter()
+
+@router.post("/csv", response_model=IngestionReport)
+def ingest_influencer_csv(
+    *,
+    db: Session = Depends(get_db),
+    file: UploadFile = File(...),
+    current_user: deps.TokenData = Depends(deps.get_current_brand_user)
+) -> Any:
+    """
+    Bulk-upload influencers from a CSV (`handle, platform, followers, url, niche_tags`).
+    The file is streamed and upserted in batches; invalid rows are reported, not fatal.
+    """
+    try:
+        # The upload is already spooled to disk by Starlette, so reading it row by row keeps memory flat
+        return ingest_csv(file.file, writer=partial(upsert_profiles, db))
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
@@ -0,0 +1,49 @@
+import asyncio
+import json
+from fastapi import APIRouter, Header, HTTPException, Request
+from app.core.config import settings
+from app.services.payment.razorpay_service import get_payment_service
+from app.services.payment.webhooks import HANDLED_EVENTS, parse_webhook, webhook_processor
+from typing import Any, Optional
+
+router = APIRouter()
+
+@router.post("/webhook")
+async def razorpay_webhook(
+    request: Request,
+    x_razorpay_signature: Optional[str] = Header(None),
+    x_razorpay_event_id: Optional[str] = Header(None)
+) -> Any:
+    """
+    Razorpay webhook receiver. Verifies the signature, drops duplicates and queues
+    the event; the DB update happens in the background, so this returns in milliseconds.
+    """
+    payment_service = get_payment_service()
+    if not payment_service.webhook_secret() and not settings.RAZORPAY_WEBHOOK_ALLOW_UNSIGNED:
+        # Without a secret anyone could forge payment.captured; Razorpay retries once configured
+        raise HTTPException(status_code=503, detail="Webhook secret not configured")
+
+    body = await request.body()
+    if not payment_service.verify_webhook_signature(body, x_razorpay_signature):
+        raise HTTPException(status_code=400, detail="Invalid webhook signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    if not isinstance(payload, dict) or payload.get("event") not in HANDLED_EVENTS:
+        return {"status": "ignored"}
+
+    try:
+        event = parse_webhook(payload, x_razorpay_event_id, body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        if not webhook_processor.accept(event):
+            return {"status": "duplicate"}
+    except asyncio.QueueFull:
+        # Non-2xx makes Razorpay retry later
+        raise HTTPException(status_code=503, detail="Webhook queue full")
+    return {"status": "queued"}
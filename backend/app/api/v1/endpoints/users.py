@@ -1,82 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.http_cache import cached_response, conditional_response, profile_cache
 from app.models.user import User, Brand, Influencer
 from app.schemas import user as user_schema
+from app.services.ai.enrichment import enrich_influencer
 from typing import Any
+from uuid import UUID
 
 router = APIRouter()
 
+# Profile cache resource names
+ME = "users.me"
+
+def _user_uuid(current_user: deps.TokenData) -> UUID:
+    # Profiles are keyed by the Supabase user UUID; any other `sub` can't own one
+    try:
+        return UUID(current_user.id)
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Token subject is not a user id")
+
 @router.post("/onboard/brand", response_model=user_schema.BrandResponse)
-def onboard_brand(
+async def onboard_brand(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     brand_in: user_schema.BrandCreate,
     current_user: deps.TokenData = Depends(deps.get_current_user)
 ) -> Any:
     """
     Create a Brand Profile for the current user.
     """
-    # 1. Check if profile already exists
-    if db.query(Brand).filter(Brand.user_id == current_user.id).first():
+    user_id = _user_uuid(current_user)
+    # Single statement: INSERT ... ON CONFLICT DO NOTHING RETURNING.
+    # No row back means the profile already exists (also safe under concurrent sign-ups).
+    stmt = (
+        insert(Brand)
+        .values(
+            user_id=user_id,
+            company_name=brand_in.company_name,
+            industry=brand_in.industry,
+            website=str(brand_in.website) if brand_in.website else None,
+            verified=False
+        )
+        .on_conflict_do_nothing(index_elements=[Brand.user_id])
+        .returning(Brand)
+    )
+    db_brand = (await db.execute(stmt)).scalar_one_or_none()
+    if db_brand is None:
         raise HTTPException(status_code=400, detail="Brand profile already exists")
 
-    # 2. Create DB Object
-    db_brand = Brand(
-        user_id=current_user.id,
-        company_name=brand_in.company_name,
-        industry=brand_in.industry,
-        website=str(brand_in.website) if brand_in.website else None,
-        verified=False
-    )
-    
-    # 3. Commit
-    db.add(db_brand)
-    db.commit()
-    db.refresh(db_brand)
+    await db.commit()
     return db_brand
 
 @router.post("/onboard/influencer", response_model=user_schema.InfluencerResponse)
-def onboard_influencer(
+async def onboard_influencer(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     influencer_in: user_schema.InfluencerCreate,
     current_user: deps.TokenData = Depends(deps.get_current_user)
 ) -> Any:
     """
     Create an Influencer Profile.
+    A submitted niche is stored as is. Without one, `niche` is derived from the bio by the
+    AI enrichment (and kept in sync by taxonomy backfills). Profiles with a submitted niche
+    carry no taxonomy version, so backfills never overwrite it.
     """
-    if db.query(Influencer).filter(Influencer.user_id == current_user.id).first():
+    user_id = _user_uuid(current_user)
+    profile = Influencer(bio=influencer_in.bio, niche=influencer_in.niche)
+    if influencer_in.bio and not influencer_in.niche:
+        enrich_influencer(profile)
+    stmt = (
+        insert(Influencer)
+        .values(
+            user_id=user_id,
+            username=influencer_in.username,
+            bio=influencer_in.bio,
+            niche=profile.niche,
+            bio_hash=profile.bio_hash,
+            taxonomy_version=profile.taxonomy_version,
+            wallet_address=influencer_in.wallet_address
+        )
+        .on_conflict_do_nothing(index_elements=[Influencer.user_id])
+        .returning(Influencer)
+    )
+    db_inf = (await db.execute(stmt)).scalar_one_or_none()
+    if db_inf is None:
         raise HTTPException(status_code=400, detail="Influencer profile already exists")
 
-    db_inf = Influencer(
-        user_id=current_user.id,
-        username=influencer_in.username,
-        bio=influencer_in.bio,
-        niche=influencer_in.niche,
-        wallet_address=influencer_in.wallet_address
-    )
-    
-    db.add(db_inf)
-    db.commit()
-    db.refresh(db_inf)
-    
+    await db.commit()
     # Convert niche list to JSON compatible format if needed, but SQLAlchemy handles JSONB natively
     return db_inf
 
 @router.get("/me", response_model=user_schema.UserResponse)
-def read_user_me(
-    db: Session = Depends(get_db),
+async def read_user_me(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user: deps.TokenData = Depends(deps.get_current_user),
 ) -> Any:
     """
     Get current user details.
+    Send the ETag back as If-None-Match to get an empty 304 while the response is unchanged.
+    Repeat reads within PROFILE_CACHE_TTL skip the DB.
     """
-    user = db.query(User).filter(User.id == current_user.id).first()
-    # Mocking the response since we haven't synced 'users' table with Supabase Auth user yet
-    # In a real Supabase setup, the User is in auth.users, and we might proxy it or have a trigger
-    # For MVP, we assume the public.users table is populated.
-    if not user:
-         raise HTTPException(status_code=404, detail="User found in Auth but not in public.users")
-    return user
+    cached = profile_cache.get(current_user.id, ME)
+    if cached is None:
+        version = profile_cache.version(current_user.id)
+        result = await db.execute(select(User).where(User.id == current_user.id).limit(1))
+        user = result.scalars().first()
+        # Mocking the response since we haven't synced 'users' table with Supabase Auth user yet
+        # In a real Supabase setup, the User is in auth.users, and we might proxy it or have a trigger
+        # For MVP, we assume the public.users table is populated.
+        if not user:
+             raise HTTPException(status_code=404, detail="User found in Auth but not in public.users")
+        cached = cached_response(
+            user_schema.UserResponse.model_validate(user).model_dump_json().encode("utf-8"),
+            last_modified=user.updated_at or user.created_at
+        )
+        profile_cache.set(current_user.id, ME, cached, version)
+    return conditional_response(request, cached, ME)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "InfluencerHub"
@@ -13,19 +13,69 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "password"
     POSTGRES_DB: str = "influencerhub"
     POSTGRES_PORT: int = 5432
+
+    # Connection pool (applied to both the sync and the async engine)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # seconds; stay under Supabase/pgbouncer idle timeouts
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+
+    # Read replicas (async read-only endpoints only; writes and sync sessions always use the primary)
+    POSTGRES_REPLICA_URLS: List[str] = []  # postgresql:// URLs, as a JSON list in the env; empty = no replicas
+    READ_AFTER_WRITE_WINDOW: float = 5.0  # seconds a user's reads stay on the primary after they commit a write
+    READ_AFTER_WRITE_MAX_USERS: int = 100000  # recent writers remembered per process
     
     # Auth
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    JWT_CACHE_MAX_ENTRIES: int = 10000  # verified tokens kept in-process (LRU)
+    ROLE_CACHE_TTL: int = 300  # seconds a role looked up from `users` is trusted
+    ROLE_CACHE_MAX_ENTRIES: int = 50000
     
     # Blockchain
     WEB3_PROVIDER_URL: str
     CONTRACT_ADDRESS: Optional[str] = None
     WALLET_PRIVATE_KEY: Optional[str] = None
+    BLOCKCHAIN_MAX_IN_FLIGHT: int = 8  # concurrent sends per wallet
+    BLOCKCHAIN_GAS_LIMIT: int = 200000
+    BLOCKCHAIN_GAS_PRICE_GWEI: int = 50
+    ANCHOR_BATCH_SIZE: int = 1000  # records per Merkle root
+    ANCHOR_BATCH_WINDOW: float = 60.0  # seconds before a partial batch is anchored anyway
+    BLOCKCHAIN_CONFIRMATIONS: int = 12  # blocks deep before a record counts as verified
+    RECEIPT_BATCH_SIZE: int = 500  # receipts per batched JSON-RPC request
+    RECEIPT_MAX_PER_POLL: int = 5000
+    RECEIPT_POLL_MIN_INTERVAL: float = 1.0  # seconds
+    RECEIPT_POLL_MAX_INTERVAL: float = 30.0
+    RECEIPT_RESCAN_INTERVAL: float = 300.0  # seconds between scans for paid rows whose anchor isn't confirmed yet
 
     # Payments
     RAZORPAY_KEY_ID: Optional[str] = None
     RAZORPAY_KEY_SECRET: Optional[str] = None
+    RAZORPAY_WEBHOOK_SECRET: Optional[str] = None  # falls back to RAZORPAY_KEY_SECRET
+    RAZORPAY_WEBHOOK_ALLOW_UNSIGNED: bool = False  # local dev only: accept webhooks when no secret is set
+    RAZORPAY_API_URL: str = "https://api.razorpay.com"
+    RAZORPAY_MAX_CONCURRENCY: int = 20  # gateway requests in flight per process
+    RAZORPAY_KEEPALIVE_CONNECTIONS: int = 20
+    RAZORPAY_TIMEOUT: float = 10.0  # seconds per request
+    RAZORPAY_CONNECT_TIMEOUT: float = 3.0
+    WEBHOOK_QUEUE_SIZE: int = 10000  # events buffered before we answer 503 (Razorpay retries)
+    WEBHOOK_WORKERS: int = 4
+    WEBHOOK_BATCH_SIZE: int = 200  # events applied per DB transaction
+    WEBHOOK_IDEMPOTENCY_TTL: int = 172800  # seconds; Razorpay retries for up to 24h
+    WEBHOOK_IDEMPOTENCY_MAX_ENTRIES: int = 200000
+
+    # Discovery
+    CATALOG_REFRESH_INTERVAL: float = 30.0  # seconds between incremental loads of the influencer catalog
+    SIMILARITY_LSH_MIN_ROWS: Optional[int] = None  # catalogs this big use MinHash/LSH candidates; None = always exact
+    SEMANTIC_INDEX_DIR: Optional[str] = None  # directory written by `python -m app.services.discovery.semantic`; unset: semantic search off
+
+    # Profile responses (ETag / Last-Modified, per-user TTL cache)
+    PROFILE_CACHE_TTL: float = 30.0  # seconds a serialized profile is served without a DB read; 0 disables
+    PROFILE_CACHE_MAX_ENTRIES: int = 10000  # users whose profiles are cached per process
+
+    # Observability
+    REQUEST_STATEMENT_BUDGET: int = 20  # SQL statements per request before it is logged as a likely N+1
+    METRICS_TOKEN: Optional[str] = None  # bearer token for /metrics; unset: loopback clients only
 
     model_config = SettingsConfigDict(
         env_file=".env", 
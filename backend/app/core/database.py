@@ -1,25 +1,56 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine, timed
+from app.core.replicas import ReplicaRouter, async_replica_url, track_writes
 
 # Construct the Database URL. 
 # Defaults to a local postgres container if not set, or uses the Supabase connection string.
 # Note: Pydantic settings will have already loaded this from .env if present.
 SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+# Same database through the asyncpg driver, used by the async endpoints
+SQLALCHEMY_ASYNC_DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 
 # If using Supabase directly via connection pooling (port 6543/5432), the URL format in .env should be prioritized.
 # If SUPABASE_URL is provided in a specific format, we might want to use that directly.
 # For MVP, we stick to the component-based construction from config.py settings.
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
+POOL_OPTIONS = dict(
     # 'pool_pre_ping' sends a test query (SELECT 1) to ensure connection is alive before handing out session
-    pool_pre_ping=True 
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
 )
 
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **POOL_OPTIONS)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: requests wait on the event loop instead of holding a threadpool worker
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **POOL_OPTIONS)
+
+# expire_on_commit=False so committed objects can still be serialized without a lazy reload
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Read replicas for read-only async endpoints (see `deps.get_read_db`)
+async_replica_engines = [
+    create_async_engine(async_replica_url(url), **POOL_OPTIONS) for url in settings.POSTGRES_REPLICA_URLS
+]
+read_router = ReplicaRouter(
+    async_replica_engines, settings.READ_AFTER_WRITE_WINDOW, settings.READ_AFTER_WRITE_MAX_USERS
+)
+track_writes(read_router)
+
+# Per-request statement counts and SQL time (Server-Timing, /metrics)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+for replica in async_replica_engines:
+    instrument_engine(replica.sync_engine)
+
 Base = declarative_base()
 
 def get_db():
@@ -27,8 +58,22 @@ def get_db():
     Dependency generator for FastAPI. 
     Yields a database session and ensures it closes after the request.
     """
-    db = SessionLocal()
+    with timed("get_db"):
+        db = SessionLocal()
+    try:
+        yield db
+    finally:
+        with timed("get_db"):
+            db.close()
+
+async def get_async_db():
+    """
+    Async counterpart of `get_db` for `async def` endpoints.
+    """
+    with timed("get_db"):
+        db = AsyncSessionLocal()
     try:
         yield db
     finally:
-        db.close()
+        with timed("get_db"):
+            await db.close()
@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from itertools import count
+from typing import Any, Dict, NamedTuple, Optional, Set
+import hashlib
+from fastapi import Request, Response
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import registry
+
+PROFILE_CACHE_LOOKUPS = registry.counter(
+    "profile_cache_lookups_total", "Profile response cache lookups", ("resource", "result")
+)
+PROFILE_CACHE_HIT_RATIO = registry.gauge(
+    "profile_cache_hit_ratio", "Share of profile cache lookups served without a DB read", ("resource",)
+)
+NOT_MODIFIED = registry.counter(
+    "http_not_modified_total", "Conditional GETs answered 304 Not Modified", ("resource",)
+)
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+
+
+def cached_response(body: bytes, last_modified: datetime) -> CachedResponse:
+    """
+    Builds the cache entry for a serialized JSON body, with its validator headers
+    computed once rather than on every hit.
+    The ETag hashes the body itself, so it changes with any field of the response,
+    however the row was changed (ORM, Supabase, plain SQL).
+    """
+    etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+    return CachedResponse(body, etag, {
+        "ETag": etag,
+        # Informational only: `updated_at` isn't bumped by writes outside the ORM, so
+        # If-Modified-Since is not used to answer 304 (see `is_not_modified`)
+        "Last-Modified": format_datetime(last_modified.astimezone(timezone.utc), usegmt=True),
+        # Per-user data: browsers may keep it but must revalidate; shared caches must not store it
+        "Cache-Control": "private, no-cache",
+    })
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Whether the client's copy is current per If-None-Match (weak comparison).
+    If-Modified-Since is ignored, as RFC 9110 13.1.3 allows: only the ETag covers every change.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def conditional_response(request: Request, cached: CachedResponse, resource: str) -> Response:
+    """
+    304 with no body if the client's copy is current, otherwise the cached JSON body.
+    """
+    if is_not_modified(request, cached.etag):
+        NOT_MODIFIED.inc(resource)
+        return Response(status_code=304, headers=cached.headers)
+    return Response(cached.body, media_type="application/json", headers=cached.headers)
+
+
+class ProfileCache:
+    """
+    Serialized profile responses per (user, resource), reused for `ttl` seconds or until
+    `invalidate(user_id)` (called by `rbac.invalidate_role`). Writes made outside the app
+    (Supabase, SQL) and on other workers show up once the entry expires.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self._entries = LRUCache(max_entries=max_entries, ttl=ttl if ttl > 0 else None)
+        self._resources: Set[str] = set()
+        # user id -> sequence number of their last invalidation
+        self._invalidations = LRUCache(max_entries=max_entries)
+        self._sequence = count(1)
+
+    def get(self, user_id: Any, resource: str) -> Optional[CachedResponse]:
+        if self.ttl <= 0:
+            return None
+        cached = self._entries.get((str(user_id), resource))
+        PROFILE_CACHE_LOOKUPS.inc(resource, "hit" if cached is not None else "miss")
+        hits = PROFILE_CACHE_LOOKUPS.value(resource, "hit")
+        PROFILE_CACHE_HIT_RATIO.set(resource, value=hits / (hits + PROFILE_CACHE_LOOKUPS.value(resource, "miss")))
+        return cached
+
+    def version(self, user_id: Any) -> int:
+        """
+        Take this before reading the profile and pass it to `set`, so a read that raced
+        with a write isn't cached after the write's invalidation.
+        """
+        return self._invalidations.get(str(user_id), 0)
+
+    def set(self, user_id: Any, resource: str, cached: CachedResponse, version: int) -> None:
+        if self.ttl <= 0 or self.version(user_id) != version:
+            return
+        self._resources.add(resource)
+        self._entries.set((str(user_id), resource), cached)
+
+    def invalidate(self, user_id: Any) -> None:
+        key = str(user_id)
+        self._invalidations.set(key, next(self._sequence))
+        for resource in list(self._resources):
+            self._entries.invalidate((key, resource))
+
+
+profile_cache = ProfileCache(settings.PROFILE_CACHE_TTL, settings.PROFILE_CACHE_MAX_ENTRIES)
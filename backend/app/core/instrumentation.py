@@ -0,0 +1,170 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+import logging
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Statement counts per request
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Time to complete a request", ("method", "route")
+)
+REQUESTS = registry.counter("http_requests_total", "Requests served", ("method", "route", "status"))
+REQUEST_DB_DURATION = registry.histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL statements per request", ("method", "route")
+)
+REQUEST_STATEMENTS = registry.histogram(
+    "http_request_db_statements", "SQL statements executed per request", ("method", "route"), STATEMENT_BUCKETS
+)
+STATEMENT_BUDGET_EXCEEDED = registry.counter(
+    "http_request_statement_budget_exceeded_total",
+    "Requests that ran more SQL statements than REQUEST_STATEMENT_BUDGET (likely N+1)",
+    ("method", "route")
+)
+
+
+class RequestTimings:
+    """
+    What one request spent its time on: named phases (dependencies such as JWT
+    decoding or session setup) and SQL statements, counted per statement text so
+    repeated ones (N+1) can be reported.
+    """
+
+    __slots__ = ("started", "phases", "statements", "db_time", "statement_texts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.statements = 0
+        self.db_time = 0.0
+        self.statement_texts: Dict[str, int] = {}
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.db_time += seconds
+        self.statement_texts[statement] = self.statement_texts.get(statement, 0) + 1
+
+    def server_timing(self, total: float) -> str:
+        """
+        `Server-Timing` header value; durations in milliseconds.
+        """
+        metrics = [f"app;dur={total * 1000:.1f}"]
+        if self.statements:
+            metrics.append(f'db;dur={self.db_time * 1000:.1f};desc="{self.statements} queries"')
+        metrics.extend(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items())
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """
+    Adds the time spent in the block to phase `name` of the current request, if any.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_phase(name, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, which is dropped with it: a statement
+    # that raises (no after_cursor_execute) leaves nothing behind on the connection
+    if _current.get() is not None and context is not None:
+        context._request_statement_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    started: Optional[float] = getattr(context, "_request_statement_started", None)
+    if timings is not None and started is not None:
+        timings.add_statement(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Counts and times every statement `engine` runs on behalf of a request.
+    For an AsyncEngine, pass its `sync_engine`.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _report_statement_budget(method: str, route: str, timings: RequestTimings) -> None:
+    STATEMENT_BUDGET_EXCEEDED.inc(method, route)
+    statement, repeats = max(timings.statement_texts.items(), key=lambda item: item[1])
+    logger.warning(
+        "%s %s ran %d SQL statements (budget %d), possible N+1; most repeated (%dx): %s",
+        method, route, timings.statements, settings.REQUEST_STATEMENT_BUDGET,
+        repeats, " ".join(statement.split())[:200]
+    )
+
+
+class InstrumentationMiddleware:
+    """
+    Pure ASGI middleware (no BaseHTTPMiddleware, so streaming and background tasks are
+    untouched). Per request it:
+    - adds a `Server-Timing` header: total handler time until the response starts,
+      SQL time and statement count (`db`), and any `timed()` phases
+    - records latency, SQL time and statement count histograms per route template
+    - logs and counts requests running more than REQUEST_STATEMENT_BUDGET statements
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = "500"
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                header = timings.server_timing(time.perf_counter() - timings.started)
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            method, route = scope["method"], _route_of(scope)
+            REQUEST_DURATION.observe(time.perf_counter() - timings.started, method, route)
+            REQUESTS.inc(method, route, status)
+            REQUEST_DB_DURATION.observe(timings.db_time, method, route)
+            REQUEST_STATEMENTS.observe(timings.statements, method, route)
+            if timings.statements > settings.REQUEST_STATEMENT_BUDGET:
+                _report_statement_budget(method, route, timings)
@@ -0,0 +1,58 @@
+from typing import Any, Optional
+import uuid
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.http_cache import profile_cache
+from app.models.user import User
+
+# user id -> role, so role checks don't query `users` on every request.
+# Entries expire after ROLE_CACHE_TTL. No endpoint writes `users.role`: roles are assigned by the
+# signup trigger, and changed through the `app_metadata.role` claim (checked before the cache) or by
+# an admin in SQL. Code that ever updates `users.role` must call `invalidate_role`.
+_role_cache = LRUCache(max_entries=settings.ROLE_CACHE_MAX_ENTRIES, ttl=settings.ROLE_CACHE_TTL)
+
+async def resolve_role(user_id: str, payload: dict[str, Any], db: AsyncSession) -> Optional[str]:
+    """
+    Role of the user behind a verified token.
+    1. `app_metadata.role` custom claim (free, set by Supabase when configured)
+    2. role cache
+    3. `users.role` in the DB (result is cached)
+    Returns None if the user has no row in `users` yet.
+    """
+    claim = (payload.get("app_metadata") or {}).get("role")
+    if claim:
+        return claim
+
+    role = _role_cache.get(user_id)
+    if role is not None:
+        return role
+
+    try:
+        user_uuid = uuid.UUID(user_id)
+    except ValueError:
+        return None
+
+    result = await db.execute(select(User.role).where(User.id == user_uuid))
+    db_role = result.scalar_one_or_none()
+    if db_role is None:
+        # Not cached: the row may be created moments later by the signup trigger
+        return None
+
+    role = db_role.value
+    _role_cache.set(user_id, role)
+    return role
+
+def invalidate_role(user_id: Any) -> None:
+    """
+    Drop a cached role (and the profile responses showing it); call after changing `users.role`.
+    """
+    _role_cache.invalidate(str(user_id))
+    profile_cache.invalidate(user_id)
+
+def role_cache_stats() -> dict:
+    """
+    Size and hit/miss counters of the role cache.
+    """
+    return _role_cache.stats()
@@ -0,0 +1,188 @@
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from itertools import count
+from typing import Any, Optional, Sequence
+import hashlib
+import hmac
+import math
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache
+
+# Authenticated user of the current request, so a commit can be attributed to them
+_request_user: ContextVar[Optional[str]] = ContextVar("request_user", default=None)
+
+
+def set_request_user(user_id: str) -> None:
+    _request_user.set(user_id)
+
+
+class RequestWrite:
+    """
+    Filled in by `after_commit` when the request commits a write, read by
+    ReadAfterWriteMiddleware to pin the client. Mutable, so a commit made in a copied
+    context (a dependency, a threadpool call) is still seen by the middleware.
+    """
+
+    __slots__ = ("user_id", "written_at")
+
+    def __init__(self):
+        self.user_id: Optional[str] = None
+        self.written_at: Optional[float] = None
+
+
+_request_write: ContextVar[Optional[RequestWrite]] = ContextVar("request_write", default=None)
+
+# Cookie carrying "<user id>:<write time>:<signature>" between workers
+PIN_COOKIE = "rw_pin"
+
+
+def _pin_signature(secret: str, user_id: str, written_at: str) -> str:
+    message = f"{PIN_COOKIE}:{user_id}:{written_at}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def make_pin(secret: str, user_id: str, written_at: float) -> str:
+    stamp = f"{written_at:.3f}"
+    return f"{user_id}:{stamp}:{_pin_signature(secret, user_id, stamp)}"
+
+
+def read_pin(secret: str, value: Optional[str], user_id: Any) -> Optional[float]:
+    """
+    Write time from a pin cookie issued to `user_id`, or None if the cookie is
+    missing, forged or belongs to someone else.
+    """
+    if not value:
+        return None
+    pinned_user, _, rest = value.partition(":")
+    stamp, _, signature = rest.partition(":")
+    if pinned_user != str(user_id) or not hmac.compare_digest(signature, _pin_signature(secret, pinned_user, stamp)):
+        return None
+    try:
+        return float(stamp)
+    except ValueError:
+        return None
+
+
+def async_replica_url(url: str) -> str:
+    """
+    Replica URLs are configured like the primary's (postgresql://...); async sessions need asyncpg.
+    """
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for a read-only request: replicas in round-robin, except for
+    users who committed a write in the last `sticky_window` seconds, who stay on the
+    primary so they read their own writes despite replication lag.
+    Recent writers are tracked per process; other workers learn about them from the
+    client's pin cookie (ReadAfterWriteMiddleware), passed in as `written_at`.
+    """
+
+    def __init__(self, replicas: Sequence[AsyncEngine], sticky_window: float, max_users: int = 100000):
+        self.replicas = list(replicas)
+        self.sticky_window = sticky_window
+        self._reads = count()
+        self._recent_writers = LRUCache(max_entries=max_users, ttl=sticky_window)
+
+    def mark_written(self, user_id: Any) -> bool:
+        """
+        Pins `user_id` to the primary; False if there is nothing to pin (no replicas).
+        """
+        if not self.replicas or self.sticky_window <= 0:
+            return False
+        self._recent_writers.set(str(user_id), True)
+        return True
+
+    def read_engine(self, user_id: Optional[Any], written_at: Optional[float] = None) -> Optional[AsyncEngine]:
+        """
+        Replica to serve this user's reads, or None for the primary.
+        `written_at`: the user's last write time as reported by the client, if any.
+        """
+        if not self.replicas:
+            return None
+        if written_at is not None and 0 <= time.time() - written_at < self.sticky_window:
+            return None
+        if user_id is not None and self._recent_writers.get(str(user_id)):
+            return None
+        return self.replicas[next(self._reads) % len(self.replicas)]
+
+
+def _note_write_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+def _note_write_flush(session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+def _forget_write(session) -> None:
+    session.info.pop("wrote", None)
+
+
+def track_writes(router: ReplicaRouter) -> None:
+    """
+    Marks the request's user in `router` whenever a session commits a transaction that
+    wrote (flushed ORM changes or executed INSERT/UPDATE/DELETE). Covers sync and async
+    sessions: AsyncSession runs these events on its underlying Session.
+    """
+    def after_commit(session) -> None:
+        user_id = _request_user.get()
+        if session.info.pop("wrote", False) and user_id is not None and router.mark_written(user_id):
+            request_write = _request_write.get()
+            if request_write is not None:
+                request_write.user_id, request_write.written_at = str(user_id), time.time()
+
+    event.listen(Session, "do_orm_execute", _note_write_execute)
+    event.listen(Session, "after_flush", _note_write_flush)
+    event.listen(Session, "after_rollback", _forget_write)
+    event.listen(Session, "after_commit", after_commit)
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Pure ASGI middleware carrying read-your-writes across workers: when a request
+    commits a write, the response sets a signed cookie with the write time, valid for
+    the sticky window. `deps.get_read_db` sends that client's reads to the primary
+    until it expires, whichever worker serves them.
+    """
+
+    def __init__(self, app, secret: str, window: float):
+        self.app = app
+        self.secret = secret
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_write = RequestWrite()
+        token = _request_write.set(request_write)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and request_write.written_at is not None:
+                cookie = self.pin_cookie(request_write, secure=scope.get("scheme") == "https")
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            _request_write.reset(token)
+
+    def pin_cookie(self, request_write: RequestWrite, secure: bool) -> str:
+        cookie = SimpleCookie()
+        cookie[PIN_COOKIE] = make_pin(self.secret, request_write.user_id, request_write.written_at)
+        morsel = cookie[PIN_COOKIE]
+        morsel["max-age"] = math.ceil(self.window)
+        morsel["path"] = "/"
+        morsel["httponly"] = True
+        morsel["samesite"] = "lax"
+        morsel["secure"] = secure
+        return morsel.OutputString()
@@ -1,15 +1,32 @@
 from datetime import datetime
 from typing import Any, Union
+import hashlib
+import time
 from jose import jwt, JWTError
+from app.core.cache import LRUCache
 from app.core.config import settings
 
 ALGORITHM = "HS256"
 
+# Tokens without an `exp` claim are only trusted from the cache for this long (seconds)
+TOKEN_CACHE_DEFAULT_TTL = 300
+
+# Verified payloads keyed by SHA-256 of the token, so raw bearer tokens are never kept in memory.
+# Each entry expires at the token's own `exp`.
+_token_cache = LRUCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
+
 def decode_access_token(token: str) -> Union[dict[str, Any], None]:
     """
     Decodes a JWT token and validates its signature.
     Returns the payload if valid, None otherwise.
+    A token seen before (and not yet expired) is served from the verified-token cache
+    without repeating the signature check. The cached payload is shared: treat it as read-only.
     """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         # Supabase JWTs are signed with the project secret
         payload = jwt.decode(
@@ -18,6 +35,17 @@ def decode_access_token(token: str) -> Union[dict[str, Any], None]:
             algorithms=[ALGORITHM],
             audience="authenticated" # Supabase specific audience
         )
-        return payload
     except JWTError:
+        # Invalid tokens are never cached
         return None
+
+    exp = payload.get("exp")
+    expires_at = float(exp) if isinstance(exp, (int, float)) else time.time() + TOKEN_CACHE_DEFAULT_TTL
+    _token_cache.set(key, payload, expires_at=expires_at)
+    return payload
+
+def token_cache_stats() -> dict:
+    """
+    Size and hit/miss counters of the verified-token cache.
+    """
+    return _token_cache.stats()
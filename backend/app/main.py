@@ -1,11 +1,42 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.core.database import SessionLocal
+from app.core.instrumentation import InstrumentationMiddleware
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.rbac import role_cache_stats
+from app.core.security import token_cache_stats
+from app.core.replicas import ReadAfterWriteMiddleware
+from app.services.blockchain.anchoring import close_anchor_batcher
+from app.services.blockchain.receipts import run_receipt_tracking
+from app.services.discovery.catalog import influencer_catalog
+from app.services.payment.razorpay_service import close_payment_service
+from app.services.payment.webhooks import webhook_processor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep the in-memory influencer catalog (similar-influencer lookups) in sync with the table
+    catalog_task = asyncio.create_task(influencer_catalog.run(SessionLocal))
+    # Workers that anchor (have a wallet) follow anchor receipts to verified_on_chain / re-anchoring
+    receipts_task = asyncio.create_task(run_receipt_tracking(SessionLocal)) if settings.WALLET_PRIVATE_KEY else None
+    yield
+    catalog_task.cancel()
+    # Apply webhooks that were already acknowledged before shutting down, then anchor what they paid
+    await webhook_processor.close()
+    await close_anchor_batcher()
+    if receipts_task is not None:
+        receipts_task.cancel()
+    await close_payment_service()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Set all CORS enabled origins
@@ -16,6 +47,10 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Pins clients that just wrote to the primary, on every worker (signed cookie)
+app.add_middleware(ReadAfterWriteMiddleware, secret=settings.JWT_SECRET, window=settings.READ_AFTER_WRITE_WINDOW)
+# Outermost, so Server-Timing covers everything below it
+app.add_middleware(InstrumentationMiddleware)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -26,3 +61,34 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+AUTH_CACHE_ENTRIES = registry.gauge("auth_cache_entries", "Entries held by the auth caches", ("cache",))
+AUTH_CACHE_LOOKUPS = registry.gauge(
+    "auth_cache_lookups", "Auth cache lookups since the process started", ("cache", "result")
+)
+AUTH_CACHE_HIT_RATIO = registry.gauge("auth_cache_hit_ratio", "Share of auth cache lookups that hit", ("cache",))
+
+@registry.collector
+def collect_auth_cache_stats():
+    for cache, stats in (("token", token_cache_stats()), ("role", role_cache_stats())):
+        AUTH_CACHE_ENTRIES.set(cache, value=stats["size"])
+        AUTH_CACHE_LOOKUPS.set(cache, "hit", value=stats["hits"])
+        AUTH_CACHE_LOOKUPS.set(cache, "miss", value=stats["misses"])
+        AUTH_CACHE_HIT_RATIO.set(cache, value=stats["hit_rate"])
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    """
+    Request latency, SQL statement and cache metrics in the Prometheus text format.
+    Route names, volumes and cache sizes are not for the public: scrapers send
+    `Authorization: Bearer <METRICS_TOKEN>`; without a token configured only loopback clients get in.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    elif request.client is None or request.client.host not in LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="Metrics are only served to loopback clients")
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,4 @@
+# Import every model so string-based relationships (e.g. Brand.campaigns) resolve
+from app.models.user import User, Brand, Influencer
+from app.models.campaign import Campaign, Transaction
+from app.models.ingestion import SocialProfile
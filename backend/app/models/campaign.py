@@ -0,0 +1,44 @@
+from sqlalchemy import Column, String, ForeignKey, Enum, Numeric, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+import uuid
+from app.models.base import Base
+from app.schemas.campaign import CampaignStatus
+from app.schemas.transaction import TransactionStatus
+
+class Campaign(Base):
+    __tablename__ = "campaigns"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.user_id"), nullable=False, index=True)
+    title = Column(String, nullable=False)
+    description = Column(String)
+    budget = Column(Numeric(10, 2), nullable=False)
+    # Postgres enum 'campaign_status' stores the lowercase values
+    status = Column(
+        Enum(CampaignStatus, name="campaign_status", values_callable=lambda e: [m.value for m in e]),
+        default=CampaignStatus.DRAFT
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    brand = relationship("Brand", back_populates="campaigns")
+
+
+class Transaction(Base):
+    __tablename__ = "transactions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    campaign_id = Column(UUID(as_uuid=True), ForeignKey("campaigns.id"), index=True)
+    influencer_id = Column(UUID(as_uuid=True), ForeignKey("influencers.user_id"), index=True)
+    amount = Column(Numeric(10, 2), nullable=False)
+    razorpay_payment_id = Column(String)
+    # Not unique: every record of a Merkle batch shares the anchoring transaction
+    blockchain_tx_hash = Column(String, index=True)
+    merkle_root = Column(String(66))
+    merkle_proof = Column(JSONB)  # [{"position": "left"|"right", "hash": "0x.."}, ...]
+    status = Column(
+        Enum(TransactionStatus, name="transaction_status", values_callable=lambda e: [m.value for m in e]),
+        default=TransactionStatus.PENDING
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
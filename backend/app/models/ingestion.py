@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, BigInteger, Float, DateTime, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+from app.models.base import Base
+
+class SocialProfile(Base):
+    """
+    Influencer profile as ingested from an external source (CSV, API sync).
+    One row per account, identified by (platform, platform_id).
+    """
+    __tablename__ = "social_profiles"
+    __table_args__ = (UniqueConstraint("platform", "platform_id", name="uq_social_profiles_platform_id"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    platform = Column(String, nullable=False)
+    platform_id = Column(String, nullable=False)
+    username = Column(String, nullable=False)
+    display_name = Column(String)
+    follower_count = Column(BigInteger, default=0)
+    engagement_rate = Column(Float)
+    profile_url = Column(String, nullable=False)
+    tags = Column(JSONB, default=[])
+    raw_metrics_snapshot = Column(JSONB, default={})
+    source = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,6 +1,7 @@
-from sqlalchemy import Boolean, Column, String, ForeignKey, Enum
+from sqlalchemy import Boolean, Column, String, ForeignKey, Enum, DateTime, Index, Numeric, case, cast, func, literal_column, null
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import Grouping
 import uuid
 from app.models.base import Base
 from app.schemas.user import UserRole
@@ -10,7 +11,14 @@ class User(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, index=True, nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.INFLUENCER, nullable=False)
+    # Postgres enum 'user_role' stores the lowercase values ('brand'), not the member names
+    role = Column(
+        Enum(UserRole, name="user_role", values_callable=lambda e: [m.value for m in e]),
+        default=UserRole.INFLUENCER,
+        nullable=False
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # 1-to-1 relationships
     brand_profile = relationship("Brand", back_populates="user", uselist=False)
@@ -38,4 +46,35 @@ class Influencer(Base):
     metrics = Column(JSONB, default={}) 
     wallet_address = Column(String)
 
+    # AI enrichment bookkeeping: hash of the bio and taxonomy version `niche` was derived from
+    bio_hash = Column(String(64))
+    taxonomy_version = Column(String(16), index=True)
+    # Watermark for incremental loads of the in-memory catalog (app/services/discovery/catalog.py)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+
     user = relationship("User", back_populates="influencer_profile")
+
+
+def metric_value(key: str):
+    """
+    `metrics->>'key'` as a number, NULL unless it holds a JSON number (so a stray string
+    can't fail the query, or ANALYZE). This is the expression the metric indexes below are
+    built on; the key is rendered inline rather than bound, because a generic (prepared)
+    plan only matches an expression index whose expression is identical, constants included.
+    """
+    field = literal_column(f"'{key}'")
+    return case(
+        (func.jsonb_typeof(Influencer.metrics.op("->")(field)) == literal_column("'number'"),
+         cast(Influencer.metrics.op("->>")(field), Numeric)),
+        else_=null()
+    )
+
+
+# Discovery search (see app/services/discovery/search.py)
+Index("idx_influencers_niche", Influencer.niche, postgresql_using="gin")
+Index("idx_influencers_metrics", Influencer.metrics, postgresql_using="gin")
+# Hot metric keys: range filters and keyset order (value, user_id) in one index each.
+# ANALYZE also keeps statistics on indexed expressions, so the planner can size bands.
+# (CASE needs its own parentheses in CREATE INDEX; the planner ignores them when matching)
+Index("idx_influencers_followers", Grouping(metric_value("followers")), Influencer.user_id)
+Index("idx_influencers_engagement", Grouping(metric_value("engagement_rate")), Influencer.user_id)
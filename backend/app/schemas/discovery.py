@@ -0,0 +1,69 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from uuid import UUID
+from enum import Enum
+from app.schemas.campaign import CampaignBase
+from app.schemas.user import InfluencerResponse
+
+class DiscoverySort(str, Enum):
+    FOLLOWERS = "followers"
+    ENGAGEMENT_RATE = "engagement_rate"
+
+class NicheMatch(str, Enum):
+    ALL = "all"  # every tag (niche @> tags)
+    ANY = "any"  # at least one tag (niche ?| tags)
+
+class InfluencerSearch(BaseModel):
+    """
+    Discovery filters. Results are ordered by `sort`, highest first; influencers without
+    a numeric value for the sort metric are not listed.
+    """
+    niche: List[str] = []
+    niche_match: NicheMatch = NicheMatch.ALL
+    min_followers: Optional[int] = Field(None, ge=0)
+    max_followers: Optional[int] = Field(None, ge=0)
+    min_engagement: Optional[float] = Field(None, ge=0)
+    max_engagement: Optional[float] = Field(None, ge=0)
+    sort: DiscoverySort = DiscoverySort.FOLLOWERS
+    limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None  # `next_cursor` of the previous page
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if self.min_followers is not None and self.max_followers is not None and self.min_followers > self.max_followers:
+            raise ValueError("min_followers is greater than max_followers")
+        if self.min_engagement is not None and self.max_engagement is not None and self.min_engagement > self.max_engagement:
+            raise ValueError("min_engagement is greater than max_engagement")
+        return self
+
+class InfluencerSearchResponse(BaseModel):
+    items: List[InfluencerResponse]
+    next_cursor: Optional[str] = None  # None on the last page
+
+class SimilarInfluencer(BaseModel):
+    user_id: UUID
+    similarity: float  # Jaccard similarity of niche tags, 0-1
+
+class SimilarInfluencersResponse(BaseModel):
+    items: List[SimilarInfluencer]  # most similar first
+
+class SemanticMatch(BaseModel):
+    user_id: UUID
+    similarity: float  # cosine similarity of the bio's embedding to the query's
+
+class SemanticSearchResponse(BaseModel):
+    items: List[SemanticMatch]  # most similar first
+
+class CampaignMatchRequest(CampaignBase):
+    limit: int = Field(20, ge=1, le=100)
+
+class CampaignMatch(BaseModel):
+    user_id: UUID
+    score: float  # weighted total, 0-1
+    niche_overlap: float  # share of the campaign's categories the influencer has
+    tier_fit: float  # how close the follower count is to what the budget buys
+    engagement: float
+
+class CampaignMatchResponse(BaseModel):
+    tags: List[str]  # categories detected in the campaign title and description
+    items: List[CampaignMatch]  # best first
@@ -43,3 +43,14 @@ class CSVIngestionRow(BaseModel):
         if isinstance(v, str):
             return [t.strip() for t in v.split(',')]
         return v
+
+class IngestionRowError(BaseModel):
+    row: int  # Line number in the uploaded file (header is line 1)
+    errors: List[str]
+
+class IngestionReport(BaseModel):
+    rows_total: int = 0
+    rows_ingested: int = 0
+    rows_failed: int = 0
+    errors: List[IngestionRowError] = []
+    errors_truncated: bool = False  # True when more rows failed than were reported
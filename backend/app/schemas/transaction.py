@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from uuid import UUID
+from datetime import datetime
+from enum import Enum
+
+class TransactionStatus(str, Enum):
+    PENDING = "pending"
+    PAID = "paid"
+    FAILED = "failed"
+    VERIFIED_ON_CHAIN = "verified_on_chain"
+
+class TransactionResponse(BaseModel):
+    id: UUID
+    campaign_id: Optional[UUID] = None
+    influencer_id: Optional[UUID] = None
+    amount: float
+    status: TransactionStatus
+    blockchain_tx_hash: Optional[str] = None
+    # Set when the record was anchored as part of a Merkle batch
+    merkle_root: Optional[str] = None
+    merkle_proof: Optional[List[Dict[str, str]]] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class MismatchKind(str, Enum):
+    MISSING_IN_DB = "missing_in_db"  # captured at the gateway, no transaction row
+    MISSING_AT_GATEWAY = "missing_at_gateway"  # row references a payment the gateway didn't list
+    GATEWAY_LOOKUP_FAILED = "gateway_lookup_failed"  # fetching the payment by id errored; unchecked
+    AMOUNT_MISMATCH = "amount_mismatch"
+    STATUS_MISMATCH = "status_mismatch"
+    NOT_ANCHORED = "not_anchored"  # paid, but no blockchain_tx_hash yet
+    BAD_MERKLE_PROOF = "bad_merkle_proof"
+    NOT_ON_CHAIN = "not_on_chain"  # tx hash has no receipt
+    REVERTED_ON_CHAIN = "reverted_on_chain"
+
+class ReconciliationReport(BaseModel):
+    window_start: datetime
+    window_end: datetime
+    gateway_payments: int = 0
+    db_transactions: int = 0
+    matched: int = 0
+    mismatches: Dict[MismatchKind, int] = {}
+    # Every mismatch, one JSON object per line; the counts above are all that's kept in memory
+    report_path: str
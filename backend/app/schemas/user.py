@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, HttpUrl
+from pydantic import BaseModel, EmailStr, Field, HttpUrl, field_validator
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from datetime import datetime
@@ -52,9 +52,30 @@ class InfluencerBase(BaseModel):
 class InfluencerCreate(InfluencerBase):
     pass
 
+# Metric keys with expression indexes for discovery; only JSON numbers are searchable
+NUMERIC_METRICS = ("followers", "engagement_rate")
+
 class InfluencerUpdate(InfluencerBase):
     metrics: Optional[Dict[str, Any]] = None
 
+    @field_validator("metrics")
+    def numeric_hot_metrics(cls, v):
+        for key in NUMERIC_METRICS:
+            value = (v or {}).get(key)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                raise ValueError(f"metrics.{key} must be a number")
+        return v
+
 class InfluencerResponse(InfluencerBase):
     user_id: UUID
     metrics: Dict[str, Any] = {}
+
+    @field_validator("niche", "metrics", mode="before")
+    def null_as_empty(cls, v, info):
+        # Nullable JSONB columns
+        if v is None:
+            return [] if info.field_name == "niche" else {}
+        return v
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,161 @@
+from typing import Dict, Iterator, List, Tuple
+import hashlib
+from app.core.cache import LRUCache
+
+# Distinct brand lists we keep compiled automata for
+MATCHER_CACHE_SIZE = 32
+
+
+def _is_word(ch: str) -> bool:
+    # Same character class as \w in a unicode `re` pattern
+    return ch.isalnum() or ch == "_"
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    # Mirrors the regex \b assertion at `pos` (outside the string counts as non-word)
+    before = pos > 0 and _is_word(text[pos - 1])
+    after = pos < len(text) and _is_word(text[pos])
+    return before != after
+
+
+class BrandMatcher:
+    """
+    Aho-Corasick automaton over lower-cased brand names.
+    One pass over the text finds every brand; each hit is then checked against
+    the same word boundaries `\\bbrand\\b` used to enforce.
+    """
+
+    def __init__(self, brand_names: List[str]):
+        self.brands = list(brand_names)
+
+        # Identical (lower-cased) names share one pattern id
+        pattern_ids: Dict[str, int] = {}
+        # pattern id -> positions in `self.brands` (a name listed twice is reported twice)
+        self.pattern_brands: List[List[int]] = []
+        for idx, brand in enumerate(self.brands):
+            pid = pattern_ids.setdefault(brand.lower(), len(pattern_ids))
+            if pid == len(self.pattern_brands):
+                self.pattern_brands.append([])
+            self.pattern_brands[pid].append(idx)
+        self.pattern_lengths = [len(p) for p in pattern_ids]
+        # `\b\b` matches any word boundary, so an empty name needs special handling
+        self.empty_pattern = pattern_ids.get("")
+
+        self.goto: List[Dict[str, int]] = [{}]
+        self.output: List[int] = [-1]      # pattern ending at this state, -1 if none
+        self.fail: List[int] = [0]
+        self.dict_link: List[int] = [0]    # nearest fail-ancestor with an output, 0 if none
+
+        for pattern, pid in pattern_ids.items():
+            if pattern:
+                self._insert(pattern, pid)
+        self._build_links()
+
+    def _insert(self, pattern: str, pid: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.output.append(-1)
+                self.fail.append(0)
+                self.dict_link.append(0)
+            state = nxt
+        self.output[state] = pid
+
+    def _build_links(self) -> None:
+        # Breadth-first so every state's fail target is finished before its children
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self.goto[state].items():
+                queue.append(child)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                fail_state = self.fail[child]
+                self.dict_link[child] = fail_state if self.output[fail_state] != -1 else self.dict_link[fail_state]
+
+    def _iter_matches(self, text_lower: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (pattern_id, start, end) for every boundary-respecting occurrence.
+        """
+        goto, fail, output, dict_link = self.goto, self.fail, self.output, self.dict_link
+        lengths = self.pattern_lengths
+        state = 0
+
+        for i, ch in enumerate(text_lower):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            hit = state if output[state] != -1 else dict_link[state]
+            while hit:
+                pid = output[hit]
+                end = i + 1
+                start = end - lengths[pid]
+                if _is_boundary(text_lower, start) and _is_boundary(text_lower, end):
+                    yield pid, start, end
+                hit = dict_link[hit]
+
+        if self.empty_pattern is not None:
+            for pos in range(len(text_lower) + 1):
+                if _is_boundary(text_lower, pos):
+                    yield self.empty_pattern, pos, pos
+
+    def find(self, text: str) -> List[str]:
+        """
+        Brands mentioned in `text`, in brand-list order (same as the old regex loop).
+        """
+        if not text:
+            return []
+
+        found = {pid for pid, _, _ in self._iter_matches(text.lower())}
+        positions = sorted(idx for pid in found for idx in self.pattern_brands[pid])
+        return [self.brands[idx] for idx in positions]
+
+    def locate(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Brand -> list of (start, end) offsets of each mention, keyed in the same
+        order as `find`. Offsets index into `text.lower()`, which only differs
+        from `text` for the few characters whose lower case changes length.
+        """
+        if not text:
+            return {}
+
+        offsets: Dict[int, List[Tuple[int, int]]] = {}
+        for pid, start, end in self._iter_matches(text.lower()):
+            offsets.setdefault(pid, []).append((start, end))
+
+        positions = sorted((idx, pid) for pid in offsets for idx in self.pattern_brands[pid])
+        return {self.brands[idx]: offsets[pid] for idx, pid in positions}
+
+
+_matcher_cache = LRUCache(max_entries=MATCHER_CACHE_SIZE)
+
+
+def brand_list_fingerprint(brand_names: List[str]) -> str:
+    """
+    Stable digest of a brand list (order and duplicates included, since both affect the output).
+    """
+    # NUL never appears in a brand name, so joining on it is unambiguous
+    joined = "\x00".join(brand_names).encode("utf-8", "surrogatepass")
+    return f"{len(brand_names)}:" + hashlib.blake2b(joined, digest_size=16).hexdigest()
+
+
+def get_brand_matcher(brand_names: List[str]) -> BrandMatcher:
+    """
+    Returns the compiled matcher for `brand_names`, building it only on a cache miss.
+    """
+    key = brand_list_fingerprint(brand_names)
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = BrandMatcher(brand_names)
+        _matcher_cache.set(key, matcher)
+    return matcher
@@ -0,0 +1,142 @@
+from typing import Iterable, List, Optional
+import re
+import numpy as np
+from app.services.ai.engine import _chunked
+
+# Hashed character n-grams -> N_FEATURES sparse TF-IDF columns -> EMBEDDING_DIM dense dimensions
+N_FEATURES = 1 << 18
+NGRAM_SIZES = (3, 4, 5)
+EMBEDDING_DIM = 256
+# Non-zeros per feature in the (very sparse, +-1) random projection
+PROJECTION_NNZ = 4
+EMBED_BATCH_SIZE = 2048
+
+_FEATURE_BITS = N_FEATURES.bit_length() - 1
+_HASH_PRIME = np.uint64(1099511628211)        # FNV-1a 64-bit prime, for the rolling n-gram hash
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)     # Fibonacci hashing; top bits give the column
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Lower-cased words separated (and surrounded) by single spaces, so n-grams at the
+    edges of a word ("␣gym", "gym␣") are features of their own.
+    """
+    return " " + _SEPARATORS.sub(" ", (text or "").lower()).strip() + " "
+
+
+def hashed_ngrams(texts: List[str]) -> np.ndarray:
+    """
+    (document, column) of every character n-gram in `texts`, one row per occurrence.
+
+    Vectorized over the whole batch: a rolling polynomial hash of the UTF-8 bytes,
+    extended by one byte per n-gram size; n-grams that would span two documents
+    are dropped.
+    """
+    encoded = [normalize_text(text).encode("utf-8") for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+    doc_of = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+
+    pairs = []
+    rolling = np.zeros(len(data), dtype=np.uint64)
+    for n in range(1, max(NGRAM_SIZES) + 1):
+        count = len(data) - n + 1
+        if count <= 0:
+            break
+        # rolling[i] now hashes data[i:i + n]
+        rolling[:count] = rolling[:count] * _HASH_PRIME + data[n - 1:]
+        if n in NGRAM_SIZES:
+            docs = doc_of[:count]
+            same_doc = docs == doc_of[n - 1:]
+            columns = ((rolling[:count][same_doc] + np.uint64(n)) * _HASH_MIX) >> np.uint64(64 - _FEATURE_BITS)
+            pairs.append(np.stack((docs[same_doc], columns.astype(np.int64)), axis=1))
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+class TextEmbedder:
+    """
+    CPU-only text embeddings for bios and captions: hashed character n-gram TF-IDF
+    (sublinear tf), reduced to EMBEDDING_DIM dimensions by a sparse random projection
+    and L2-normalized, so a dot product is the cosine similarity.
+
+    No vocabulary is kept: n-grams are hashed into N_FEATURES columns, and the
+    projection of each column is derived from `seed`. The only fitted state is the
+    idf of each column (`fit`); unfitted, every column weighs the same.
+    """
+
+    def __init__(self, idf: Optional[np.ndarray] = None, seed: int = 0):
+        self.seed = seed
+        self.idf = idf if idf is not None else np.ones(N_FEATURES, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        self.projection_dims = rng.integers(0, EMBEDDING_DIM, size=(N_FEATURES, PROJECTION_NNZ), dtype=np.int64)
+        self.projection_signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), size=(N_FEATURES, PROJECTION_NNZ))
+
+    @staticmethod
+    def _term_counts(texts: List[str]):
+        pairs = hashed_ngrams(texts)
+        keys, counts = np.unique(pairs[:, 0] * N_FEATURES + pairs[:, 1], return_counts=True)
+        return keys // N_FEATURES, keys % N_FEATURES, counts
+
+    def fit(self, texts: Iterable[str], batch_size: int = EMBED_BATCH_SIZE) -> "TextEmbedder":
+        """
+        Learns idf from a corpus (streamed in batches).
+        """
+        document_frequency = np.zeros(N_FEATURES, dtype=np.int64)
+        n_documents = 0
+        for batch in _chunked(texts, batch_size):
+            _, columns, _ = self._term_counts(batch)
+            document_frequency += np.bincount(columns, minlength=N_FEATURES)
+            n_documents += len(batch)
+        self.idf = (np.log((1 + n_documents) / (1 + document_frequency)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """
+        (len(texts), EMBEDDING_DIM) float32 unit vectors; empty texts give zero vectors.
+        """
+        docs, columns, counts = self._term_counts(texts)
+        weights = (1 + np.log(counts)) * self.idf[columns]
+        cells = docs[:, None] * EMBEDDING_DIM + self.projection_dims[columns]
+        dense = np.bincount(
+            cells.ravel(),
+            weights=(weights[:, None] * self.projection_signs[columns]).ravel(),
+            minlength=len(texts) * EMBEDDING_DIM
+        ).reshape(len(texts), EMBEDDING_DIM).astype(np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        np.divide(dense, norms, out=dense, where=norms > 0)
+        return dense
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.transform([text])[0]
+
+    def save(self, path: str) -> None:
+        np.savez(path, idf=self.idf, seed=self.seed)
+
+    @classmethod
+    def load(cls, path: str) -> "TextEmbedder":
+        with np.load(path) as saved:
+            return cls(idf=saved["idf"], seed=int(saved["seed"]))
+
+
+def embed_to_memmap(
+    embedder: TextEmbedder,
+    texts: Iterable[str],
+    count: int,
+    path: str,
+    batch_size: int = EMBED_BATCH_SIZE
+) -> np.ndarray:
+    """
+    Embeds `count` texts in batches straight into a memory-mapped (count, EMBEDDING_DIM)
+    float32 `.npy` file, so the matrix never has to fit in RAM. Reopen it with
+    `np.load(path, mmap_mode="r")`.
+    """
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(count, EMBEDDING_DIM))
+    start = 0
+    for batch in _chunked(texts, batch_size):
+        matrix[start:start + len(batch)] = embedder.transform(batch)
+        start += len(batch)
+    if start != count:
+        raise ValueError(f"Expected {count} texts, got {start}")
+    matrix.flush()
+    return matrix
@@ -1,6 +1,35 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+import os
 import re
-from collections import Counter
+from app.services.ai.brands import get_brand_matcher
+from app.services.ai.taxonomy import TaxonomyMatcher
+
+# Batches smaller than this run in-process; a process pool only pays off for bulk jobs
+PARALLEL_THRESHOLD = 5000
+DEFAULT_CHUNK_SIZE = 1000
+
+# Per-process engine used by pool workers (see `_init_worker`)
+_worker_engine = None
+
+def _init_worker(category_keywords: Dict[str, List[str]]) -> None:
+    global _worker_engine
+    _worker_engine = AIEngine()
+    _worker_engine.CATEGORY_KEYWORDS = category_keywords
+
+def _run_chunk(method_name: str, chunk: List[str]) -> list:
+    fn = getattr(_worker_engine, method_name)
+    return [fn(text) for text in chunk]
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
 
 class AIEngine:
     """
@@ -17,6 +46,10 @@ class AIEngine:
         "Travel": ["travel", "vacation", "trip", "hotel", "explore", "adventure"]
     }
 
+    # Compiled form of CATEGORY_KEYWORDS (see `taxonomy_matcher`)
+    _taxonomy_matcher = None
+    _taxonomy_source = None
+
     def categorize_bio(self, bio_text: str) -> List[str]:
         """
         Analyzes a text string (Bio/Description) and assigns categories based on keyword usage.
@@ -25,33 +58,54 @@ class AIEngine:
         if not bio_text:
             return []
 
-        bio_lower = bio_text.lower()
-        scores = Counter()
+        return self.taxonomy_matcher.categorize(bio_text)
+
+    @property
+    def taxonomy_matcher(self) -> TaxonomyMatcher:
+        """
+        Compiled matcher for CATEGORY_KEYWORDS, built on first use.
+        Rebuilt automatically if CATEGORY_KEYWORDS is reassigned; call
+        `reload_taxonomy()` after mutating the dict in place.
+        """
+        if self._taxonomy_matcher is None or self._taxonomy_source is not self.CATEGORY_KEYWORDS:
+            return self.reload_taxonomy()
+        return self._taxonomy_matcher
 
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            for word in keywords:
-                # Simple word boundary regex to avoid partial matches (e.g. 'cat' in 'catch')
-                if re.search(r'\b' + re.escape(word) + r'\b', bio_lower):
-                    scores[category] += 1
+    @property
+    def taxonomy_version(self) -> str:
+        """
+        Fingerprint of the active taxonomy, stored next to derived niches.
+        """
+        return self.taxonomy_matcher.version
 
-        # Return categories with at least 1 match, sorted by score desc
-        return [cat for cat, score in scores.most_common() if score > 0]
+    def reload_taxonomy(self) -> TaxonomyMatcher:
+        """
+        Recompiles the keyword taxonomy.
+        """
+        self._taxonomy_source = self.CATEGORY_KEYWORDS
+        self._taxonomy_matcher = TaxonomyMatcher(self.CATEGORY_KEYWORDS)
+        return self._taxonomy_matcher
 
     def detect_brand_mentions(self, text: str, brand_names: List[str]) -> List[str]:
         """
         Scans text for specific brand names.
+        Uses one multi-pattern automaton per brand list (cached), not one regex per brand.
         """
         if not text:
             return []
-        
-        found_brands = []
-        text_lower = text.lower()
-        
-        for brand in brand_names:
-            if re.search(r'\b' + re.escape(brand.lower()) + r'\b', text_lower):
-                found_brands.append(brand)
-        
-        return found_brands
+
+        return get_brand_matcher(brand_names).find(text)
+
+    def locate_brand_mentions(self, text: str, brand_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Like `detect_brand_mentions`, but with details per brand:
+        {"Nike": {"count": 2, "offsets": [(0, 4), (20, 24)]}}
+        """
+        if not text:
+            return {}
+
+        located = get_brand_matcher(brand_names).locate(text)
+        return {brand: {"count": len(spans), "offsets": spans} for brand, spans in located.items()}
 
     def analyze_sentiment_rule_based(self, text: str) -> float:
         """
@@ -72,5 +126,88 @@ class AIEngine:
             
         return (pos_count - neg_count) / total
 
+    def categorize_many(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[List[str]]:
+        """
+        Batch version of `categorize_bio` for bulk ingestion / re-tagging jobs.
+        Yields one result per input text, in input order.
+        """
+        return self._map_batched("categorize_bio", texts, workers, chunk_size)
+
+    def analyze_many(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[float]:
+        """
+        Batch version of `analyze_sentiment_rule_based`.
+        Yields one score per input text, in input order.
+        """
+        return self._map_batched("analyze_sentiment_rule_based", texts, workers, chunk_size)
+
+    def _map_batched(
+        self,
+        method_name: str,
+        texts: Iterable[str],
+        workers: Optional[int],
+        chunk_size: int
+    ) -> Iterator[Any]:
+        """
+        Streams `texts` through `method_name` in chunks on a process pool.
+        Only a bounded number of chunks is in flight, so arbitrarily large iterables
+        (e.g. a DB cursor) are consumed lazily. Falls back to in-process execution
+        when the batch is below PARALLEL_THRESHOLD or workers == 1.
+        `workers=None` means one per CPU; anything below 1 raises ValueError right away.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        elif workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        return self._stream_batched(method_name, texts, workers, chunk_size)
+
+    def _stream_batched(
+        self,
+        method_name: str,
+        texts: Iterable[str],
+        workers: int,
+        chunk_size: int
+    ) -> Iterator[Any]:
+        chunks = _chunked(texts, chunk_size)
+
+        # Peek far enough ahead to decide whether a pool is worth starting
+        buffered: List[List[str]] = []
+        buffered_items = 0
+        for chunk in chunks:
+            buffered.append(chunk)
+            buffered_items += len(chunk)
+            if buffered_items >= PARALLEL_THRESHOLD:
+                break
+
+        if workers <= 1 or buffered_items < PARALLEL_THRESHOLD:
+            fn: Callable[[str], Any] = getattr(self, method_name)
+            for chunk in chain(buffered, chunks):
+                for text in chunk:
+                    yield fn(text)
+            return
+
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.CATEGORY_KEYWORDS,)
+        ) as pool:
+            pending = deque()
+            for chunk in chain(buffered, chunks):
+                pending.append(pool.submit(_run_chunk, method_name, chunk))
+                if len(pending) >= max_in_flight:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
 # Singleton instance
 ai_engine = AIEngine()
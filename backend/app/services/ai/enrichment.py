@@ -0,0 +1,140 @@
+from typing import Dict, List, NamedTuple, Optional, Set
+import hashlib
+from sqlalchemy import or_, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session
+from app.models.user import Influencer
+from app.services.ai.engine import AIEngine, ai_engine
+from app.services.ai.taxonomy import taxonomy_fingerprint
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def content_hash(text: Optional[str]) -> str:
+    """
+    SHA-256 of the text the niche is derived from (None and "" hash the same).
+    """
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def needs_enrichment(influencer: Influencer, engine: AIEngine = ai_engine) -> bool:
+    """
+    True if the bio or the taxonomy changed since `niche` was last derived.
+    """
+    return (
+        influencer.bio_hash != content_hash(influencer.bio)
+        or influencer.taxonomy_version != engine.taxonomy_version
+    )
+
+
+def enrich_influencer(influencer: Influencer, engine: AIEngine = ai_engine, force: bool = False) -> bool:
+    """
+    Re-derives `niche` from the bio only when needed.
+    Returns True if the AI pipeline actually ran. The caller commits.
+    """
+    if not force and not needs_enrichment(influencer, engine):
+        return False
+
+    influencer.niche = engine.categorize_bio(influencer.bio)
+    influencer.bio_hash = content_hash(influencer.bio)
+    influencer.taxonomy_version = engine.taxonomy_version
+    return True
+
+
+class TaxonomyDiff(NamedTuple):
+    # Categories whose output may change for profiles that already carry them
+    changed_categories: Set[str]
+    # Keywords that can newly match and add a category to a profile
+    added_keywords: Set[str]
+
+
+def diff_taxonomies(previous: Dict[str, List[str]], current: Dict[str, List[str]]) -> TaxonomyDiff:
+    """
+    Works out which categories an edit of CATEGORY_KEYWORDS touched.
+    """
+    changed: Set[str] = set()
+    added_keywords: Set[str] = set()
+
+    for category in previous.keys() | current.keys():
+        old_words = previous.get(category)
+        new_words = current.get(category)
+        if old_words != new_words:
+            changed.add(category)
+            added_keywords.update(set(new_words or []) - set(old_words or []))
+
+    # Tie-breaking follows category order, so moved categories count as changed too
+    old_order = [c for c in previous if c in current]
+    new_order = [c for c in current if c in previous]
+    for old_pos, category in enumerate(old_order):
+        if new_order[old_pos] != category:
+            changed.add(category)
+
+    return TaxonomyDiff(changed, added_keywords)
+
+
+def _escape_like(keyword: str) -> str:
+    return keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def backfill_taxonomy_change(
+    db: Session,
+    previous: Dict[str, List[str]],
+    engine: AIEngine = ai_engine,
+    batch_size: int = BACKFILL_BATCH_SIZE
+) -> Dict[str, int]:
+    """
+    Targeted backfill after CATEGORY_KEYWORDS changed from `previous` to the engine's taxonomy.
+
+    Only profiles enriched with the previous taxonomy are considered, and of those only
+    the ones that carry a changed category or whose bio contains a newly added keyword
+    are re-categorized. Every other profile provably keeps its niche, so it is just
+    re-stamped with the new version in one UPDATE, without reading bios.
+    """
+    old_version = taxonomy_fingerprint(previous)
+    new_version = engine.taxonomy_version
+    diff = diff_taxonomies(previous, engine.CATEGORY_KEYWORDS)
+    stats = {"candidates": 0, "changed": 0, "restamped": 0}
+
+    if old_version == new_version:
+        return stats
+
+    predicates = []
+    if diff.changed_categories:
+        # JSONB `?|` operator: niche contains any of the changed categories
+        predicates.append(Influencer.niche.has_any(array(sorted(diff.changed_categories))))
+    for keyword in sorted(diff.added_keywords):
+        # Substring prefilter only; categorize_bio applies the exact word-boundary rules
+        predicates.append(Influencer.bio.ilike(f"%{_escape_like(keyword)}%", escape="\\"))
+
+    if predicates:
+        last_id = None
+        while True:
+            query = db.query(Influencer).filter(
+                Influencer.taxonomy_version == old_version,
+                or_(*predicates)
+            )
+            if last_id is not None:
+                query = query.filter(Influencer.user_id > last_id)
+            batch = query.order_by(Influencer.user_id).limit(batch_size).all()
+            if not batch:
+                break
+
+            niches = engine.categorize_many([inf.bio for inf in batch])
+            for influencer, niche in zip(batch, niches):
+                if influencer.niche != niche:
+                    influencer.niche = niche
+                    stats["changed"] += 1
+                influencer.taxonomy_version = new_version
+
+            stats["candidates"] += len(batch)
+            last_id = batch[-1].user_id
+            db.commit()
+
+    result = db.execute(
+        update(Influencer)
+        .where(Influencer.taxonomy_version == old_version)
+        .values(taxonomy_version=new_version)
+    )
+    db.commit()
+    stats["restamped"] = result.rowcount
+    return stats
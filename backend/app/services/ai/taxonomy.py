@@ -0,0 +1,79 @@
+from typing import Dict, List, Tuple
+import hashlib
+import json
+import re
+
+# Same definition of a "word" as the regex \b boundary used by the original matcher
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def taxonomy_fingerprint(taxonomy: Dict[str, List[str]]) -> str:
+    """
+    Short, stable version id of a taxonomy. Category order is part of it,
+    since it decides how ties are ranked.
+    """
+    canonical = json.dumps(list(taxonomy.items()), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+class TaxonomyMatcher:
+    """
+    Compiled form of a category -> keywords taxonomy.
+    Built once, then scores every category in a single pass over the text.
+
+    Keywords that are a single \\w+ token (the common case) go into a
+    token -> category lookup table. `\\bword\\b` matches exactly when `word` is one
+    of the maximal \\w+ runs of the text, so a set lookup per token is equivalent.
+    Anything else (phrases, punctuation like 'c++') keeps the regex semantics
+    through one precompiled pattern per keyword.
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.categories: List[str] = list(taxonomy)
+        self.version = taxonomy_fingerprint(taxonomy)
+        # token -> category indices; a keyword listed twice counts twice, like the nested loop did
+        self.token_table: Dict[str, List[int]] = {}
+        self.phrase_patterns: List[Tuple[re.Pattern, int]] = []
+
+        for idx, keywords in enumerate(taxonomy.values()):
+            for word in keywords:
+                if TOKEN_PATTERN.fullmatch(word):
+                    self.token_table.setdefault(word, []).append(idx)
+                else:
+                    pattern = re.compile(r'\b' + re.escape(word) + r'\b')
+                    self.phrase_patterns.append((pattern, idx))
+
+    def scores(self, text_lower: str) -> List[int]:
+        """
+        Number of matched keywords per category (indexed like `self.categories`).
+        Expects already lower-cased text.
+        """
+        scores = [0] * len(self.categories)
+        table = self.token_table
+
+        for token in set(TOKEN_PATTERN.findall(text_lower)):
+            hits = table.get(token)
+            if hits:
+                for idx in hits:
+                    scores[idx] += 1
+
+        for pattern, idx in self.phrase_patterns:
+            if pattern.search(text_lower):
+                scores[idx] += 1
+
+        return scores
+
+    def categorize(self, text: str) -> List[str]:
+        """
+        Categories with at least one match, by score desc.
+        Ties keep taxonomy order (same as Counter.most_common on the old loop).
+        """
+        if not text:
+            return []
+
+        scores = self.scores(text.lower())
+        ranked = sorted(
+            (idx for idx, score in enumerate(scores) if score > 0),
+            key=lambda idx: -scores[idx]
+        )
+        return [self.categories[idx] for idx in ranked]
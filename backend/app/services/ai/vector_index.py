@@ -0,0 +1,148 @@
+from typing import Optional, Tuple
+import numpy as np
+
+# Rows scored per matrix product while training / assigning (bounds temporary memory)
+ASSIGN_BATCH_SIZE = 16384
+KMEANS_ITERATIONS = 10
+# k-means is trained on a sample of at most this many vectors per list
+TRAINING_ROWS_PER_LIST = 64
+
+
+def _nearest_lists(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+        batch = np.asarray(vectors[start:start + ASSIGN_BATCH_SIZE])
+        labels[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    n_lists: int,
+    iterations: int = KMEANS_ITERATIONS,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Spherical k-means on a sample of `vectors` (unit rows): `n_lists` unit centroids,
+    or one per vector when there are fewer vectors than lists.
+    """
+    n_lists = min(n_lists, len(vectors))
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * TRAINING_ROWS_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), size=sample_size, replace=False))])
+    centroids = sample[rng.choice(sample_size, size=n_lists, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _nearest_lists(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        # Re-seed empty lists with random sample rows
+        sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+        norms[empty] = np.linalg.norm(sums[empty], axis=1)
+        centroids = sums / np.maximum(norms, 1e-12)[:, None]
+    return centroids.astype(np.float32)
+
+
+class IVFIndex:
+    """
+    Inverted-file index for approximate nearest-neighbour search by dot product
+    (cosine similarity on unit vectors).
+
+    Vectors are clustered around `n_lists` k-means centroids and stored grouped by
+    list in their own (optionally memory-mapped) matrix; a query scores the
+    centroids, then only the vectors of the `n_probe` closest lists, each a
+    contiguous slice. `order` maps index positions back to the caller's row ids.
+    """
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, order: np.ndarray, vectors: np.ndarray):
+        self.centroids = centroids
+        self.offsets = offsets    # list l holds positions offsets[l]:offsets[l + 1]
+        self.order = order        # position -> original row
+        self.vectors = vectors    # rows grouped by list
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        path: Optional[str] = None,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Trains centroids and regroups `vectors` (may be a memmap) by list. With `path`,
+        the regrouped matrix is written to that `.npy` file instead of memory.
+        `n_lists` defaults to ~sqrt(n).
+        """
+        n = len(vectors)
+        n_lists = n_lists or max(1, int(np.sqrt(n)))
+        centroids = train_centroids(vectors, n_lists, seed=seed)
+        n_lists = len(centroids)
+        labels = _nearest_lists(vectors, centroids)
+        order = np.argsort(labels, kind="stable").astype(np.int64)
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=n_lists)))).astype(np.int64)
+
+        shape = (n, vectors.shape[1])
+        if path:
+            grouped = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+        else:
+            grouped = np.empty(shape, dtype=np.float32)
+        for start in range(0, n, ASSIGN_BATCH_SIZE):
+            rows = order[start:start + ASSIGN_BATCH_SIZE]
+            grouped[start:start + len(rows)] = vectors[rows]
+        if path:
+            grouped.flush()
+        return cls(centroids, offsets, order, grouped)
+
+    def search(self, query: np.ndarray, k: int = 10, n_probe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top `k` (rows, scores) by dot product with `query`, best first.
+        """
+        n_probe = min(n_probe, self.n_lists)
+        positions, scores = [], []
+        probe = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe] if n_probe else []
+        for lst in probe:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if end > start:
+                positions.append(np.arange(start, end))
+                scores.append(np.asarray(self.vectors[start:end]) @ query)
+        if not positions:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        positions, scores = np.concatenate(positions), np.concatenate(scores)
+        if len(scores) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+            positions, scores = positions[best], scores[best]
+        ranked = np.argsort(-scores, kind="stable")
+        return self.order[positions[ranked]], scores[ranked]
+
+    def save(self, path: str) -> None:
+        """
+        Saves everything but the vectors (kept in the `.npy` given to `build`).
+        """
+        np.savez(path, centroids=self.centroids, offsets=self.offsets, order=self.order)
+
+    @classmethod
+    def load(cls, path: str, vectors_path: str) -> "IVFIndex":
+        with np.load(path) as saved:
+            return cls(saved["centroids"], saved["offsets"], saved["order"], np.load(vectors_path, mmap_mode="r"))
+
+
+def exact_search(vectors: np.ndarray, query: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Brute-force top `k` (rows, scores) by dot product, for small sets and recall checks.
+    """
+    scores = np.concatenate([
+        np.asarray(vectors[start:start + ASSIGN_BATCH_SIZE]) @ query
+        for start in range(0, len(vectors), ASSIGN_BATCH_SIZE)
+    ]) if len(vectors) else np.empty(0, dtype=np.float32)
+    best = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+    best = best[np.argsort(-scores[best], kind="stable")]
+    return best, scores[best]
@@ -0,0 +1,268 @@
+from decimal import Decimal
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+import argparse
+import asyncio
+import logging
+import threading
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.campaign import Transaction
+from app.schemas.transaction import TransactionStatus
+from app.services.blockchain.merkle import MerkleTree, ProofStep, verify_proof
+from app.services.blockchain.service import BlockchainService, get_blockchain_service
+
+logger = logging.getLogger(__name__)
+
+
+class AnchoredRecord(NamedTuple):
+    record_id: Any
+    tx_hash: str
+    merkle_root: str
+    merkle_proof: List[ProofStep]
+
+
+def transaction_leaf(transaction: Transaction) -> bytes:
+    """
+    Canonical bytes of a transaction record as committed to the Merkle tree.
+    Only ids and the amount: no private data ends up on-chain, even hashed.
+    """
+    amount = Decimal(transaction.amount).quantize(Decimal("0.01"))
+    return f"{transaction.id}|{transaction.campaign_id}|{transaction.influencer_id}|{amount}".encode("utf-8")
+
+
+def anchor_batch(
+    records: List[Tuple[Any, bytes]],
+    service: Optional[BlockchainService] = None
+) -> List[AnchoredRecord]:
+    """
+    Builds a Merkle tree over (record_id, payload) pairs and anchors only its root,
+    in a single transaction. Returns each record's inclusion proof.
+    """
+    service = service or get_blockchain_service()
+    tree = MerkleTree([payload for _, payload in records])
+    tx_hash = service.anchor_root(tree.root_hex, len(tree))
+    return [
+        AnchoredRecord(record_id, tx_hash, tree.root_hex, tree.proof(index))
+        for index, (record_id, _) in enumerate(records)
+    ]
+
+
+def store_anchors(db: Session, anchored: List[AnchoredRecord]) -> List[str]:
+    """
+    Writes tx hash, root and proof next to each transaction row (one executemany UPDATE).
+    Returns the distinct tx hashes, for the receipt tracker.
+    """
+    if not anchored:
+        return []
+    db.execute(update(Transaction), [
+        {
+            "id": record.record_id,
+            "blockchain_tx_hash": record.tx_hash,
+            "merkle_root": record.merkle_root,
+            "merkle_proof": record.merkle_proof,
+        }
+        for record in anchored
+    ])
+    db.commit()
+    return list(dict.fromkeys(record.tx_hash for record in anchored))
+
+
+def reanchor_unanchored(
+    db: Session,
+    service: Optional[BlockchainService] = None,
+    batch_size: int = settings.ANCHOR_BATCH_SIZE
+) -> int:
+    """
+    Retry path for paid transactions without an anchor, e.g. after their anchoring
+    transaction reverted (see `receipts.apply_receipt_statuses`): anchors them
+    `batch_size` per Merkle root and stores the proofs. Returns how many were anchored.
+    """
+    query = (
+        select(Transaction)
+        .where(Transaction.status == TransactionStatus.PAID, Transaction.blockchain_tx_hash.is_(None))
+        .order_by(Transaction.id)
+        .limit(batch_size)
+    )
+    count = 0
+    # Stored rows get a hash, so each round selects the next batch
+    while transactions := db.execute(query).scalars().all():
+        store_anchors(db, anchor_batch([(t.id, transaction_leaf(t)) for t in transactions], service))
+        count += len(transactions)
+    return count
+
+
+def verify_transaction(transaction: Transaction) -> bool:
+    """
+    Local check that a stored transaction is covered by its anchored Merkle root.
+    Comparing the root with the one in `blockchain_tx_hash`'s calldata is a separate step.
+    """
+    if not transaction.merkle_root or transaction.merkle_proof is None:
+        return False
+    return verify_proof(transaction_leaf(transaction), transaction.merkle_proof, transaction.merkle_root)
+
+
+class AnchorBatcher:
+    """
+    Collects records and anchors them together once `max_batch_size` records are
+    waiting or `max_wait` seconds have passed since the first one, whichever comes first.
+
+    `add()` returns a future resolving to the record's AnchoredRecord. `on_anchored`
+    (e.g. a `store_anchors` wrapper) receives every anchored batch; it runs in a worker
+    thread, like the blocking web3 send.
+    """
+
+    def __init__(
+        self,
+        service: Optional[BlockchainService] = None,
+        max_batch_size: int = settings.ANCHOR_BATCH_SIZE,
+        max_wait: float = settings.ANCHOR_BATCH_WINDOW,
+        on_anchored: Optional[Callable[[List[AnchoredRecord]], None]] = None
+    ):
+        self.service = service or get_blockchain_service()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.on_anchored = on_anchored
+        self._pending: List[Tuple[Any, bytes, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: set = set()
+
+    def add(self, record_id: Any, payload: bytes) -> asyncio.Future:
+        """
+        Must be called from the event loop.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((record_id, payload, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            # Detach the full batch now so it never grows past max_batch_size
+            task = asyncio.create_task(self._anchor(self._take_batch()))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return future
+
+    async def flush(self) -> None:
+        """
+        Anchors whatever is pending right now.
+        """
+        await self._anchor(self._take_batch())
+
+    async def close(self) -> None:
+        """
+        Flushes the remaining records and waits for in-progress batches.
+        """
+        await self.flush()
+        await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _take_batch(self) -> List[Tuple[Any, bytes, asyncio.Future]]:
+        batch, self._pending = self._pending, []
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        return batch
+
+    async def _anchor(self, batch: List[Tuple[Any, bytes, asyncio.Future]]) -> None:
+        if not batch:
+            return
+
+        try:
+            anchored = await asyncio.to_thread(anchor_batch, [(rid, payload) for rid, payload, _ in batch], self.service)
+            if self.on_anchored:
+                await asyncio.to_thread(self.on_anchored, anchored)
+        except Exception as e:
+            logger.error("Anchoring a batch of %d records failed: %s", len(batch), e)
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), record in zip(batch, anchored):
+            if not future.done():
+                future.set_result(record)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait)
+        await self.flush()
+
+
+# Built by `get_anchor_batcher` on first use, only in processes holding the wallet
+_anchor_batcher: Optional[AnchorBatcher] = None
+_anchor_batcher_lock = threading.Lock()
+
+def _store_and_track(anchored: List[AnchoredRecord]) -> None:
+    from app.core.database import SessionLocal
+    from app.services.blockchain.receipts import get_receipt_tracker
+
+    with SessionLocal() as db:
+        tx_hashes = store_anchors(db, anchored)
+    tracker = get_receipt_tracker()
+    for tx_hash in tx_hashes:
+        tracker.track(tx_hash)
+
+def get_anchor_batcher() -> Optional[AnchorBatcher]:
+    """
+    The process-wide batcher, storing each anchored batch and handing its hash to the
+    receipt tracker. None without a `WALLET_PRIVATE_KEY`: the scheduled job anchors instead.
+    """
+    global _anchor_batcher
+    if _anchor_batcher is None and settings.WALLET_PRIVATE_KEY:
+        with _anchor_batcher_lock:
+            if _anchor_batcher is None:
+                _anchor_batcher = AnchorBatcher(on_anchored=_store_and_track)
+    return _anchor_batcher
+
+def _consume_failure(future: asyncio.Future) -> None:
+    # AnchorBatcher already logged it; the rows stay unanchored for the scheduled job
+    if not future.cancelled():
+        future.exception()
+
+async def queue_paid_transactions(db: AsyncSession, transaction_ids: List[Any]) -> int:
+    """
+    Queues the given transactions for the next Merkle batch if they are paid and not
+    anchored yet. Returns how many were queued (0 when this process doesn't anchor).
+    """
+    batcher = get_anchor_batcher()
+    if batcher is None or not transaction_ids:
+        return 0
+
+    result = await db.execute(
+        select(Transaction).where(
+            Transaction.id.in_(transaction_ids),
+            Transaction.status == TransactionStatus.PAID,
+            Transaction.blockchain_tx_hash.is_(None),
+        )
+    )
+    transactions = result.scalars().all()
+    for transaction in transactions:
+        batcher.add(transaction.id, transaction_leaf(transaction)).add_done_callback(_consume_failure)
+    return len(transactions)
+
+async def close_anchor_batcher() -> None:
+    """
+    Anchors what is still waiting in the batcher, if one was built.
+    """
+    if _anchor_batcher is not None:
+        await _anchor_batcher.close()
+
+
+def main() -> None:
+    """
+    python -m app.services.blockchain.anchoring [--batch-size 1000]
+    Scheduled job: anchors paid transactions that have no anchor yet.
+    """
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Anchor paid transactions that have no anchor yet")
+    parser.add_argument("--batch-size", type=int, default=settings.ANCHOR_BATCH_SIZE, help="records per Merkle root")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        count = reanchor_unanchored(db, batch_size=args.batch_size)
+    print(f"{count} transactions anchored")
+
+
+if __name__ == "__main__":
+    main()
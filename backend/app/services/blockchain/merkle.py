@@ -0,0 +1,84 @@
+from typing import Dict, List
+import hashlib
+
+# Domain separation: a leaf can never be passed off as an inner node (second-preimage attack)
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+ProofStep = Dict[str, str]
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """
+    Binary SHA-256 Merkle tree over a list of records.
+    An odd node at the end of a level is carried up unchanged rather than paired with
+    itself, so no two different record lists can produce the same root.
+    """
+
+    def __init__(self, records: List[bytes]):
+        if not records:
+            raise ValueError("Cannot build a Merkle tree without records")
+
+        self.levels: List[List[bytes]] = [[leaf_hash(r) for r in records]]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    @property
+    def root_hex(self) -> str:
+        return "0x" + self.root.hex()
+
+    def proof(self, index: int) -> List[ProofStep]:
+        """
+        Inclusion proof for record `index`: sibling hashes from leaf to root, each tagged
+        with the side it sits on. JSON-serializable, so it can be stored as is.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        steps: List[ProofStep] = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                side = "left" if sibling < index else "right"
+                steps.append({"position": side, "hash": "0x" + level[sibling].hex()})
+            # else: carried up without a sibling, nothing to hash at this level
+            index //= 2
+        return steps
+
+
+def verify_proof(record: bytes, proof: List[ProofStep], root_hex: str) -> bool:
+    """
+    Checks that `record` is included under `root_hex`. Pure local hashing, no chain access.
+    """
+    try:
+        current = leaf_hash(record)
+        for step in proof:
+            sibling = bytes.fromhex(step["hash"].removeprefix("0x"))
+            if step["position"] == "left":
+                current = node_hash(sibling, current)
+            elif step["position"] == "right":
+                current = node_hash(current, sibling)
+            else:
+                return False
+        return "0x" + current.hex() == root_hex.lower()
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return False
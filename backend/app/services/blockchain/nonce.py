@@ -0,0 +1,60 @@
+from typing import Dict
+import threading
+
+# Substrings of node errors that mean our local nonce view is wrong
+NONCE_ERROR_HINTS = ("nonce", "replacement transaction underpriced")
+# The node already holds these exact signed bytes (e.g. a resend after a timed-out call):
+# the transaction is in the mempool under its own hash, re-sending would duplicate it
+ALREADY_KNOWN_HINTS = ("already known", "known transaction")
+
+
+def is_nonce_error(error: Exception) -> bool:
+    if is_already_known(error):
+        return False
+    message = str(error).lower()
+    return any(hint in message for hint in NONCE_ERROR_HINTS)
+
+
+def is_already_known(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(hint in message for hint in ALREADY_KNOWN_HINTS)
+
+
+class NonceManager:
+    """
+    Hands out transaction nonces per sender address from a local counter.
+    The chain is asked (`get_transaction_count(..., "pending")`) only on first use
+    and after `resync`, so concurrent submissions neither collide nor pay an RPC each.
+    Thread-safe.
+    """
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, address: str) -> int:
+        with self._lock:
+            nonce = self._next.get(address)
+            if nonce is None:
+                nonce = self.w3.eth.get_transaction_count(address, "pending")
+            self._next[address] = nonce + 1
+            return nonce
+
+    def release(self, address: str, nonce: int) -> bool:
+        """
+        Gives back a nonce that was never broadcast. Only the most recent one can be
+        returned without leaving a gap; returns False if a resync is needed instead.
+        """
+        with self._lock:
+            if self._next.get(address) == nonce + 1:
+                self._next[address] = nonce
+                return True
+            return False
+
+    def resync(self, address: str) -> None:
+        """
+        Forget the local counter; the next allocation re-reads the pending count from the node.
+        """
+        with self._lock:
+            self._next.pop(address, None)
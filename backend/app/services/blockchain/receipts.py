@@ -0,0 +1,300 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import threading
+import time
+from sqlalchemy import null, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.campaign import Transaction
+from app.schemas.transaction import TransactionStatus
+
+logger = logging.getLogger(__name__)
+
+# (block_number, status) of a mined transaction
+Receipt = Tuple[int, int]
+SettledCallback = Callable[[List[str], List[str]], None]
+
+
+def _as_int(value: Any) -> int:
+    # Raw JSON-RPC results are hex strings; web3-formatted receipts already hold ints
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def apply_receipt_statuses(db: Session, confirmed: List[str], reverted: List[str]) -> None:
+    """
+    Bulk-applies tracker results: confirmed hashes move their rows to `verified_on_chain`;
+    reverted ones lose their hash (and Merkle data), which puts them back in the set
+    `anchoring.reanchor_unanchored` anchors again.
+    """
+    if confirmed:
+        db.execute(
+            update(Transaction)
+            .where(Transaction.blockchain_tx_hash.in_(confirmed), Transaction.status != TransactionStatus.FAILED)
+            .values(status=TransactionStatus.VERIFIED_ON_CHAIN),
+            execution_options={"synchronize_session": False}
+        )
+    if reverted:
+        db.execute(
+            update(Transaction)
+            .where(Transaction.blockchain_tx_hash.in_(reverted))
+            .values(blockchain_tx_hash=None, merkle_root=None, merkle_proof=null()),
+            execution_options={"synchronize_session": False}
+        )
+    db.commit()
+
+
+def unconfirmed_hashes(db: Session) -> List[str]:
+    """
+    Anchor hashes of paid transactions that aren't `verified_on_chain` yet (distinct).
+    """
+    return list(db.scalars(
+        select(Transaction.blockchain_tx_hash)
+        .where(Transaction.status == TransactionStatus.PAID, Transaction.blockchain_tx_hash.isnot(None))
+        .distinct()
+    ))
+
+
+class ReceiptTracker:
+    """
+    Follows many submitted transactions from one asyncio task until they are
+    `confirmations` blocks deep, without waiting on any of them inline.
+
+    RPC use per poll is bounded regardless of how many hashes are pending:
+    - one `eth_blockNumber`; if no new block arrived, nothing else (receipts can't change)
+    - receipts are fetched `batch_size` per batched JSON-RPC request, at most
+      `max_receipts` per poll (the rest rotate to the next poll)
+    - a hash whose receipt was already seen is re-fetched only once it is deep enough,
+      which also catches it being reorged out in between
+
+    The poll interval follows the observed block time and backs off exponentially
+    while no block (or only errors) come in.
+    """
+
+    def __init__(
+        self,
+        w3,
+        confirmations: int = settings.BLOCKCHAIN_CONFIRMATIONS,
+        batch_size: int = settings.RECEIPT_BATCH_SIZE,
+        max_receipts: int = settings.RECEIPT_MAX_PER_POLL,
+        min_interval: float = settings.RECEIPT_POLL_MIN_INTERVAL,
+        max_interval: float = settings.RECEIPT_POLL_MAX_INTERVAL,
+        on_settled: Optional[SettledCallback] = None
+    ):
+        self.w3 = w3
+        self.confirmations = confirmations
+        self.batch_size = batch_size
+        self.max_receipts = max_receipts
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.on_settled = on_settled
+        self.block_time = min_interval
+        self.rpc_calls = 0
+        self.batch_supported = True
+
+        # tx hash -> block number its receipt was last seen in (None: not mined yet)
+        self._pending: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._head: Optional[int] = None
+        self._head_seen_at: Optional[float] = None
+
+    def track(self, tx_hash: str) -> None:
+        """
+        Safe to call from worker threads (e.g. right after storing anchors).
+        """
+        with self._lock:
+            self._pending.setdefault(tx_hash.lower(), None)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        else:
+            self._wake.set()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def pending_hashes(self) -> List[str]:
+        with self._lock:
+            return list(self._pending)
+
+    def poll_once(self) -> Tuple[List[str], List[str]]:
+        """
+        One polling round. Returns the (confirmed, reverted) hashes it settled.
+        Blocking; `run` calls it from a worker thread.
+        """
+        head = self._call(lambda: self.w3.eth.block_number)
+        if head == self._head:
+            return [], []
+        self._observe_head(head)
+
+        with self._lock:
+            due = []
+            for tx_hash, mined_in in self._pending.items():
+                if mined_in is None or head - mined_in + 1 >= self.confirmations:
+                    due.append(tx_hash)
+                    if len(due) >= self.max_receipts:
+                        break
+
+        receipts = self._fetch_receipts(due)
+
+        confirmed: List[str] = []
+        reverted: List[str] = []
+        with self._lock:
+            for tx_hash in due:
+                if tx_hash not in self._pending:
+                    continue
+                receipt = receipts.get(tx_hash)
+                if receipt is None or head - receipt[0] + 1 < self.confirmations:
+                    self._pending[tx_hash] = receipt[0] if receipt else None
+                    # Checked this round: queue behind the hashes that weren't
+                    self._pending.move_to_end(tx_hash)
+                    continue
+                del self._pending[tx_hash]
+                (confirmed if receipt[1] == 1 else reverted).append(tx_hash)
+        return confirmed, reverted
+
+    async def run(self) -> None:
+        """
+        Polls until cancelled. Sleeps while nothing is pending.
+        """
+        self._loop = asyncio.get_running_loop()
+        interval = self.min_interval
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+
+            previous_head = self._head
+            try:
+                confirmed, reverted = await asyncio.to_thread(self.poll_once)
+            except Exception as e:
+                logger.warning("Receipt poll failed: %s", e)
+                interval = min(interval * 2, self.max_interval)
+            else:
+                if self._head != previous_head:
+                    interval = min(max(self.block_time, self.min_interval), self.max_interval)
+                else:
+                    interval = min(interval * 2, self.max_interval)
+
+                if (confirmed or reverted) and self.on_settled:
+                    try:
+                        await asyncio.to_thread(self.on_settled, confirmed, reverted)
+                    except Exception as e:
+                        logger.error("Applying %d receipt results failed: %s", len(confirmed) + len(reverted), e)
+
+            await asyncio.sleep(interval)
+
+    def _call(self, fn):
+        self.rpc_calls += 1
+        return fn()
+
+    def _observe_head(self, head: int) -> None:
+        now = time.monotonic()
+        if self._head is not None and self._head_seen_at is not None and head > self._head:
+            per_block = (now - self._head_seen_at) / (head - self._head)
+            # Moving average, so one slow block doesn't stretch the interval
+            self.block_time = 0.8 * self.block_time + 0.2 * per_block
+        self._head = head
+        self._head_seen_at = now
+
+    def _fetch_receipts(self, tx_hashes: List[str]) -> Dict[str, Receipt]:
+        receipts: Dict[str, Receipt] = {}
+        for start in range(0, len(tx_hashes), self.batch_size):
+            chunk = tx_hashes[start:start + self.batch_size]
+            if self.batch_supported:
+                batch = self._fetch_batch(chunk)
+                if batch is not None:
+                    receipts.update(batch)
+                    continue
+            receipts.update(self._fetch_one_by_one(chunk))
+        return receipts
+
+    def _fetch_batch(self, tx_hashes: List[str]) -> Optional[Dict[str, Receipt]]:
+        make_batch_request = getattr(self.w3.provider, "make_batch_request", None)
+        try:
+            if make_batch_request is None:
+                raise NotImplementedError
+            responses = self._call(lambda: make_batch_request(
+                [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in tx_hashes]
+            ))
+        except (NotImplementedError, TypeError):
+            # Provider (or web3 < 7) can't batch; fall back to one call per hash from now on
+            logger.info("Provider does not support batched JSON-RPC, polling receipts one by one")
+            self.batch_supported = False
+            return None
+        if not isinstance(responses, list):
+            # Some nodes answer a batch with a single error object
+            logger.info("Batched JSON-RPC rejected (%s), polling receipts one by one", responses)
+            self.batch_supported = False
+            return None
+
+        receipts: Dict[str, Receipt] = {}
+        for tx_hash, response in zip(tx_hashes, responses):
+            result = response.get("result")
+            if result:
+                receipts[tx_hash] = (_as_int(result["blockNumber"]), _as_int(result["status"]))
+        return receipts
+
+    def _fetch_one_by_one(self, tx_hashes: List[str]) -> Dict[str, Receipt]:
+        # Imported here so importing this module (app startup) doesn't load web3
+        from web3.exceptions import TransactionNotFound
+
+        receipts: Dict[str, Receipt] = {}
+        for tx_hash in tx_hashes:
+            try:
+                result = self._call(lambda: self.w3.eth.get_transaction_receipt(tx_hash))
+            except TransactionNotFound:
+                continue
+            if result:
+                receipts[tx_hash] = (_as_int(result["blockNumber"]), _as_int(result["status"]))
+        return receipts
+
+
+# Built by `get_receipt_tracker` on first use, not at import
+_receipt_tracker: Optional[ReceiptTracker] = None
+_receipt_tracker_lock = threading.Lock()
+
+def _apply_in_new_session(confirmed: List[str], reverted: List[str]) -> None:
+    from app.core.database import SessionLocal
+
+    with SessionLocal() as db:
+        apply_receipt_statuses(db, confirmed, reverted)
+
+def get_receipt_tracker() -> ReceiptTracker:
+    """
+    The process-wide tracker, applying what it settles to `transactions` in a fresh session.
+    Anchoring code hands it every hash it stores (see `anchoring.store_anchors`).
+    """
+    global _receipt_tracker
+    if _receipt_tracker is None:
+        with _receipt_tracker_lock:
+            if _receipt_tracker is None:
+                from app.services.blockchain.service import get_blockchain_service
+                _receipt_tracker = ReceiptTracker(get_blockchain_service().w3, on_settled=_apply_in_new_session)
+    return _receipt_tracker
+
+async def run_receipt_tracking(session_factory, rescan_interval: float = settings.RECEIPT_RESCAN_INTERVAL) -> None:
+    """
+    Runs the process-wide tracker until cancelled. Every `rescan_interval` it also tracks the
+    hashes of paid rows still waiting for confirmation: rows anchored before a restart, by
+    the `anchoring` CLI or by another worker. Tracking a hash twice is a no-op.
+    """
+    tracker = get_receipt_tracker()
+
+    def load() -> List[str]:
+        with session_factory() as db:
+            return unconfirmed_hashes(db)
+
+    poller = asyncio.create_task(tracker.run())
+    try:
+        while True:
+            try:
+                for tx_hash in await asyncio.to_thread(load):
+                    tracker.track(tx_hash)
+            except Exception as e:
+                logger.warning("Loading unconfirmed anchor hashes failed: %s", e)
+            await asyncio.sleep(rescan_interval)
+    finally:
+        poller.cancel()
@@ -1,44 +1,130 @@
-from web3 import Web3
 from app.core.config import settings
+from app.services.blockchain.nonce import NonceManager, is_nonce_error
+from app.services.blockchain.submitter import TransactionSubmitter, sign_and_send
+from typing import TYPE_CHECKING, Any, Dict, Optional
 import json
 import os
+import threading
+
+if TYPE_CHECKING:
+    from web3 import Web3
 
 class BlockchainService:
-    def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(settings.WEB3_PROVIDER_URL))
+    def __init__(self, w3: Optional["Web3"] = None, private_key: Optional[str] = None):
+        if w3 is None:
+            # web3 (and eth_account under it) is a heavy import: only paid by processes that build a service
+            from web3 import Web3
+            w3 = Web3(Web3.HTTPProvider(settings.WEB3_PROVIDER_URL))
+        self.w3 = w3
         self.account = None
-        if settings.WALLET_PRIVATE_KEY:
-            self.account = self.w3.eth.account.from_key(settings.WALLET_PRIVATE_KEY)
+        private_key = private_key or settings.WALLET_PRIVATE_KEY
+        if private_key:
+            self.account = self.w3.eth.account.from_key(private_key)
         
         self.contract_address = settings.CONTRACT_ADDRESS
         # In real app, load ABI from json file
         self.abi = [] 
+        self._chain_id: Optional[int] = None
+
+        # Local nonces: no get_transaction_count round trip per transaction, no collisions
+        self.nonce_manager = NonceManager(self.w3)
+        self.submitter = None
+        if self.account:
+            self.submitter = TransactionSubmitter(
+                self.w3, self.account, self.nonce_manager, max_in_flight=settings.BLOCKCHAIN_MAX_IN_FLIGHT
+            )
 
     def is_connected(self) -> bool:
         return self.w3.is_connected()
 
+    @property
+    def chain_id(self) -> int:
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    def _base_tx(self, amount_wei: int = 0) -> Dict[str, Any]:
+        if not self.account or not self.contract_address:
+            raise Exception("Blockchain misconfigured")
+
+        return {
+            'from': self.account.address,
+            'value': amount_wei,
+            'gas': settings.BLOCKCHAIN_GAS_LIMIT,
+            'gasPrice': self.w3.to_wei(settings.BLOCKCHAIN_GAS_PRICE_GWEI, 'gwei'),
+            'chainId': self.chain_id,
+        }
+
+    def build_record_tx(self, campaign_id: str, influencer_address: str, amount_wei: int = 0) -> Dict[str, Any]:
+        """
+        Unsigned transaction recording a campaign (nonce is filled in at send time).
+        """
+        tx = self._base_tx(amount_wei)
+        if self.abi:
+            contract = self.w3.eth.contract(address=self.contract_address, abi=self.abi)
+            return contract.functions.createCampaign(campaign_id, influencer_address).build_transaction(tx)
+
+        # No ABI loaded: anchor the campaign UUID as calldata to the escrow address
+        return {**tx, 'to': self.contract_address, 'data': self.w3.to_hex(text=campaign_id)}
+
+    def build_anchor_tx(self, merkle_root: str, record_count: int) -> Dict[str, Any]:
+        """
+        Unsigned transaction anchoring the Merkle root of a batch of records.
+        """
+        tx = self._base_tx()
+        if self.abi:
+            contract = self.w3.eth.contract(address=self.contract_address, abi=self.abi)
+            return contract.functions.anchorRoot(merkle_root, record_count).build_transaction(tx)
+
+        return {**tx, 'to': self.contract_address, 'data': merkle_root}
+
+    def _send_now(self, tx: Dict[str, Any]) -> str:
+        address = self.account.address
+        nonce = self.nonce_manager.allocate(address)
+        try:
+            return sign_and_send(self.w3, self.account, tx, nonce)
+        except Exception as e:
+            if is_nonce_error(e) or not self.nonce_manager.release(address, nonce):
+                self.nonce_manager.resync(address)
+            raise
+
     def create_record(self, campaign_id: str, influencer_address: str, amount_wei: int = 0) -> str:
         """
         Sends a transaction to the smart contract to record a new campaign.
-        Returns the Transaction Hash.
+        Returns the Transaction Hash. Blocks until the node accepts it; prefer `submit_record`.
         """
-        if not self.account or not self.contract_address:
-            raise Exception("Blockchain misconfigured")
+        return self._send_now(self.build_record_tx(campaign_id, influencer_address, amount_wei))
 
-        # Mock Contract Function Call
-        # contract = self.w3.eth.contract(address=self.contract_address, abi=self.abi)
-        # tx = contract.functions.createCampaign(campaign_id, influencer_address).build_transaction({
-        #     'from': self.account.address,
-        #     'nonce': self.w3.eth.get_transaction_count(self.account.address),
-        #     'value': amount_wei,
-        #     'gas': 200000,
-        #     'gasPrice': self.w3.to_wei('50', 'gwei')
-        # })
-        
-        # signed_tx = self.w3.eth.account.sign_transaction(tx, settings.WALLET_PRIVATE_KEY)
-        # tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        # return self.w3.to_hex(tx_hash)
-        
-        return "0x_mock_transaction_hash"
+    def anchor_root(self, merkle_root: str, record_count: int) -> str:
+        """
+        Records one Merkle root covering `record_count` records. Returns the Transaction Hash.
+        """
+        return self._send_now(self.build_anchor_tx(merkle_root, record_count))
+
+    def submit_record(self, campaign_id: str, influencer_address: str, amount_wei: int = 0) -> str:
+        """
+        Queues the campaign record on the async submitter and returns a tracking id immediately.
+        Must be called from the event loop. See `submission_status`.
+        """
+        tx = self.build_record_tx(campaign_id, influencer_address, amount_wei)
+        return self.submitter.submit(tx)
+
+    def submission_status(self, tracking_id: str) -> Optional[Dict[str, Any]]:
+        return self.submitter.status(tracking_id) if self.submitter else None
+
+# Built by `get_blockchain_service` on first use, not at import
+_blockchain_service: Optional[BlockchainService] = None
+_blockchain_service_lock = threading.Lock()
 
-blockchain_service = BlockchainService()
+def get_blockchain_service() -> BlockchainService:
+    """
+    The process-wide BlockchainService. Creating the provider and deriving the
+    account happen on the first call, not at import.
+    """
+    global _blockchain_service
+    if _blockchain_service is None:
+        # Called from worker threads (anchoring, receipts): two services would hand out the same nonces
+        with _blockchain_service_lock:
+            if _blockchain_service is None:
+                _blockchain_service = BlockchainService()
+    return _blockchain_service
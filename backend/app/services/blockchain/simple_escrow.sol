@@ -28,6 +28,10 @@ contract InfluencerEscrow {
     event CampaignCreated(string indexed offChainId, address indexed influencer, uint256 amount);
     event CampaignReleased(string indexed offChainId, address indexed influencer, uint256 amount);
     event CampaignRefunded(string indexed offChainId, uint256 amount);
+    event RootAnchored(bytes32 indexed merkleRoot, uint256 recordCount);
+
+    // Merkle roots of batched off-chain records -> block timestamp they were anchored at
+    mapping(bytes32 => uint256) public anchoredRoots;
 
     modifier onlyAuthority() {
         require(msg.sender == backendAuthority, "Only Backend can call this");
@@ -67,4 +71,11 @@ contract InfluencerEscrow {
 
         emit CampaignReleased(_offChainId, c.influencer, c.amount);
     }
+
+    // 3. Anchor a batch (one root covers many records; proofs are stored off-chain)
+    function anchorRoot(bytes32 _merkleRoot, uint256 _recordCount) public onlyAuthority {
+        require(anchoredRoots[_merkleRoot] == 0, "Root already anchored");
+        anchoredRoots[_merkleRoot] = block.timestamp;
+        emit RootAnchored(_merkleRoot, _recordCount);
+    }
 }
@@ -0,0 +1,144 @@
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import uuid
+from app.core.cache import LRUCache
+from app.services.blockchain.nonce import NonceManager, is_already_known, is_nonce_error
+
+logger = logging.getLogger(__name__)
+
+TRACKED_SUBMISSIONS = 100_000
+
+
+class Submission:
+    """
+    Tracking record for one queued transaction.
+    state: queued -> sent (accepted by the node) | failed
+    """
+    __slots__ = ("tracking_id", "tx", "state", "nonce", "tx_hash", "error", "attempts")
+
+    def __init__(self, tracking_id: str, tx: Dict[str, Any]):
+        self.tracking_id = tracking_id
+        self.tx = tx
+        self.state = "queued"
+        self.nonce: Optional[int] = None
+        self.tx_hash: Optional[str] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "tracking_id": self.tracking_id,
+            "state": self.state,
+            "nonce": self.nonce,
+            "tx_hash": self.tx_hash,
+            "error": self.error,
+        }
+
+
+class TransactionSubmitter:
+    """
+    Async queue that signs and broadcasts transactions for one wallet, keeping up to
+    `max_in_flight` sends in progress at once. Nonces come from a local NonceManager;
+    on a nonce error the counter is resynced from the node and the transaction retried.
+
+    `submit()` returns a tracking id immediately; confirmation is tracked separately.
+    Web3 calls are blocking, so they run in worker threads.
+    """
+
+    def __init__(self, w3, account, nonce_manager: NonceManager, max_in_flight: int = 8, max_retries: int = 3):
+        self.w3 = w3
+        self.account = account
+        self.nonce_manager = nonce_manager
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        # Recent submissions only; old tracking ids age out
+        self._submissions = LRUCache(max_entries=TRACKED_SUBMISSIONS)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+
+    def submit(self, tx: Dict[str, Any]) -> str:
+        """
+        Queue an unsigned transaction (without nonce). Must be called from the event loop.
+        """
+        self._ensure_started()
+        submission = Submission(uuid.uuid4().hex, tx)
+        self._submissions.set(submission.tracking_id, submission)
+        self._queue.put_nowait(submission)
+        return submission.tracking_id
+
+    def status(self, tracking_id: str) -> Optional[Dict[str, Any]]:
+        submission = self._submissions.get(tracking_id)
+        return submission.as_dict() if submission else None
+
+    async def join(self) -> None:
+        """
+        Wait until everything queued so far has been sent or has failed.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+
+    async def _worker(self) -> None:
+        while True:
+            submission = await self._queue.get()
+            try:
+                await self._send(submission)
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, submission: Submission) -> None:
+        address = self.account.address
+        while True:
+            submission.attempts += 1
+            nonce = await asyncio.to_thread(self.nonce_manager.allocate, address)
+            submission.nonce = nonce
+            try:
+                tx_hash = await asyncio.to_thread(self._sign_and_send, submission.tx, nonce)
+            except Exception as e:
+                if is_nonce_error(e) and submission.attempts <= self.max_retries:
+                    logger.warning("Nonce %s rejected for %s, resyncing: %s", nonce, submission.tracking_id, e)
+                    self.nonce_manager.resync(address)
+                    continue
+                if not self.nonce_manager.release(address, nonce):
+                    # A later nonce is already out; re-read the node's view to close the gap
+                    self.nonce_manager.resync(address)
+                submission.state = "failed"
+                submission.error = str(e)
+                logger.error("Transaction %s failed: %s", submission.tracking_id, e)
+                return
+
+            submission.tx_hash = tx_hash
+            submission.state = "sent"
+            return
+
+    def _sign_and_send(self, tx: Dict[str, Any], nonce: int) -> str:
+        return sign_and_send(self.w3, self.account, tx, nonce)
+
+
+def sign_and_send(w3, account, tx: Dict[str, Any], nonce: int) -> str:
+    """
+    Signs `tx` with `nonce` and broadcasts it; returns the transaction hash.
+    A node that already has this exact transaction counts as accepted.
+    """
+    signed = account.sign_transaction({**tx, "nonce": nonce})
+    # web3 >= 7 renamed rawTransaction -> raw_transaction
+    raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+    try:
+        return w3.to_hex(w3.eth.send_raw_transaction(raw))
+    except Exception as e:
+        if not is_already_known(e):
+            raise
+        logger.info("Transaction with nonce %s already known to the node", nonce)
+        return w3.to_hex(signed.hash)
@@ -0,0 +1,212 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+import argparse
+import hashlib
+import heapq
+import json
+import logging
+import threading
+import time
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.cache import LRUCache
+from app.models.campaign import Campaign
+from app.schemas.campaign import CampaignStatus
+from app.services.ai.engine import AIEngine, ai_engine
+from app.services.discovery.catalog import CatalogSnapshot, InfluencerCatalog, influencer_catalog
+
+logger = logging.getLogger(__name__)
+
+# Weighted score, 0-1
+NICHE_WEIGHT = 0.5
+TIER_WEIGHT = 0.3
+ENGAGEMENT_WEIGHT = 0.2
+# Rough cost of one sponsored post per follower (INR): budget / this = the audience size it buys
+COST_PER_FOLLOWER = 0.2
+TIER_TOLERANCE = 1.0  # decades of followers away from that size at which tier fit drops to 0
+ENGAGEMENT_CAP = 0.1  # engagement rate that earns full marks
+MATCH_CHUNK = 65536  # rows scored per vectorized step
+MATCH_CACHE_SIZE = 20000
+DEFAULT_MATCHES = 20
+
+
+class CampaignProfile(NamedTuple):
+    tags: List[str]   # AIEngine categories of title + description
+    budget: float
+    revision: str     # changes whenever anything the ranking depends on does
+
+
+class InfluencerMatch(NamedTuple):
+    user_id: UUID
+    score: float
+    niche_overlap: float
+    tier_fit: float
+    engagement: float
+
+
+def campaign_profile(title: str, description: Optional[str], budget: float, engine: AIEngine = ai_engine) -> CampaignProfile:
+    """
+    Categorizes a campaign with the same taxonomy as influencer bios.
+    """
+    tags = engine.categorize_bio(f"{title}\n{description or ''}")
+    canonical = json.dumps([title, description, float(budget), engine.taxonomy_version], ensure_ascii=False)
+    return CampaignProfile(tags, float(budget), hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16])
+
+
+class _RowFeatures(NamedTuple):
+    version: int
+    log_followers: np.ndarray   # -inf where unknown
+    engagement: np.ndarray      # engagement component, 0-1
+
+
+class MatchingEngine:
+    """
+    Ranks catalog influencers for a campaign by
+        NICHE_WEIGHT * niche overlap + TIER_WEIGHT * follower tier fit + ENGAGEMENT_WEIGHT * engagement
+    - niche overlap: share of the campaign's categories the influencer carries
+      (influencers with none are not candidates, unless the campaign has no category)
+    - tier fit: 1 at the audience size the budget buys, down to 0 at TIER_TOLERANCE decades away
+    - engagement: engagement rate / ENGAGEMENT_CAP, capped at 1
+
+    Scores are computed for MATCH_CHUNK rows at a time with numpy; only rows beating the
+    current k-th best go through a bounded heap, so nothing sorts the candidate set.
+    Results are cached per (campaign revision, k, catalog snapshot).
+    """
+
+    def __init__(self, catalog: InfluencerCatalog = influencer_catalog, cache_size: int = MATCH_CACHE_SIZE):
+        self.catalog = catalog
+        self.cache = LRUCache(cache_size)
+        self._features: Optional[_RowFeatures] = None
+        self._features_lock = threading.Lock()
+
+    def _row_features(self, snapshot: CatalogSnapshot) -> _RowFeatures:
+        with self._features_lock:
+            if self._features is None or self._features.version != snapshot.version:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    log_followers = np.log10(snapshot.followers).astype(np.float32)
+                log_followers[np.isnan(log_followers)] = -np.inf
+                engagement = np.nan_to_num(np.clip(snapshot.engagement / ENGAGEMENT_CAP, 0, 1), nan=0)
+                self._features = _RowFeatures(snapshot.version, log_followers, engagement.astype(np.float32))
+            return self._features
+
+    def _score_chunk(self, snapshot, features, words, n_tags, log_target, start, end):
+        """
+        Candidate rows among start:end (chunk-relative) with their overlap, tier fit and score.
+        """
+        if n_tags:
+            shared = np.zeros(end - start, dtype=np.uint8)
+            for word, bits in words.items():
+                shared += np.bitwise_count(snapshot.tags[word, start:end] & np.uint8(bits))
+            rows = np.flatnonzero((shared > 0) & snapshot.alive[start:end])
+            overlap = shared[rows].astype(np.float32) / np.float32(n_tags)
+        else:
+            rows = np.flatnonzero(snapshot.alive[start:end])
+            overlap = np.zeros(len(rows), dtype=np.float32)
+        tier = np.abs(features.log_followers[start:end][rows] - np.float32(log_target))
+        tier = np.clip(1 - tier / np.float32(TIER_TOLERANCE), 0, 1)
+        score = NICHE_WEIGHT * overlap + TIER_WEIGHT * tier + ENGAGEMENT_WEIGHT * features.engagement[start:end][rows]
+        return rows, overlap, tier, score
+
+    def rank(self, profile: CampaignProfile, k: int = DEFAULT_MATCHES) -> List[InfluencerMatch]:
+        """
+        Top `k` influencers for the campaign, best first (uncached).
+        """
+        snapshot = self.catalog.snapshot
+        features = self._row_features(snapshot)
+        words, _ = snapshot.tag_words(profile.tags)
+        n_tags = len(set(profile.tags))
+        if n_tags and not words:
+            return []
+        log_target = np.log10(max(profile.budget / COST_PER_FOLLOWER, 1.0))
+
+        heap: List[Tuple[float, int, float, float]] = []  # (score, -row, overlap, tier), min-heap
+        for start in range(0, len(snapshot.ids), MATCH_CHUNK):
+            end = min(start + MATCH_CHUNK, len(snapshot.ids))
+            rows, overlap, tier, score = self._score_chunk(snapshot, features, words, n_tags, log_target, start, end)
+            threshold = heap[0][0] if len(heap) == k else 0.0
+            better = np.flatnonzero(score > threshold)
+            if len(better) > k:
+                better = better[np.argpartition(-score[better], k - 1)[:k]]
+            for i in better.tolist():
+                entry = (float(score[i]), -(start + int(rows[i])), float(overlap[i]), float(tier[i]))
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return [
+            InfluencerMatch(snapshot.user_id(-neg_row), score, overlap, tier, float(features.engagement[-neg_row]))
+            for score, neg_row, overlap, tier in sorted(heap, reverse=True)
+        ]
+
+    def match(self, profile: CampaignProfile, k: int = DEFAULT_MATCHES) -> List[InfluencerMatch]:
+        """
+        Cached `rank`: recomputed only when the campaign or the catalog changed.
+        """
+        key = (profile.revision, k, self.catalog.snapshot.version)
+        matches = self.cache.get(key)
+        if matches is None:
+            matches = self.rank(profile, k)
+            self.cache.set(key, matches)
+        return matches
+
+
+matching_engine = MatchingEngine()
+
+
+def active_campaigns(db: Session, batch_size: int = 1000) -> Iterator[Tuple[UUID, CampaignProfile]]:
+    query = (
+        select(Campaign.id, Campaign.title, Campaign.description, Campaign.budget)
+        .where(Campaign.status == CampaignStatus.ACTIVE)
+        .execution_options(yield_per=batch_size)
+    )
+    for campaign_id, title, description, budget in db.execute(query):
+        yield campaign_id, campaign_profile(title, description, float(budget))
+
+
+def match_campaigns(
+    campaigns: Iterable[Tuple[UUID, CampaignProfile]],
+    out_path: str,
+    k: int = DEFAULT_MATCHES,
+    engine: MatchingEngine = matching_engine
+) -> int:
+    """
+    Batch export: ranks every campaign and writes one JSON line per campaign to `out_path`
+    (for offline use such as outreach lists; the API ranks on demand and does not read it).
+    Returns the number of campaigns.
+    """
+    count = 0
+    started = time.perf_counter()
+    with open(out_path, "w", encoding="utf-8") as out:
+        for campaign_id, profile in campaigns:
+            matches = engine.match(profile, k)
+            out.write(json.dumps({
+                "campaign_id": str(campaign_id),
+                "tags": profile.tags,
+                "matches": [{"user_id": str(m.user_id), "score": round(m.score, 4)} for m in matches],
+            }) + "\n")
+            count += 1
+    logger.info("Matched %d campaigns in %.1f s", count, time.perf_counter() - started)
+    return count
+
+
+def main() -> None:
+    """
+    python -m app.services.discovery.matching --out matches.jsonl [--k 20]
+    """
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Match active campaigns against the influencer catalog")
+    parser.add_argument("--out", default="matches.jsonl", help="matches per campaign (JSON lines)")
+    parser.add_argument("--k", type=int, default=DEFAULT_MATCHES, help="influencers per campaign")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        influencer_catalog.refresh(db)
+        count = match_campaigns(active_campaigns(db), args.out, args.k)
+    print(f"{count} campaigns matched -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
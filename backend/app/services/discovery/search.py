@@ -0,0 +1,92 @@
+from decimal import Decimal, InvalidOperation
+from typing import List, Optional, Tuple
+from uuid import UUID
+import base64
+import json
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.dialects.postgresql import array
+from app.models.user import Influencer, metric_value
+from app.schemas.discovery import DiscoverySort, InfluencerSearch, NicheMatch
+
+# Sort option -> metric key; each has an index on (metric_value(key), user_id)
+SORT_METRICS = {
+    DiscoverySort.FOLLOWERS: "followers",
+    DiscoverySort.ENGAGEMENT_RATE: "engagement_rate",
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: DiscoverySort, value: Decimal, user_id: UUID) -> str:
+    raw = json.dumps([sort.value, str(value), str(user_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: DiscoverySort) -> Tuple[Decimal, UUID]:
+    """
+    Returns the (sort value, user_id) of the last row of the previous page.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, user_id = json.loads(raw)
+        if cursor_sort != sort.value:
+            raise InvalidCursor("cursor belongs to a different sort order")
+        return Decimal(value), UUID(user_id)
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError, InvalidOperation) as e:
+        raise InvalidCursor("malformed cursor") from e
+
+
+def _metric_range(key: str, low, high) -> list:
+    clauses = []
+    if low is not None:
+        clauses.append(metric_value(key) >= low)
+    if high is not None:
+        clauses.append(metric_value(key) <= high)
+    return clauses
+
+
+def build_search_query(search: InfluencerSearch) -> Select:
+    """
+    Compiles the filters into predicates the influencer indexes can serve:
+    - niche tags: jsonb containment (`@>`) or `?|`, both GIN (`idx_influencers_niche`)
+    - follower / engagement ranges: on the indexed expressions (`metric_value`)
+    - keyset pagination: `(value, user_id) < (cursor)` in index order, so page 500 starts
+      with an index seek just like page 1, instead of reading and dropping OFFSET rows
+
+    Fetches `limit + 1` rows; the extra one only tells whether there is a next page.
+    """
+    sort_key = SORT_METRICS[search.sort]
+    sort_value = metric_value(sort_key)
+
+    query = select(Influencer, sort_value).where(sort_value.is_not(None))
+    if search.niche:
+        if search.niche_match == NicheMatch.ALL:
+            query = query.where(Influencer.niche.contains(search.niche))
+        else:
+            query = query.where(Influencer.niche.has_any(array(search.niche)))
+
+    filters = _metric_range("followers", search.min_followers, search.max_followers)
+    filters += _metric_range("engagement_rate", search.min_engagement, search.max_engagement)
+    query = query.where(*filters)
+
+    if search.cursor:
+        value, user_id = decode_cursor(search.cursor, search.sort)
+        query = query.where(tuple_(sort_value, Influencer.user_id) < tuple_(value, user_id))
+
+    return query.order_by(sort_value.desc(), Influencer.user_id.desc()).limit(search.limit + 1)
+
+
+def page_from_rows(search: InfluencerSearch, rows: List[tuple]) -> Tuple[List[Influencer], Optional[str]]:
+    """
+    Splits the `limit + 1` (influencer, sort value) rows into the page and its next cursor.
+    """
+    page = rows[:search.limit]
+    next_cursor = None
+    if len(rows) > search.limit:
+        last, last_value = page[-1]
+        next_cursor = encode_cursor(search.sort, last_value, last.user_id)
+    return [influencer for influencer, _ in page], next_cursor
@@ -0,0 +1,129 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+import argparse
+import os
+import threading
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.user import Influencer
+from app.services.ai.embeddings import EMBED_BATCH_SIZE, TextEmbedder, embed_to_memmap
+from app.services.ai.vector_index import IVFIndex
+from app.services.discovery.catalog import _to_uuid
+
+# Files of a semantic index directory
+EMBEDDER_FILE = "embedder.npz"
+IDS_FILE = "ids.npy"
+IVF_FILE = "ivf.npz"
+VECTORS_FILE = "vectors.npy"
+DEFAULT_N_PROBE = 32
+
+
+class SemanticIndex:
+    """
+    "Semantic" influencer search: free text is embedded like the bios were
+    (TextEmbedder) and matched by cosine similarity through an IVF index, whose
+    vectors stay memory-mapped on disk.
+    """
+
+    def __init__(self, embedder: TextEmbedder, ids: np.ndarray, index: IVFIndex):
+        self.embedder = embedder
+        self.ids = ids      # index row -> user_id bytes (S16)
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, text: str, k: int = 20, n_probe: int = DEFAULT_N_PROBE) -> List[Tuple[UUID, float]]:
+        """
+        Top `k` (user_id, cosine similarity) for the text, most similar first.
+        """
+        query = self.embedder.embed(text)
+        if not query.any() or not len(self.ids):
+            return []
+        rows, scores = self.index.search(query, k, n_probe)
+        return [(_to_uuid(self.ids[row]), float(score)) for row, score in zip(rows, scores)]
+
+    @classmethod
+    def load(cls, directory: str) -> "SemanticIndex":
+        return cls(
+            TextEmbedder.load(os.path.join(directory, EMBEDDER_FILE)),
+            np.load(os.path.join(directory, IDS_FILE)),
+            IVFIndex.load(os.path.join(directory, IVF_FILE), os.path.join(directory, VECTORS_FILE))
+        )
+
+
+def build_semantic_index(
+    db: Session,
+    directory: str,
+    n_lists: Optional[int] = None,
+    batch_size: int = EMBED_BATCH_SIZE
+) -> SemanticIndex:
+    """
+    Embeds every influencer bio and writes a loadable index to `directory`. Streams
+    the table twice (idf, then vectors); only one batch of bios is in memory at a time.
+    Run it in a REPEATABLE READ transaction so every pass sees the same rows.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    def bios():
+        query = select(Influencer.bio).order_by(Influencer.user_id).execution_options(yield_per=batch_size)
+        return (bio or "" for bio in db.execute(query).scalars())
+
+    ids = np.array(
+        [user_id.bytes for user_id in db.execute(select(Influencer.user_id).order_by(Influencer.user_id)).scalars()],
+        dtype="S16"
+    )
+    embedder = TextEmbedder().fit(bios(), batch_size)
+
+    # Row-ordered embeddings are only needed until the index has regrouped them
+    staging = os.path.join(directory, "embeddings.tmp.npy")
+    vectors = embed_to_memmap(embedder, bios(), len(ids), staging, batch_size)
+    index = IVFIndex.build(vectors, n_lists, path=os.path.join(directory, VECTORS_FILE))
+    del vectors
+    os.remove(staging)
+
+    embedder.save(os.path.join(directory, EMBEDDER_FILE))
+    np.save(os.path.join(directory, IDS_FILE), ids)
+    index.save(os.path.join(directory, IVF_FILE))
+    return SemanticIndex(embedder, ids, index)
+
+
+_semantic_index: Optional[SemanticIndex] = None
+_semantic_index_lock = threading.Lock()
+
+def get_semantic_index() -> Optional[SemanticIndex]:
+    """
+    The index in SEMANTIC_INDEX_DIR, loaded on first use (the vectors stay memory-mapped).
+    None when no directory is configured. A rebuild overwrites the files in place, so build
+    into a new directory, point SEMANTIC_INDEX_DIR at it and restart the workers.
+    """
+    global _semantic_index
+    if _semantic_index is None and settings.SEMANTIC_INDEX_DIR:
+        # Sync endpoints call this from threadpool workers: load exactly once
+        with _semantic_index_lock:
+            if _semantic_index is None:
+                _semantic_index = SemanticIndex.load(settings.SEMANTIC_INDEX_DIR)
+    return _semantic_index
+
+
+def main() -> None:
+    """
+    python -m app.services.discovery.semantic --out /srv/semantic/2026-10-18 [--n-lists 300]
+    """
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Embed influencer bios into a semantic search index")
+    parser.add_argument("--out", required=True, help="index directory (use a new one per build)")
+    parser.add_argument("--n-lists", type=int, default=None, help="IVF lists (default ~sqrt(n))")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        index = build_semantic_index(db, args.out, args.n_lists)
+    print(f"{len(index)} bios indexed -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
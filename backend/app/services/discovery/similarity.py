@@ -0,0 +1,194 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import threading
+import numpy as np
+from app.core.config import settings
+from app.services.discovery.catalog import WORD_BITS, CatalogSnapshot, InfluencerCatalog, influencer_catalog
+
+# MinHash / LSH shape: NUM_PERM = BANDS * ROWS_PER_BAND. With 8 bands of 4, a profile
+# becomes a candidate with probability 1 - (1 - J^4)^8: ~40% at J=0.5, ~87% at 0.7, ~98% at 0.8
+BANDS = 8
+ROWS_PER_BAND = 4
+NUM_PERM = BANDS * ROWS_PER_BAND
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def jaccard(
+    snapshot: CatalogSnapshot,
+    words: Dict[int, int],
+    query_size: int,
+    rows: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Jaccard similarity between the tag set given as bitset `words` (`query_size` tags,
+    including any outside the vocabulary) and every row (or `rows`).
+
+    |A & B| is popcounted only over the query's words, typically one or two bytes per
+    row; |A | B| follows as |A| + |B| - |A & B| from the per-row tag counts.
+    """
+    counts = snapshot.tag_counts if rows is None else snapshot.tag_counts[rows]
+    shared = np.zeros(len(counts), dtype=np.uint8)
+    for word, bits in words.items():
+        column = snapshot.tags[word] if rows is None else snapshot.tags[word, rows]
+        shared += np.bitwise_count(column & np.uint8(bits))
+    # query_size >= 1, so the union is never empty
+    union = counts + np.float32(query_size) - shared
+    return shared / union
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the `k` highest positive scores, best first; ties go to the lower index.
+    """
+    if len(scores) > k:
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        best = np.concatenate((above, ties))
+    else:
+        best = np.arange(len(scores))
+    best = best[scores[best] > 0]
+    return best[np.lexsort((best, -scores[best]))]
+
+
+class MinHashIndex:
+    """
+    MinHash signatures of every row's tag set, banded for LSH: rows sharing all
+    ROWS_PER_BAND values of any band with the query are its candidates.
+
+    Only the band keys (one uint32 per band and row) and their sort orders are kept,
+    ~64 bytes per row. Built from a snapshot's bitsets in one pass per tag.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+        self.band_mix = rng.integers(1, 1 << 32, size=ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+        self.snapshot = snapshot
+
+        n = len(snapshot.ids)
+        signatures = np.full((n, NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for bit in sorted(snapshot.vocabulary.values()):
+            rows = np.flatnonzero(snapshot.tags[bit // WORD_BITS] & np.uint8(1 << (bit % WORD_BITS)))
+            if len(rows):
+                signatures[rows] = np.minimum(signatures[rows], self._hashes(bit))
+
+        keys = self._band_keys(signatures)
+        # Rows without tags share the all-max signature; they are never similar to anything
+        indexed = np.flatnonzero((snapshot.tag_counts > 0) & snapshot.alive).astype(np.int32)
+        self.orders = []
+        self.sorted_keys = []
+        for band in range(BANDS):
+            band_keys = keys[indexed, band]
+            order = np.argsort(band_keys, kind="stable")
+            self.orders.append(indexed[order])
+            self.sorted_keys.append(band_keys[order])
+
+    def _hashes(self, bit: int) -> np.ndarray:
+        return ((self.a * np.uint64(bit) + self.b) % np.uint64(MERSENNE_PRIME)).astype(np.uint32)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        keys = np.empty((len(signatures), BANDS), dtype=np.uint32)
+        for band in range(BANDS):
+            values = signatures[:, band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].astype(np.uint64)
+            mixed = (values * self.band_mix).sum(axis=1, dtype=np.uint64)
+            keys[:, band] = (mixed >> np.uint64(32)) ^ (mixed & np.uint64(0xFFFFFFFF))
+        return keys
+
+    def candidates(self, bits: Iterable[int]) -> np.ndarray:
+        """
+        Rows sharing at least one band with the tag set made of vocabulary `bits`.
+        """
+        bits = list(bits)
+        if not bits:
+            return np.empty(0, dtype=np.int32)
+        signature = np.min([self._hashes(bit) for bit in bits], axis=0)
+        keys = self._band_keys(signature[None, :])[0]
+        found = []
+        for band in range(BANDS):
+            sorted_keys = self.sorted_keys[band]
+            lo = np.searchsorted(sorted_keys, keys[band], side="left")
+            hi = np.searchsorted(sorted_keys, keys[band], side="right")
+            found.append(self.orders[band][lo:hi])
+        return np.unique(np.concatenate(found))
+
+    def memory(self) -> int:
+        return sum(a.nbytes for a in self.orders) + sum(k.nbytes for k in self.sorted_keys)
+
+
+class SimilarityEngine:
+    """
+    "Find influencers like this": top-k Jaccard similarity of niche tag sets over the
+    in-memory catalog, either to a given influencer or to a tag set.
+
+    Exact by default: one vectorized popcount pass over the catalog per query word.
+    Catalogs of at least `lsh_min_rows` rows score only MinHash/LSH candidates instead
+    (approximate: a profile below ~0.5 similarity is likely to be missed). The index is
+    rebuilt lazily for each new catalog snapshot.
+    """
+
+    def __init__(self, catalog: InfluencerCatalog = influencer_catalog, lsh_min_rows: Optional[int] = None):
+        self.catalog = catalog
+        self.lsh_min_rows = lsh_min_rows
+        self._index: Optional[MinHashIndex] = None
+        self._index_lock = threading.Lock()
+
+    def _lsh_index(self, snapshot: CatalogSnapshot) -> Optional[MinHashIndex]:
+        if self.lsh_min_rows is None or len(snapshot.ids) < self.lsh_min_rows:
+            return None
+        with self._index_lock:
+            if self._index is None or self._index.snapshot is not snapshot:
+                self._index = MinHashIndex(snapshot)
+            return self._index
+
+    def _rank(
+        self,
+        snapshot: CatalogSnapshot,
+        words: Dict[int, int],
+        query_size: int,
+        k: int,
+        exclude_row: Optional[int] = None
+    ) -> List[Tuple[UUID, float]]:
+        if not words:
+            return []
+        index = self._lsh_index(snapshot)
+        if index is not None:
+            bits = [w * WORD_BITS + b for w, v in words.items() for b in range(WORD_BITS) if v >> b & 1]
+            rows = index.candidates(bits).astype(np.int64)
+        else:
+            rows = None
+        scores = jaccard(snapshot, words, query_size, rows)
+        if rows is None:
+            scores[~snapshot.alive] = 0
+            if exclude_row is not None:
+                scores[exclude_row] = 0
+        elif exclude_row is not None:
+            scores[rows == exclude_row] = 0
+        best = _top_k(scores, k)
+        top_rows = best if rows is None else rows[best]
+        return [(snapshot.user_id(row), float(score)) for row, score in zip(top_rows, scores[best])]
+
+    def similar_to_tags(self, tags: Iterable[str], k: int = 20) -> List[Tuple[UUID, float]]:
+        """
+        Top `k` (user_id, similarity) for the tag set; tags nobody has still count
+        towards the set's size.
+        """
+        snapshot = self.catalog.snapshot
+        words, unknown = snapshot.tag_words(tags)
+        query_size = sum(bin(bits).count("1") for bits in words.values()) + unknown
+        return self._rank(snapshot, words, query_size, k)
+
+    def similar_to_influencer(self, user_id: UUID, k: int = 20) -> Optional[List[Tuple[UUID, float]]]:
+        """
+        Top `k` (user_id, similarity) to the influencer's own niche, excluding them.
+        None if the influencer isn't in the catalog.
+        """
+        snapshot = self.catalog.snapshot
+        row = snapshot.row_of(user_id)
+        if row is None:
+            return None
+        return self._rank(snapshot, snapshot.row_words(row), int(snapshot.tag_counts[row]), k, exclude_row=row)
+
+
+similarity_engine = SimilarityEngine(lsh_min_rows=settings.SIMILARITY_LSH_MIN_ROWS)
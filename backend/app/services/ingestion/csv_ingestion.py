@@ -0,0 +1,164 @@
+from typing import BinaryIO, Callable, Dict, Iterator, List, Tuple
+import csv
+import io
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models.ingestion import SocialProfile
+from app.schemas.ingestion import (
+    CSVIngestionRow, IngestionReport, IngestionRowError, IngestionSource, NormalizedInfluencerData
+)
+
+BATCH_SIZE = 1000
+# Per-row errors kept in the report; beyond this we only count them
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_COLUMNS = set(CSVIngestionRow.model_fields)
+
+_batch_adapter = TypeAdapter(List[CSVIngestionRow])
+
+ProfileWriter = Callable[[List[NormalizedInfluencerData]], None]
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """
+    Streams (line_number, row) pairs from a binary CSV upload without reading it whole.
+    Raises ValueError if the header lacks a required column.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text, skipinitialspace=True)
+    header = {name.strip() for name in reader.fieldnames or []}
+    missing = REQUIRED_COLUMNS - header
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(sorted(missing))}")
+
+    try:
+        for row in reader:
+            yield reader.line_num, {
+                (key or "").strip(): (value.strip() if isinstance(value, str) else value)
+                for key, value in row.items()
+            }
+    finally:
+        # Don't let the wrapper close the caller's stream
+        text.detach()
+
+
+def normalize_row(row: CSVIngestionRow) -> NormalizedInfluencerData:
+    """
+    Maps a validated CSV row onto the unified ingestion schema.
+    """
+    handle = row.handle.lstrip("@")
+    return NormalizedInfluencerData(
+        username=handle,
+        platform=row.platform,
+        # CSV uploads carry no external id; the handle is unique per platform
+        platform_id=handle.lower(),
+        follower_count=row.followers,
+        profile_url=row.url,
+        tags=[tag for tag in row.niche_tags if tag],
+        raw_metrics_snapshot={"followers": row.followers},
+    )
+
+
+def _validate_batch(
+    batch: List[Tuple[int, Dict[str, str]]],
+    report: IngestionReport,
+    max_errors: int
+) -> List[NormalizedInfluencerData]:
+    raw_rows = [row for _, row in batch]
+    for row in raw_rows:
+        if isinstance(row.get("platform"), str):
+            row["platform"] = row["platform"].lower()
+
+    try:
+        validated = _batch_adapter.validate_python(raw_rows)
+        return [normalize_row(row) for row in validated]
+    except ValidationError as exc:
+        # Errors are located by list index, so one failed call pinpoints every bad row
+        failed: Dict[int, List[str]] = {}
+        for err in exc.errors():
+            index, *field = err["loc"]
+            failed.setdefault(index, []).append(f"{'.'.join(str(p) for p in field)}: {err['msg']}")
+
+    for index in sorted(failed):
+        report.rows_failed += 1
+        if len(report.errors) < max_errors:
+            report.errors.append(IngestionRowError(row=batch[index][0], errors=failed[index]))
+        else:
+            report.errors_truncated = True
+
+    good_rows = [row for index, row in enumerate(raw_rows) if index not in failed]
+    return [normalize_row(row) for row in _batch_adapter.validate_python(good_rows)]
+
+
+def ingest_csv(
+    stream: BinaryIO,
+    writer: ProfileWriter,
+    batch_size: int = BATCH_SIZE,
+    max_errors: int = MAX_REPORTED_ERRORS
+) -> IngestionReport:
+    """
+    Validates and normalizes a CSV upload batch by batch, handing each batch of good
+    rows to `writer`. Invalid rows are reported and skipped; they never abort the upload.
+    Only one batch is held in memory at a time.
+    """
+    report = IngestionReport()
+    batch: List[Tuple[int, Dict[str, str]]] = []
+
+    def flush():
+        profiles = _validate_batch(batch, report, max_errors)
+        if profiles:
+            writer(profiles)
+            report.rows_ingested += len(profiles)
+        batch.clear()
+
+    for line, row in iter_csv_rows(stream):
+        report.rows_total += 1
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return report
+
+
+def upsert_profiles(db: Session, profiles: List[NormalizedInfluencerData]) -> None:
+    """
+    Upserts a batch with INSERT ... ON CONFLICT (platform, platform_id) DO UPDATE.
+    """
+    # Postgres rejects a statement that touches the same conflict key twice; last row wins
+    rows = {}
+    for p in profiles:
+        rows[(p.platform.value, p.platform_id)] = {
+            "platform": p.platform.value,
+            "platform_id": p.platform_id,
+            "username": p.username,
+            "display_name": p.display_name,
+            "follower_count": p.follower_count,
+            "engagement_rate": p.engagement_rate,
+            "profile_url": str(p.profile_url),
+            "tags": p.tags,
+            "raw_metrics_snapshot": p.raw_metrics_snapshot,
+            "source": IngestionSource.MANUAL_CSV.value,
+        }
+
+    db.execute(_upsert_statement(), list(rows.values()))
+    db.commit()
+
+
+def _upsert_statement():
+    # Parameter-less statement + executemany: compiled once (statement cache) and sent as
+    # batched multi-row VALUES by SQLAlchemy's insertmanyvalues instead of one round trip per
+    # row. RETURNING keeps that batching on every driver (asyncpg only batches INSERTs with
+    # RETURNING); the ids are discarded
+    stmt = insert(SocialProfile.__table__)
+    updatable = [
+        "username", "display_name", "follower_count", "engagement_rate",
+        "profile_url", "tags", "raw_metrics_snapshot", "source"
+    ]
+    return stmt.on_conflict_do_update(
+        index_elements=["platform", "platform_id"],
+        set_={**{name: stmt.excluded[name] for name in updatable}, "updated_at": func.now()},
+    ).returning(SocialProfile.__table__.c.id)
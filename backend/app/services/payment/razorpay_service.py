@@ -1,32 +1,66 @@
-import razorpay
+import httpx
 from app.core.config import settings
 from fastapi import HTTPException
+from typing import Any, List, NamedTuple, Optional, Union
+import asyncio
 import hmac
 import hashlib
+import threading
+
+class OrderRequest(NamedTuple):
+    amount: float
+    currency: str = "INR"
+    notes: Optional[dict] = None
 
 class PaymentService:
-    def __init__(self):
-        if settings.RAZORPAY_KEY_ID:
-            self.client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-        else:
-            self.client = None
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        # Without keys every order is mocked (local dev)
+        self.configured = bool(settings.RAZORPAY_KEY_ID)
+        # Sync SDK client, built by `client` on first use
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        # Async path: one pooled keep-alive client for the whole process, created on first use
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        # Queue excess requests here, so waiting for a slot doesn't eat into the pool timeout
+        self._gateway_slots = asyncio.Semaphore(settings.RAZORPAY_MAX_CONCURRENCY)
+
+    @staticmethod
+    def _order_payload(amount: float, currency: str, notes: Optional[dict]) -> dict:
+        return {
+            "amount": int(round(amount * 100)),
+            "currency": currency,
+            "notes": dict(notes or {}), # Can store campaign_id here for easy mapping
+            "payment_capture": 1
+        }
 
-    def create_order(self, amount: float, currency: str = "INR", notes: dict = {}) -> dict:
+    @property
+    def client(self):
+        """
+        razorpay.Client for the blocking path. The SDK (and `requests` under it) is only
+        imported here, so processes that never call `create_order` don't load it.
+        """
+        if self._client is None and self.configured:
+            with self._client_lock:
+                if self._client is None:
+                    import razorpay
+                    self._client = razorpay.Client(
+                        auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                        base_url=settings.RAZORPAY_API_URL
+                    )
+        return self._client
+
+    def create_order(self, amount: float, currency: str = "INR", notes: Optional[dict] = None) -> dict:
         """
         Creates a Razorpay Order. Amount is in main currency unit (e.g. 500 INR),
         Razorpay expects paise (50000).
+        Blocks for the gateway round trip; async callers should use `create_order_async`.
         """
-        if not self.client:
+        if not self.configured:
             return {"id": "order_mock_123", "amount": amount * 100, "currency": currency}
 
-        amount_paise = int(amount * 100)
-        
-        data = {
-            "amount": amount_paise,
-            "currency": currency,
-            "notes": notes, # Can store campaign_id here for easy mapping
-            "payment_capture": 1 
-        }
+        data = self._order_payload(amount, currency, notes)
         
         try:
             order = self.client.order.create(data=data)
@@ -34,21 +68,124 @@ class PaymentService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Payment Gateway Error: {str(e)}")
 
-    def verify_webhook_signature(self, body: bytes, signature: str) -> bool:
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=settings.RAZORPAY_API_URL,
+                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                limits=httpx.Limits(
+                    max_connections=settings.RAZORPAY_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.RAZORPAY_KEEPALIVE_CONNECTIONS
+                ),
+                timeout=httpx.Timeout(settings.RAZORPAY_TIMEOUT, connect=settings.RAZORPAY_CONNECT_TIMEOUT),
+                transport=self._transport
+            )
+        return self._http
+
+    async def create_order_async(self, amount: float, currency: str = "INR", notes: Optional[dict] = None) -> dict:
         """
-        Verifies that the webhook came solely from Razorpay using the Secret.
+        Non-blocking `create_order` over the pooled client. At most
+        RAZORPAY_MAX_CONCURRENCY requests are in flight toward the gateway at once.
         """
-        if not settings.RAZORPAY_KEY_SECRET:
-            return True # Dev mode fallback
+        if not self.configured:
+            return {"id": "order_mock_123", "amount": amount * 100, "currency": currency}
+
+        data = self._order_payload(amount, currency, notes)
 
         try:
-            self.client.utility.verify_webhook_signature(
-                body.decode('utf-8'),
-                signature,
-                settings.RAZORPAY_KEY_SECRET
-            )
-            return True
-        except razorpay.errors.SignatureVerificationError:
+            async with self._gateway_slots:
+                response = await self.http.post("/v1/orders", json=data)
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise HTTPException(status_code=500, detail=f"Payment Gateway Error: {str(e)}")
+
+    async def create_orders(self, orders: List[OrderRequest]) -> List[Union[dict, HTTPException]]:
+        """
+        Creates many orders concurrently (e.g. funding several campaigns at once), in input order.
+        A failed order comes back as its HTTPException instead of raising, so one gateway
+        error doesn't lose the orders that were created.
+        """
+        return await asyncio.gather(
+            *(self.create_order_async(o.amount, o.currency, o.notes) for o in orders),
+            return_exceptions=True
+        )
+
+    async def list_payments_async(self, from_ts: int, to_ts: int, count: int = 100, skip: int = 0) -> List[dict]:
+        """
+        One page of payments created in [from_ts, to_ts] (unix seconds). Razorpay caps `count` at 100.
+        """
+        try:
+            async with self._gateway_slots:
+                response = await self.http.get(
+                    "/v1/payments", params={"from": from_ts, "to": to_ts, "count": count, "skip": skip}
+                )
+            response.raise_for_status()
+            return response.json()["items"]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            raise HTTPException(status_code=500, detail=f"Payment Gateway Error: {str(e)}")
+
+    async def fetch_payment_async(self, payment_id: str) -> Optional[dict]:
+        """
+        One payment by id, or None if the gateway doesn't know it.
+        """
+        try:
+            async with self._gateway_slots:
+                response = await self.http.get(f"/v1/payments/{payment_id}")
+            if response.status_code in (400, 404):
+                # Razorpay answers an unknown id with 400 BAD_REQUEST_ERROR
+                return None
+            response.raise_for_status()
+            return response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise HTTPException(status_code=500, detail=f"Payment Gateway Error: {str(e)}")
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    @staticmethod
+    def webhook_secret() -> Optional[str]:
+        return settings.RAZORPAY_WEBHOOK_SECRET or settings.RAZORPAY_KEY_SECRET
+
+    def verify_webhook_signature(self, body: bytes, signature: str) -> bool:
+        """
+        Verifies that the webhook came solely from Razorpay using the Secret.
+        Fails closed without a secret, unless RAZORPAY_WEBHOOK_ALLOW_UNSIGNED is set (local dev).
+        """
+        secret = self.webhook_secret()
+        if not secret:
+            return settings.RAZORPAY_WEBHOOK_ALLOW_UNSIGNED
+        if not signature:
             return False
 
-payment_service = PaymentService()
+        # Same HMAC-SHA256 check as razorpay.Utility, without needing an API client
+        expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+# Built by `get_payment_service` on first use, not at import
+_payment_service: Optional[PaymentService] = None
+_payment_service_lock = threading.Lock()
+
+def get_payment_service() -> PaymentService:
+    """
+    The process-wide PaymentService, built on first call, so workers that never
+    touch payments never construct it. Async endpoints call it directly: as a sync
+    `Depends` it would cost a threadpool hop per request.
+    """
+    global _payment_service
+    if _payment_service is None:
+        # Sync endpoints call this from threadpool workers: build exactly one
+        with _payment_service_lock:
+            if _payment_service is None:
+                _payment_service = PaymentService()
+    return _payment_service
+
+async def close_payment_service() -> None:
+    """
+    Closes the pooled gateway client, if the service was ever created.
+    """
+    if _payment_service is not None:
+        await _payment_service.aclose()
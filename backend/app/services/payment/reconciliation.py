@@ -0,0 +1,345 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import tempfile
+import zlib
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.campaign import Transaction
+from app.schemas.transaction import MismatchKind, ReconciliationReport, TransactionStatus
+from app.services.blockchain.anchoring import verify_transaction
+from app.services.blockchain.receipts import ReceiptTracker
+from app.services.payment.razorpay_service import PaymentService, close_payment_service, get_payment_service
+
+GATEWAY_PAGE_SIZE = 100  # Razorpay's maximum `count`
+SLICE = timedelta(hours=6)  # window slice paged by one coroutine
+PARTITIONS = 64
+DB_FETCH_SIZE = 5000
+RECHECK_CHUNK = 100  # payments fetched by id per gather
+
+# Gateway payment status -> transaction statuses consistent with it
+EXPECTED_STATUSES = {
+    "created": {TransactionStatus.PENDING},
+    "authorized": {TransactionStatus.PENDING},
+    "captured": {TransactionStatus.PAID, TransactionStatus.VERIFIED_ON_CHAIN},
+    "failed": {TransactionStatus.PENDING, TransactionStatus.FAILED},
+    "refunded": {TransactionStatus.FAILED},
+}
+
+
+def _partition(key: str, partitions: int) -> int:
+    # Stable across processes, unlike hash()
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+class PartitionSpill:
+    """
+    Appends JSON records to one temp file per hash partition of their key.
+    """
+
+    def __init__(self, directory: str, name: str, partitions: int = PARTITIONS):
+        self.partitions = partitions
+        self.count = 0
+        self._paths = [os.path.join(directory, f"{name}-{p}.jsonl") for p in range(partitions)]
+        self._files = [open(path, "w", encoding="utf-8") for path in self._paths]
+
+    def write(self, key: str, record: Dict[str, Any]) -> None:
+        self._files[_partition(key, self.partitions)].write(json.dumps(record, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+
+    def read(self, partition: int) -> Iterator[Dict[str, Any]]:
+        with open(self._paths[partition], encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def _slices(start: datetime, end: datetime, size: timedelta = SLICE) -> Iterator[tuple]:
+    cursor = start
+    while cursor < end:
+        upper = min(cursor + size, end)
+        yield int(cursor.timestamp()), int(upper.timestamp()) - 1
+        cursor = upper
+
+
+async def spill_gateway_payments(
+    service: PaymentService,
+    start: datetime,
+    end: datetime,
+    spill: PartitionSpill,
+    slice_size: timedelta = SLICE
+) -> None:
+    """
+    Pages every payment created in [start, end) into `spill`, keyed by payment id.
+    Slices are paged concurrently; PaymentService bounds the requests in flight.
+    """
+    async def page_slice(from_ts: int, to_ts: int) -> None:
+        skip = 0
+        while True:
+            items = await service.list_payments_async(from_ts, to_ts, count=GATEWAY_PAGE_SIZE, skip=skip)
+            for payment in items:
+                spill.write(payment["id"], {
+                    "id": payment["id"],
+                    "amount": payment["amount"],
+                    "status": payment["status"],
+                    "order_id": payment.get("order_id"),
+                })
+            if len(items) < GATEWAY_PAGE_SIZE:
+                return
+            skip += GATEWAY_PAGE_SIZE
+
+    await asyncio.gather(*(page_slice(lo, hi) for lo, hi in _slices(start, end, slice_size)))
+
+
+def spill_transactions(db: Session, start: datetime, end: datetime, spill: PartitionSpill) -> None:
+    """
+    Streams transactions created in [start, end) that reference a payment into `spill`.
+    Merkle proofs are checked here, while the row is at hand.
+    """
+    query = (
+        select(Transaction)
+        .where(
+            Transaction.razorpay_payment_id.isnot(None),
+            Transaction.created_at >= start,
+            Transaction.created_at < end
+        )
+        .execution_options(yield_per=DB_FETCH_SIZE)
+    )
+    for tx in db.scalars(query):
+        spill.write(tx.razorpay_payment_id, {
+            "id": str(tx.id),
+            "payment_id": tx.razorpay_payment_id,
+            "amount_paise": int((Decimal(tx.amount) * 100).to_integral_value()),
+            "status": tx.status.value if tx.status else None,
+            "tx_hash": tx.blockchain_tx_hash,
+            "proof_ok": verify_transaction(tx) if tx.merkle_root else None,
+        })
+
+
+def known_payment_ids(db: Session, payment_ids: List[str]) -> Set[str]:
+    """
+    Which of these payments do have a transaction row (created outside the window)?
+    """
+    found: Set[str] = set()
+    for i in range(0, len(payment_ids), DB_FETCH_SIZE):
+        chunk = payment_ids[i:i + DB_FETCH_SIZE]
+        found.update(db.scalars(
+            select(Transaction.razorpay_payment_id).where(Transaction.razorpay_payment_id.in_(chunk))
+        ))
+    return found
+
+
+def _compare(payment: Dict[str, Any], row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    if payment["amount"] != row["amount_paise"]:
+        yield {"kind": MismatchKind.AMOUNT_MISMATCH, "gateway_amount": payment["amount"], "db_amount": row["amount_paise"]}
+
+    expected = EXPECTED_STATUSES.get(payment["status"])
+    if expected is not None and TransactionStatus(row["status"] or "pending") not in expected:
+        yield {"kind": MismatchKind.STATUS_MISMATCH, "gateway_status": payment["status"], "db_status": row["status"]}
+
+    if row["status"] == TransactionStatus.PAID.value and not row["tx_hash"]:
+        yield {"kind": MismatchKind.NOT_ANCHORED}
+    if row["proof_ok"] is False:
+        yield {"kind": MismatchKind.BAD_MERKLE_PROOF, "tx_hash": row["tx_hash"]}
+
+
+def join_partitions(
+    gateway: PartitionSpill,
+    transactions: PartitionSpill,
+    emit: Callable[[Dict[str, Any]], None],
+    lookup_payment_ids: Callable[[List[str]], Set[str]],
+    tx_hashes: Optional[Set[str]] = None,
+    on_gateway_miss: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> int:
+    """
+    Hash-joins each partition pair on payment id, calling `emit` for every mismatch.
+    Returns the number of matched pairs. Distinct tx hashes seen go into `tx_hashes`.
+    With `on_gateway_miss`, rows whose payment isn't in the gateway listing are handed
+    to it (for `recheck_gateway_misses`) instead of being reported MISSING_AT_GATEWAY.
+    """
+    matched = 0
+    for partition in range(gateway.partitions):
+        payments = {p["id"]: p for p in gateway.read(partition)}
+
+        for row in transactions.read(partition):
+            if tx_hashes is not None and row["tx_hash"]:
+                tx_hashes.add(row["tx_hash"])
+
+            payment = payments.pop(row["payment_id"], None)
+            if payment is None and on_gateway_miss is not None:
+                on_gateway_miss(row)
+                continue
+            if payment is None:
+                emit({"kind": MismatchKind.MISSING_AT_GATEWAY, "payment_id": row["payment_id"], "transaction_id": row["id"]})
+                continue
+
+            matched += 1
+            for mismatch in _compare(payment, row):
+                emit({**mismatch, "payment_id": row["payment_id"], "transaction_id": row["id"]})
+
+        # Left over: no row in the window. Captured ones must have a row somewhere.
+        unmatched = [pid for pid, p in payments.items() if p["status"] in ("captured", "refunded")]
+        if unmatched:
+            known = lookup_payment_ids(unmatched)
+            for pid in unmatched:
+                if pid not in known:
+                    emit({"kind": MismatchKind.MISSING_IN_DB, "payment_id": pid, "amount": payments[pid]["amount"]})
+    return matched
+
+
+async def recheck_gateway_misses(
+    service: PaymentService,
+    rows: Iterable[Dict[str, Any]],
+    emit: Callable[[Dict[str, Any]], None],
+    chunk_size: int = RECHECK_CHUNK
+) -> int:
+    """
+    Fetches each payment the window's listing didn't have by id. Rows are selected by
+    their own `created_at`, payments by the gateway's, so a payment created just
+    across a window edge (or under clock skew) is only missing from the listing.
+    Found payments are compared as in the join; returns how many were found.
+
+    Rows are read `chunk_size` at a time. A lookup that errors (429, 5xx, timeout) is
+    reported GATEWAY_LOOKUP_FAILED for its row and doesn't stop the run.
+    """
+    found = 0
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        payments = await asyncio.gather(
+            *(service.fetch_payment_async(row["payment_id"]) for row in chunk), return_exceptions=True
+        )
+        for row, payment in zip(chunk, payments):
+            keys = {"payment_id": row["payment_id"], "transaction_id": row["id"]}
+            if isinstance(payment, Exception):
+                emit({"kind": MismatchKind.GATEWAY_LOOKUP_FAILED, **keys, "error": str(payment)})
+                continue
+            if payment is None:
+                emit({"kind": MismatchKind.MISSING_AT_GATEWAY, **keys})
+                continue
+            found += 1
+            for mismatch in _compare(payment, row):
+                emit({**mismatch, **keys})
+    return found
+
+
+def check_chain(w3, tx_hashes: Iterable[str], emit: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Looks up receipts for the (deduplicated) tx hashes in batched JSON-RPC calls.
+    """
+    hashes = list(tx_hashes)
+    if not hashes:
+        return
+    tracker = ReceiptTracker(w3, confirmations=1, max_receipts=len(hashes))
+    for tx_hash in hashes:
+        tracker.track(tx_hash)
+    _, reverted = tracker.poll_once()
+
+    for tx_hash in reverted:
+        emit({"kind": MismatchKind.REVERTED_ON_CHAIN, "tx_hash": tx_hash})
+    for tx_hash in tracker.pending_hashes():
+        emit({"kind": MismatchKind.NOT_ON_CHAIN, "tx_hash": tx_hash})
+
+
+async def reconcile(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    out_path: str,
+    service: Optional[PaymentService] = None,
+    w3=None,
+    partitions: int = PARTITIONS
+) -> ReconciliationReport:
+    """
+    Runs a full reconciliation of [start, end) and writes every mismatch to `out_path`
+    (JSON lines). Pass `w3` to also check that anchored hashes are on-chain.
+
+    Gateway payments are paged concurrently and both sides are spilled into hash
+    partitions on disk, then joined partition by partition on `razorpay_payment_id`.
+    Memory holds one partition at a time, however long the window.
+    """
+    service = service or get_payment_service()
+    report = ReconciliationReport(window_start=start, window_end=end, report_path=out_path)
+    tx_hashes: Optional[Set[str]] = set() if w3 is not None else None
+
+    with tempfile.TemporaryDirectory(prefix="reconcile-") as spill_dir, \
+            open(out_path, "w", encoding="utf-8") as out:
+        def emit(mismatch: Dict[str, Any]) -> None:
+            kind = mismatch["kind"]
+            report.mismatches[kind] = report.mismatches.get(kind, 0) + 1
+            out.write(json.dumps(mismatch, default=str) + "\n")
+
+        gateway = PartitionSpill(spill_dir, "gateway", partitions)
+        transactions = PartitionSpill(spill_dir, "db", partitions)
+        misses = PartitionSpill(spill_dir, "misses", partitions)
+        try:
+            # DB streaming runs in a thread while the gateway pages on the loop
+            await asyncio.gather(
+                spill_gateway_payments(service, start, end, gateway),
+                asyncio.to_thread(spill_transactions, db, start, end, transactions),
+            )
+        finally:
+            gateway.close()
+            transactions.close()
+
+        report.gateway_payments = gateway.count
+        report.db_transactions = transactions.count
+        try:
+            report.matched = join_partitions(
+                gateway, transactions, emit, lambda ids: known_payment_ids(db, ids), tx_hashes,
+                lambda row: misses.write(row["payment_id"], row)
+            )
+        finally:
+            misses.close()
+        # Rows missing from the listing are spilled too, and re-checked one partition at a time
+        for partition in range(partitions):
+            report.matched += await recheck_gateway_misses(service, misses.read(partition), emit)
+        if w3 is not None:
+            check_chain(w3, tx_hashes, emit)
+
+    return report
+
+
+def _parse_time(value: str) -> datetime:
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def main() -> None:
+    """
+    python -m app.services.payment.reconciliation --from 2026-09-01 --to 2026-10-01 \
+        --out reconciliation.jsonl [--check-chain]
+    """
+    from app.core.database import SessionLocal
+    from app.services.blockchain.service import get_blockchain_service
+
+    parser = argparse.ArgumentParser(description="Reconcile transactions against Razorpay and the chain")
+    parser.add_argument("--from", dest="start", required=True, type=_parse_time, help="window start (ISO date/time, UTC)")
+    parser.add_argument("--to", dest="end", required=True, type=_parse_time, help="window end, exclusive")
+    parser.add_argument("--out", default="reconciliation.jsonl", help="mismatch report (JSON lines)")
+    parser.add_argument("--check-chain", action="store_true", help="also look up receipts of anchored hashes")
+    args = parser.parse_args()
+
+    async def run() -> ReconciliationReport:
+        try:
+            return await reconcile(
+                db, args.start, args.end, args.out,
+                w3=get_blockchain_service().w3 if args.check_chain else None
+            )
+        finally:
+            await close_payment_service()
+
+    with SessionLocal() as db:
+        report = asyncio.run(run())
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
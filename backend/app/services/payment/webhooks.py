@@ -0,0 +1,202 @@
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from uuid import UUID
+import asyncio
+import hashlib
+import logging
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.campaign import Campaign, Transaction
+from app.schemas.campaign import CampaignStatus
+from app.schemas.transaction import TransactionStatus
+from app.services.blockchain.anchoring import queue_paid_transactions
+
+logger = logging.getLogger(__name__)
+
+# Razorpay event -> transaction status it moves a payment to
+HANDLED_EVENTS = {
+    "payment.captured": TransactionStatus.PAID,
+    "payment.failed": TransactionStatus.FAILED,
+}
+
+
+class PaymentEvent(NamedTuple):
+    event_id: str
+    event: str
+    payment_id: str
+    order_id: Optional[str]
+    # From the order notes set in create_order
+    transaction_id: Optional[UUID]
+    campaign_id: Optional[UUID]
+
+
+def _uuid_or_none(value: Any) -> Optional[UUID]:
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def parse_webhook(payload: Dict[str, Any], event_id: Optional[str], body: bytes) -> PaymentEvent:
+    """
+    Extracts what we act on from a Razorpay payment webhook. Raises ValueError if malformed.
+    Without an `X-Razorpay-Event-Id` header the body digest stands in as the event id,
+    which still catches verbatim retries.
+    """
+    try:
+        entity = payload["payload"]["payment"]["entity"]
+        notes = entity.get("notes") or {}
+        return PaymentEvent(
+            event_id=event_id or hashlib.sha256(body).hexdigest(),
+            event=payload["event"],
+            payment_id=entity["id"],
+            order_id=entity.get("order_id"),
+            transaction_id=_uuid_or_none(notes.get("transaction_id")),
+            campaign_id=_uuid_or_none(notes.get("campaign_id")),
+        )
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Malformed payment webhook: {e}")
+
+
+async def apply_payment_events(db: AsyncSession, events: List[PaymentEvent]) -> List[UUID]:
+    """
+    Applies a batch of payment events in one DB transaction: one executemany UPDATE per
+    target status plus one UPDATE activating the funded campaigns.
+    A capture beats a failure for the same transaction (the brand retried the payment).
+    Returns the ids of the captured transactions, for anchoring.
+    """
+    latest: Dict[UUID, PaymentEvent] = {}
+    for event in events:
+        if event.transaction_id is None:
+            logger.warning("Payment %s has no transaction_id in its notes, skipped", event.payment_id)
+            continue
+        current = latest.get(event.transaction_id)
+        if current is None or HANDLED_EVENTS[current.event] != TransactionStatus.PAID:
+            latest[event.transaction_id] = event
+
+    by_status: Dict[TransactionStatus, List[Dict[str, Any]]] = {}
+    for transaction_id, event in latest.items():
+        by_status.setdefault(HANDLED_EVENTS[event.event], []).append(
+            {"id": transaction_id, "razorpay_payment_id": event.payment_id}
+        )
+
+    for status, rows in by_status.items():
+        # Never move a transaction backwards (e.g. a late payment.failed after the capture)
+        allowed = [TransactionStatus.PENDING]
+        if status == TransactionStatus.PAID:
+            allowed.append(TransactionStatus.FAILED)
+        await db.execute(
+            update(Transaction).where(Transaction.status.in_(allowed)).values(status=status),
+            rows,
+            execution_options={"synchronize_session": None}
+        )
+
+    funded = {
+        event.campaign_id for event in latest.values()
+        if event.campaign_id and HANDLED_EVENTS[event.event] == TransactionStatus.PAID
+    }
+    if funded:
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id.in_(funded), Campaign.status == CampaignStatus.DRAFT)
+            .values(status=CampaignStatus.ACTIVE)
+        )
+    await db.commit()
+    return [row["id"] for row in by_status.get(TransactionStatus.PAID, [])]
+
+
+async def _apply_in_new_session(events: List[PaymentEvent]) -> None:
+    async with AsyncSessionLocal() as db:
+        paid = await apply_payment_events(db, events)
+        # Anchored in shared Merkle batches (AnchorBatcher) rather than one transaction each
+        await queue_paid_transactions(db, paid)
+
+
+class WebhookProcessor:
+    """
+    Decouples acknowledging a webhook from applying it. `accept` drops duplicates with
+    an O(1) idempotency lookup and enqueues the rest; `workers` tasks drain the queue
+    and hand events to `apply_batch` up to `batch_size` at a time.
+    Workers start with the first event.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[PaymentEvent]], Awaitable[None]] = _apply_in_new_session,
+        workers: int = settings.WEBHOOK_WORKERS,
+        batch_size: int = settings.WEBHOOK_BATCH_SIZE,
+        queue_size: int = settings.WEBHOOK_QUEUE_SIZE
+    ):
+        self.apply_batch = apply_batch
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.seen = LRUCache(max_entries=settings.WEBHOOK_IDEMPOTENCY_MAX_ENTRIES, ttl=settings.WEBHOOK_IDEMPOTENCY_TTL)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list = []
+
+    def accept(self, event: PaymentEvent) -> bool:
+        """
+        Returns False for a duplicate. Raises asyncio.QueueFull when saturated, in which
+        case the event is forgotten again so Razorpay's retry gets through.
+        """
+        if not self.seen.add(event.event_id):
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.seen.invalidate(event.event_id)
+            raise
+        return True
+
+    async def join(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """
+        Drains what was already acknowledged, then stops the workers.
+        """
+        await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def _ensure_started(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await self.apply_batch(batch)
+            except Exception as e:
+                # Already acknowledged, so Razorpay won't retry on its own. Forgetting the
+                # ids lets a manual resend from the dashboard through.
+                logger.error(
+                    "Applying %d payment events failed (%s): %s",
+                    len(batch), ", ".join(event.event_id for event in batch), e
+                )
+                for event in batch:
+                    self.seen.invalidate(event.event_id)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+
+webhook_processor = WebhookProcessor()
@@ -0,0 +1,74 @@
+"""
+AIEngine.detect_brand_mentions: one regex per brand (original) vs the cached
+Aho-Corasick BrandMatcher, for growing brand lists.
+
+Run from backend/:  python -m benchmarks.bench_brand_mentions
+"""
+import random
+import re
+import time
+from typing import List
+
+from app.services.ai.brands import BrandMatcher, get_brand_matcher
+
+N_CAPTIONS = 2000
+CAPTION_WORDS = 30
+
+
+def legacy_detect(text: str, brand_names: List[str]) -> List[str]:
+    # The pre-BrandMatcher implementation, kept here as the baseline
+    text_lower = text.lower()
+    return [b for b in brand_names if re.search(r'\b' + re.escape(b.lower()) + r'\b', text_lower)]
+
+
+def make_brands(n: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    syllables = ["ka", "zo", "mi", "ra", "tek", "lux", "vo", "na", "pro", "fit"]
+    brands = set()
+    while len(brands) < n:
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        brands.add(name.capitalize() if rng.random() < 0.8 else f"{name.capitalize()} Co")
+    return sorted(brands)
+
+
+def make_captions(brands: List[str], n: int, seed: int = 11) -> List[str]:
+    rng = random.Random(seed)
+    filler = ["loving", "my", "new", "look", "from", "today", "with", "#ad", "so", "good"]
+    return [
+        " ".join(rng.choice(brands) if rng.random() < 0.05 else rng.choice(filler) for _ in range(CAPTION_WORDS))
+        for _ in range(n)
+    ]
+
+
+def captions_per_sec(fn, captions: List[str], budget_s: float = 2.0) -> float:
+    start = time.perf_counter()
+    done = 0
+    for caption in captions:
+        fn(caption)
+        done += 1
+        if time.perf_counter() - start > budget_s:
+            break
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'brands':>7} {'build ms':>9} {'legacy/s':>10} {'automaton/s':>12} {'speedup':>8}")
+    for n_brands in (100, 2000, 20000):
+        brands = make_brands(n_brands)
+        captions = make_captions(brands, N_CAPTIONS)
+
+        start = time.perf_counter()
+        BrandMatcher(brands)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for caption in captions[:10]:
+            assert get_brand_matcher(brands).find(caption) == legacy_detect(caption, brands)
+
+        legacy = captions_per_sec(lambda c: legacy_detect(c, brands), captions)
+        # Includes the per-call fingerprint + cache lookup, as callers would see it
+        automaton = captions_per_sec(lambda c: get_brand_matcher(brands).find(c), captions)
+        print(f"{n_brands:>7} {build_ms:>9.1f} {legacy:>10,.0f} {automaton:>12,.0f} {automaton / legacy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
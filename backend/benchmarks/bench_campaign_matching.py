@@ -0,0 +1,90 @@
+"""
+Nightly campaign matching at scale: N_CAMPAIGNS campaigns ranked against an in-memory
+catalog of n_rows influencers (top K each) with the chunked heap top-k, against scoring
+the same candidates and fully sorting them. Also times a cache hit. Rows and campaigns are
+synthetic, so no database is needed.
+
+Run from backend/:  python -m benchmarks.bench_campaign_matching [n_rows] [n_campaigns]
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot
+from app.services.discovery.matching import COST_PER_FOLLOWER, CampaignProfile, MatchingEngine
+from benchmarks.bench_influencer_catalog import N_TAGS, synthetic_rows
+
+K = 20
+FULL_SORT_SAMPLE = 50  # campaigns timed with the full-sort baseline
+
+
+class StaticCatalog:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.loaded = True
+
+
+def synthetic_campaigns(n: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, N_TAGS + 1)
+    weights /= weights.sum()
+    return [
+        CampaignProfile(
+            [f"tag{t}" for t in set(rng.choice(N_TAGS, size=rng.integers(1, 4), p=weights))],
+            float(rng.lognormal(10, 1.5)),
+            f"campaign-{i}"
+        )
+        for i in range(n)
+    ]
+
+
+def full_sort(engine: MatchingEngine, profile: CampaignProfile):
+    snapshot = engine.catalog.snapshot
+    features = engine._row_features(snapshot)
+    words, _ = snapshot.tag_words(profile.tags)
+    rows, _, _, score = engine._score_chunk(
+        snapshot, features, words, len(profile.tags),
+        np.log10(max(profile.budget / COST_PER_FOLLOWER, 1.0)), 0, len(snapshot.ids)
+    )
+    return rows[np.argsort(-score, kind="stable")[:K]]
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_campaigns = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    rows = synthetic_rows(n_rows)
+    vocabulary = {}
+    engine = MatchingEngine(StaticCatalog(CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)))
+    del rows
+    campaigns = synthetic_campaigns(n_campaigns)
+    engine.rank(campaigns[0], K)  # per-snapshot features
+
+    samples = []
+    started = time.perf_counter()
+    for profile in campaigns:
+        start = time.perf_counter()
+        engine.match(profile, K)
+        samples.append((time.perf_counter() - start) * 1000)
+    total = time.perf_counter() - started
+    samples.sort()
+    print(f"{n_campaigns} campaigns x {n_rows} influencers (top {K}): {total:.1f} s total, "
+          f"{statistics.median(samples):.2f} ms median, {samples[int(len(samples) * 0.99) - 1]:.2f} ms p99 per campaign")
+
+    sorted_samples = []
+    for profile in campaigns[:FULL_SORT_SAMPLE]:
+        start = time.perf_counter()
+        full_sort(engine, profile)
+        sorted_samples.append((time.perf_counter() - start) * 1000)
+    print(f"score all + full sort: {statistics.median(sorted_samples):.2f} ms median per campaign "
+          f"(~{statistics.mean(sorted_samples) * n_campaigns / 1000:.0f} s for all)")
+
+    start = time.perf_counter()
+    for profile in campaigns:
+        engine.match(profile, K)
+    print(f"cached re-run: {(time.perf_counter() - start) * 1000:.0f} ms, hit rate {engine.cache.stats()['hit_rate']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput of AIEngine.categorize_bio: the original per-keyword regex loop vs
+the compiled single-pass TaxonomyMatcher, at 5 / 50 / 500 categories.
+
+Run from backend/:  python -m benchmarks.bench_categorize
+"""
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List
+
+from app.services.ai.taxonomy import TaxonomyMatcher
+
+KEYWORDS_PER_CATEGORY = 7
+BIO_WORDS = 40
+N_BIOS = 2000
+
+
+def legacy_categorize(bio_text: str, taxonomy: Dict[str, List[str]]) -> List[str]:
+    # The pre-TaxonomyMatcher implementation, kept here as the baseline
+    bio_lower = bio_text.lower()
+    scores = Counter()
+    for category, keywords in taxonomy.items():
+        for word in keywords:
+            if re.search(r'\b' + re.escape(word) + r'\b', bio_lower):
+                scores[category] += 1
+    return [cat for cat, score in scores.most_common() if score > 0]
+
+
+def make_taxonomy(n_categories: int) -> Dict[str, List[str]]:
+    return {
+        f"Category{c}": [f"kw{c}x{k}" for k in range(KEYWORDS_PER_CATEGORY)]
+        for c in range(n_categories)
+    }
+
+
+def make_bios(taxonomy: Dict[str, List[str]], n: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    keywords = [w for words in taxonomy.values() for w in words]
+    filler = ["daily", "life", "love", "sharing", "my", "journey", "and", "the", "with", "content"]
+    bios = []
+    for _ in range(n):
+        words = [rng.choice(keywords) if rng.random() < 0.15 else rng.choice(filler) for _ in range(BIO_WORDS)]
+        bios.append(" ".join(words).capitalize() + ".")
+    return bios
+
+
+def bios_per_sec(fn, bios: List[str], budget_s: float = 2.0) -> float:
+    # Stops early once the time budget is spent so the slow baseline stays bounded
+    start = time.perf_counter()
+    done = 0
+    for bio in bios:
+        fn(bio)
+        done += 1
+        if time.perf_counter() - start > budget_s:
+            break
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'categories':>10} {'legacy bios/s':>15} {'compiled bios/s':>17} {'speedup':>8}")
+    for n_categories in (5, 50, 500):
+        taxonomy = make_taxonomy(n_categories)
+        bios = make_bios(taxonomy, N_BIOS)
+        matcher = TaxonomyMatcher(taxonomy)
+
+        # Sanity check: both implementations must agree before we compare speed
+        for bio in bios[:20]:
+            assert matcher.categorize(bio) == legacy_categorize(bio, taxonomy)
+
+        legacy = bios_per_sec(lambda b: legacy_categorize(b, taxonomy), bios)
+        compiled = bios_per_sec(matcher.categorize, bios)
+        print(f"{n_categories:>10} {legacy:>15,.0f} {compiled:>17,.0f} {compiled / legacy:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Scaling of AIEngine.categorize_many / analyze_many across worker processes.
+
+Run from backend/:  python -m benchmarks.bench_categorize_many [n_texts]
+"""
+import os
+import sys
+import time
+
+from app.services.ai.engine import ai_engine
+from benchmarks.bench_categorize import make_bios
+
+CHUNK_SIZE = 2000
+
+
+def main():
+    n_texts = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bios = make_bios(ai_engine.CATEGORY_KEYWORDS, n_texts)
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+
+    print(f"{n_texts:,} texts, chunk_size={CHUNK_SIZE}, {cpus} CPUs")
+    print(f"{'workers':>7} {'categorize/s':>14} {'analyze/s':>12}")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        for _ in ai_engine.categorize_many(bios, workers=workers, chunk_size=CHUNK_SIZE):
+            pass
+        categorize_rate = n_texts / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in ai_engine.analyze_many(bios, workers=workers, chunk_size=CHUNK_SIZE):
+            pass
+        analyze_rate = n_texts / (time.perf_counter() - start)
+        print(f"{workers:>7} {categorize_rate:>14,.0f} {analyze_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Throughput (rows/sec) and peak memory of the streaming CSV ingestion pipeline
+(parse -> batch validate -> normalize). The DB writer is a no-op so the numbers
+isolate our own code; pass --with-db to upsert into the configured Postgres.
+
+Run from backend/:  python -m benchmarks.bench_csv_ingestion [rows ...] [--with-db]
+"""
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import partial
+
+from app.services.ingestion.csv_ingestion import ingest_csv
+
+PLATFORMS = ["instagram", "youtube", "linkedin"]
+TAGS = ["fitness", "tech", "food", "travel", "beauty", "gaming", "finance"]
+
+
+def write_csv(path: str, n_rows: int, error_rate: float = 0.01, seed: int = 3) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("handle,platform,followers,url,niche_tags\n")
+        for i in range(n_rows):
+            followers = "n/a" if rng.random() < error_rate else str(rng.randint(100, 5_000_000))
+            tags = ",".join(rng.sample(TAGS, rng.randint(1, 3)))
+            f.write(f'creator{i},{rng.choice(PLATFORMS)},{followers},https://example.com/creator{i},"{tags}"\n')
+
+
+def run(n_rows: int, writer) -> None:
+    with tempfile.NamedTemporaryFile(suffix=".csv") as tmp:
+        write_csv(tmp.name, n_rows)
+        with open(tmp.name, "rb") as stream:
+            start = time.perf_counter()
+            report = ingest_csv(stream, writer=writer)
+            elapsed = time.perf_counter() - start
+
+        # Second pass under tracemalloc (which slows Python down) just for peak memory
+        with open(tmp.name, "rb") as stream:
+            tracemalloc.start()
+            ingest_csv(stream, writer=lambda batch: None)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    print(
+        f"{n_rows:>10,} {n_rows / elapsed:>12,.0f} {peak / 1e6:>12.1f} "
+        f"{report.rows_ingested:>10,} {report.rows_failed:>8,}"
+    )
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    sizes = [int(a) for a in args] or [10_000, 100_000]
+
+    writer = lambda batch: None
+    if "--with-db" in sys.argv:
+        from app.core.database import SessionLocal
+        from app.services.ingestion.csv_ingestion import upsert_profiles
+        writer = partial(upsert_profiles, SessionLocal())
+
+    print(f"{'rows':>10} {'rows/sec':>12} {'peak MB':>12} {'ingested':>10} {'failed':>8}")
+    for n_rows in sizes:
+        run(n_rows, writer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Discovery search latency by page depth: page 1 vs page 500 (20 rows a page) with the
+keyset cursor, next to the same page 500 fetched with OFFSET. Needs the Postgres from
+settings; the influencers table is built in a scratch schema inside a transaction that is
+rolled back at the end, so nothing is left behind.
+
+Run from backend/:  python -m benchmarks.bench_discovery_search [n_rows]
+"""
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from app.core.database import engine
+from app.models.user import Influencer
+from app.schemas.discovery import DiscoverySort, InfluencerSearch
+from app.services.discovery.search import build_search_query, encode_cursor
+
+PAGE_SIZE = 20
+DEEP_PAGE = 500
+REPEAT = 20
+
+
+def seed(db: Session, n_rows: int) -> None:
+    db.execute(text("CREATE SCHEMA bench_discovery"))
+    db.execute(text("SET LOCAL search_path TO bench_discovery, public"))
+    db.execute(CreateTable(Influencer.__table__, include_foreign_key_constraints=[]))
+    db.execute(text("""
+        INSERT INTO influencers (user_id, username, niche, metrics)
+        SELECT md5(i::text)::uuid, 'creator' || i,
+               jsonb_build_array((ARRAY['tech', 'beauty', 'travel', 'food', 'gaming'])[i % 5 + 1]),
+               jsonb_build_object('followers', (i::bigint * 7919) % 5000000,
+                                  'engagement_rate', ((i * 31) % 1000) / 10000.0)
+        FROM generate_series(1, :n) AS i
+    """), {"n": n_rows})
+    # Indexes after the load, as a bulk import would
+    for index in Influencer.__table__.indexes:
+        index.create(db.connection())
+    db.execute(text("ANALYZE influencers"))
+
+
+def timed(db: Session, query) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        db.execute(query).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def cursor_at(db: Session, search: InfluencerSearch, position: int) -> str:
+    influencer, value = db.execute(build_search_query(search).limit(1).offset(position - 1)).one()
+    return encode_cursor(search.sort, value, influencer.user_id)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with Session(engine) as db:
+        start = time.perf_counter()
+        seed(db, n_rows)
+        print(f"{n_rows} influencers seeded and indexed in {time.perf_counter() - start:.1f} s")
+        print(f"{'query':>28} {'page 1 ms':>10} {'page 500 ms':>12} {'OFFSET 500 ms':>14}")
+
+        for name, search in (
+            ("followers", InfluencerSearch(limit=PAGE_SIZE)),
+            ("niche=tech", InfluencerSearch(niche=["tech"], limit=PAGE_SIZE)),
+            ("engagement, followers>=1M", InfluencerSearch(
+                sort=DiscoverySort.ENGAGEMENT_RATE, min_followers=1_000_000, limit=PAGE_SIZE
+            )),
+        ):
+            deep_offset = PAGE_SIZE * (DEEP_PAGE - 1)
+            deep = search.model_copy(update={"cursor": cursor_at(db, search, deep_offset)})
+            print(
+                f"{name:>28} {timed(db, build_search_query(search)):>10.2f} "
+                f"{timed(db, build_search_query(deep)):>12.2f} "
+                f"{timed(db, build_search_query(search).offset(deep_offset)):>14.2f}"
+            )
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()
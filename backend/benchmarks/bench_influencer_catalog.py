@@ -0,0 +1,86 @@
+"""
+In-memory influencer catalog at scale: snapshot build time and footprint, filter-and-rank
+latency (median / p99 over REPEAT runs) for a few typical searches, and the cost of an
+incremental refresh applying CHANGED_ROWS updated profiles. Rows are synthetic, so no
+database is needed.
+
+Run from backend/:  python -m benchmarks.bench_influencer_catalog [n_rows]
+"""
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+
+from app.schemas.discovery import DiscoverySort, InfluencerSearch, NicheMatch
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot
+
+N_TAGS = 200
+CHANGED_ROWS = 5000
+REPEAT = 50
+
+
+def synthetic_rows(n_rows: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    tags = [f"tag{i}" for i in range(N_TAGS)]
+    # Zipf-ish tag popularity, 1-4 tags per profile
+    weights = 1 / np.arange(1, N_TAGS + 1)
+    weights /= weights.sum()
+    counts = rng.integers(1, 5, size=n_rows)
+    picks = rng.choice(N_TAGS, size=(n_rows, 4), p=weights)
+    followers = rng.lognormal(9, 2, size=n_rows).round()
+    engagement = rng.beta(2, 40, size=n_rows)
+    return [
+        (uuid.uuid4(), [tags[t] for t in set(picks[i, :counts[i]])], followers[i], engagement[i], None)
+        for i in range(n_rows)
+    ]
+
+
+def timed(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = synthetic_rows(n_rows)
+
+    start = time.perf_counter()
+    vocabulary = {}
+    snapshot = CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)
+    print(f"{n_rows} influencers, {N_TAGS} tags: snapshot built in {time.perf_counter() - start:.1f} s")
+
+    report = snapshot.memory_report()
+    print(f"memory: {report['total'] / 2**20:.1f} MB ({report['total'] / n_rows:.0f} B/row)")
+    for name, size in report.items():
+        if name not in ("total", "rows"):
+            print(f"  {name:>14} {size / 2**20:>8.1f} MB")
+
+    print(f"{'search':>36} {'median ms':>10} {'p99 ms':>8}")
+    for name, search in (
+        ("top followers", InfluencerSearch()),
+        ("tag1 (popular)", InfluencerSearch(niche=["tag1"])),
+        ("tag150 (rare), engagement", InfluencerSearch(niche=["tag150"], sort=DiscoverySort.ENGAGEMENT_RATE)),
+        ("tag2+tag3, 10k-100k followers", InfluencerSearch(niche=["tag2", "tag3"], min_followers=10_000, max_followers=100_000)),
+        ("any of 5 tags, engagement >= 5%", InfluencerSearch(
+            niche=[f"tag{i}" for i in range(40, 45)], niche_match=NicheMatch.ANY, min_engagement=0.05, limit=100
+        )),
+    ):
+        median, p99 = timed(lambda: snapshot.search(search))
+        print(f"{name:>36} {median:>10.2f} {p99:>8.2f}")
+
+    changed = synthetic_rows(CHANGED_ROWS, seed=8)
+    changed = [(rows[i][0], *r[1:]) for i, r in zip(range(0, n_rows, n_rows // CHANGED_ROWS), changed)]
+    start = time.perf_counter()
+    snapshot.apply(CatalogChunk(changed, vocabulary), vocabulary)
+    print(f"incremental refresh of {len(changed)} changed rows: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
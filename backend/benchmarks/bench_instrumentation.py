@@ -0,0 +1,69 @@
+"""
+Overhead of request instrumentation: per-request cost of InstrumentationMiddleware
+(Server-Timing header + histograms) around a trivial ASGI app, and per-statement cost of
+the SQLAlchemy engine events, both against the uninstrumented path. Uses in-memory
+SQLite, so no database is needed.
+
+Run from backend/:  python -m benchmarks.bench_instrumentation [n_requests]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.core.instrumentation import InstrumentationMiddleware, RequestTimings, _current, instrument_engine
+
+STATEMENTS = 20000
+
+
+async def plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def drive(app, n_requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n_requests * 1e6
+
+
+def statements(engine) -> float:
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for _ in range(STATEMENTS):
+            conn.execute(text("SELECT 1"))
+        return (time.perf_counter() - start) / STATEMENTS * 1e6
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    bare = asyncio.run(drive(plain_app, n_requests))
+    wrapped = asyncio.run(drive(InstrumentationMiddleware(plain_app), n_requests))
+    print(f"ASGI request: {bare:.1f} us bare, {wrapped:.1f} us instrumented (+{wrapped - bare:.1f} us)")
+
+    plain_engine = create_engine("sqlite://")
+    instrumented_engine = create_engine("sqlite://")
+    instrument_engine(instrumented_engine)
+    bare = statements(plain_engine)
+    idle = statements(instrumented_engine)
+    token = _current.set(RequestTimings())
+    try:
+        counted = statements(instrumented_engine)
+    finally:
+        _current.reset(token)
+    print(f"SQL statement: {bare:.1f} us bare, {idle:.1f} us with events outside a request, "
+          f"{counted:.1f} us counted in a request (+{counted - bare:.1f} us)")
+
+
+if __name__ == "__main__":
+    main()
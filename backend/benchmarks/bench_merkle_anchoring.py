@@ -0,0 +1,49 @@
+"""
+Merkle-batched anchoring: cost of building a tree and proofs per batch, of verifying
+one proof locally, and how many on-chain transactions a day's records need
+per-record vs batched.
+
+Run from backend/:  python -m benchmarks.bench_merkle_anchoring [n_records]
+"""
+import sys
+import time
+import uuid
+
+from app.services.blockchain.merkle import MerkleTree, verify_proof
+
+BATCH_SIZES = (100, 1000, 10000)
+
+
+def make_records(n: int):
+    return [f"{uuid.uuid4()}|{uuid.uuid4()}|{uuid.uuid4()}|{i}.00".encode() for i in range(n)]
+
+
+def main():
+    n_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(max(BATCH_SIZES))
+
+    print(f"{'batch':>7} {'build ms':>9} {'proofs ms':>10} {'proof len':>10} {'verify us':>10} {'txs':>9}")
+    for batch_size in BATCH_SIZES:
+        batch = records[:batch_size]
+
+        start = time.perf_counter()
+        tree = MerkleTree(batch)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        proofs = [tree.proof(i) for i in range(batch_size)]
+        proofs_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(batch_size):
+            assert verify_proof(batch[i], proofs[i], tree.root_hex)
+        verify_us = (time.perf_counter() - start) / batch_size * 1e6
+
+        txs = -(-n_records // batch_size)
+        print(f"{batch_size:>7} {build_ms:>9.1f} {proofs_ms:>10.1f} {len(proofs[-1]):>10} {verify_us:>10.1f} {txs:>9,}")
+
+    print(f"per-record anchoring: {n_records:,} txs for {n_records:,} records")
+
+
+if __name__ == "__main__":
+    main()
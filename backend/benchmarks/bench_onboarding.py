@@ -0,0 +1,105 @@
+"""
+Onboarding write path: the old check-then-insert (SELECT, INSERT, COMMIT, refresh SELECT)
+vs the single INSERT ... ON CONFLICT DO NOTHING RETURNING. Reports latency and
+SQL statements per request.
+
+Needs a reachable Postgres with the app tables (POSTGRES_* settings). Synthetic
+users are created for the run and deleted afterwards.
+
+Run from backend/:  python -m benchmarks.bench_onboarding [n_requests]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.models.user import Brand, User
+from app.schemas.user import UserRole
+
+statements = 0
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global statements
+    statements += 1
+
+
+async def legacy_onboard(db, user_id):
+    if (await db.execute(select(Brand).where(Brand.user_id == user_id))).scalars().first():
+        raise RuntimeError("exists")
+    brand = Brand(user_id=user_id, company_name="Acme", industry="tech", verified=False)
+    db.add(brand)
+    await db.commit()
+    await db.refresh(brand)
+    return brand
+
+
+async def upsert_onboard(db, user_id):
+    stmt = (
+        insert(Brand)
+        .values(user_id=user_id, company_name="Acme", industry="tech", verified=False)
+        .on_conflict_do_nothing(index_elements=[Brand.user_id])
+        .returning(Brand)
+    )
+    brand = (await db.execute(stmt)).scalar_one_or_none()
+    if brand is None:
+        raise RuntimeError("exists")
+    await db.commit()
+    return brand
+
+
+async def run(name, fn, user_ids):
+    global statements
+    statements = 0
+    latencies = []
+    for user_id in user_ids:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            await fn(db, user_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<28} p50 {statistics.median(latencies):6.2f} ms  p99 {p99:6.2f} ms  "
+        f"{statements / len(user_ids):.1f} statements/request"
+    )
+
+
+async def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    warmup_ids = [uuid.uuid4() for _ in range(20)]
+    legacy_ids = [uuid.uuid4() for _ in range(n)]
+    upsert_ids = [uuid.uuid4() for _ in range(n)]
+    all_ids = warmup_ids + legacy_ids + upsert_ids
+
+    async with AsyncSessionLocal() as db:
+        db.add_all([User(id=uid, email=f"{uid}@bench.local", role=UserRole.BRAND) for uid in all_ids])
+        await db.commit()
+
+    try:
+        # Warm the pool and statement caches so neither variant pays for them
+        for user_id in warmup_ids[:10]:
+            async with AsyncSessionLocal() as db:
+                await legacy_onboard(db, user_id)
+        for user_id in warmup_ids[10:]:
+            async with AsyncSessionLocal() as db:
+                await upsert_onboard(db, user_id)
+
+        await run("select + insert + refresh", legacy_onboard, legacy_ids)
+        await run("insert on conflict returning", upsert_onboard, upsert_ids)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Brand).where(Brand.user_id.in_(all_ids)))
+            await db.execute(delete(User).where(User.id.in_(all_ids)))
+            await db.commit()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Orders/sec against a local fake Razorpay gateway (uvicorn subprocess on 127.0.0.1,
+GATEWAY_LATENCY_MS per order): the synchronous razorpay.Client one order at a time (what a
+request worker sees), the same client from a 40-thread pool (FastAPI's sync threadpool),
+and the pooled async client's `create_orders` batch. Client CPU per order is reported too,
+since on a small box the client's own overhead, not the gateway, caps throughput.
+
+Run from backend/:  python -m benchmarks.bench_payment_orders [n_orders]
+"""
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.core.config import settings
+from app.services.payment.razorpay_service import OrderRequest, PaymentService
+
+GATEWAY_LATENCY_MS = 30
+
+gateway = FastAPI()
+
+
+@gateway.post("/v1/orders")
+async def create_order(request: Request):
+    body = await request.json()
+    await asyncio.sleep(GATEWAY_LATENCY_MS / 1000)
+    return {"id": "order_bench", "entity": "order", **body}
+
+
+def serve(port: int) -> None:
+    uvicorn.run(gateway, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_gateway() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    multiprocessing.Process(target=serve, args=(port,), daemon=True).start()
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port)).close()
+            return port
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("fake gateway did not start")
+
+
+def report(name: str, n: int, seconds: float, cpu_seconds: float) -> None:
+    print(f"{name:>16} {n / seconds:>10.1f} {cpu_seconds / n * 1000:>12.2f}")
+
+
+def main():
+    n_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    port = start_gateway()
+    settings.RAZORPAY_KEY_ID = "rzp_bench"
+    settings.RAZORPAY_KEY_SECRET = "bench"
+    settings.RAZORPAY_API_URL = f"http://127.0.0.1:{port}"
+    service = PaymentService()
+    print(f"{n_orders} orders, gateway latency {GATEWAY_LATENCY_MS} ms")
+    print(f"{'client':>16} {'orders/s':>10} {'cpu ms/order':>12}")
+
+    sequential = min(n_orders, 50)
+    start, cpu = time.perf_counter(), time.process_time()
+    for i in range(sequential):
+        service.create_order(100 + i, notes={"campaign_id": str(i)})
+    report("sync sequential", sequential, time.perf_counter() - start, time.process_time() - cpu)
+
+    start, cpu = time.perf_counter(), time.process_time()
+    with ThreadPoolExecutor(max_workers=40) as pool:
+        list(pool.map(lambda i: service.create_order(100 + i, notes={"campaign_id": str(i)}), range(n_orders)))
+    report("sync 40 threads", n_orders, time.perf_counter() - start, time.process_time() - cpu)
+
+    async def run_async():
+        orders = [OrderRequest(100 + i, notes={"campaign_id": str(i)}) for i in range(n_orders)]
+        await service.create_order_async(1)  # open the pool before timing
+        start, cpu = time.perf_counter(), time.process_time()
+        results = await service.create_orders(orders)
+        elapsed = time.perf_counter() - start, time.process_time() - cpu
+        assert all(isinstance(r, dict) for r in results)
+        await service.aclose()
+        return elapsed
+
+    report("async pooled", n_orders, *asyncio.run(run_async()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Semantic influencer search on CPU: embedding throughput (hashed n-gram TF-IDF + random
+projection into a memory-mapped matrix), IVF index build time, and query latency
+(median / p99) with recall@K against brute force for a few n_probe settings.
+Bios are synthetic: each mixes keywords of one or two AIEngine categories with filler.
+
+Run from backend/:  python -m benchmarks.bench_semantic_search [n_bios]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.ai.embeddings import TextEmbedder, embed_to_memmap
+from app.services.ai.engine import AIEngine
+from app.services.ai.vector_index import IVFIndex, exact_search
+
+K = 10
+N_QUERIES = 200
+N_PROBES = (8, 16, 32, 64)
+FILLER = (
+    "love life daily vibes creator based in mumbai delhi london new york dm for collabs "
+    "official page sharing my journey tips reviews content partner business inquiries"
+).split()
+
+
+def synthetic_bios(n: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    topics = [words for words in AIEngine.CATEGORY_KEYWORDS.values()]
+    # Topic-specific extras so bios of one category are not all alike
+    extras = [[f"{words[0]}{i}" for i in range(30)] for words in topics]
+    bios = []
+    for _ in range(n):
+        picked = rng.choice(len(topics), size=rng.integers(1, 3), replace=False)
+        words = []
+        for topic in picked:
+            words += rng.choice(topics[topic], size=3).tolist() + rng.choice(extras[topic], size=2).tolist()
+        words += rng.choice(FILLER, size=rng.integers(3, 10)).tolist()
+        rng.shuffle(words)
+        bios.append(" ".join(words))
+    return bios
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    bios = synthetic_bios(n)
+    queries = synthetic_bios(N_QUERIES, seed=12)
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        embedder = TextEmbedder().fit(bios)
+        fitted = time.perf_counter()
+        vectors = embed_to_memmap(embedder, bios, n, os.path.join(directory, "embeddings.npy"))
+        embedded = time.perf_counter()
+        print(f"{n} bios: idf fitted in {fitted - start:.1f} s, embedded in {embedded - fitted:.1f} s "
+              f"({n / (embedded - fitted):.0f} bios/s), {vectors.nbytes / 2**20:.0f} MB memmap")
+
+        start = time.perf_counter()
+        index = IVFIndex.build(vectors, path=os.path.join(directory, "ivf_vectors.npy"))
+        print(f"IVF index: {index.n_lists} lists built in {time.perf_counter() - start:.1f} s")
+
+        query_vectors = embedder.transform(queries)
+        truth = []
+        samples = []
+        for query in query_vectors:
+            start = time.perf_counter()
+            rows, _ = exact_search(vectors, query, K)
+            samples.append((time.perf_counter() - start) * 1000)
+            truth.append(set(rows.tolist()))
+        samples.sort()
+        print(f"{'method':>16} {'median ms':>10} {'p99 ms':>8} {'recall@' + str(K):>10}")
+        print(f"{'brute force':>16} {statistics.median(samples):>10.2f} {samples[int(len(samples) * 0.99) - 1]:>8.2f} {1.0:>10.3f}")
+
+        for n_probe in N_PROBES:
+            samples = []
+            hits = 0
+            for query, expected in zip(query_vectors, truth):
+                start = time.perf_counter()
+                rows, _ = index.search(query, K, n_probe)
+                samples.append((time.perf_counter() - start) * 1000)
+                hits += len(expected & set(rows.tolist()))
+            samples.sort()
+            print(f"{'IVF n_probe=' + str(n_probe):>16} {statistics.median(samples):>10.2f} "
+                  f"{samples[int(len(samples) * 0.99) - 1]:>8.2f} {hits / (K * len(truth)):>10.3f}")
+        del vectors, index
+
+
+if __name__ == "__main__":
+    main()
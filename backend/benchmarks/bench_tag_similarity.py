@@ -0,0 +1,79 @@
+"""
+"Find similar influencers" at scale: top-k Jaccard similarity of niche tags scored exactly
+(popcount over the catalog's packed tag bitsets) against a per-profile Python loop, and
+MinHash/LSH candidates (build time, index size, latency and recall@K against exact).
+Rows are synthetic, so no database is needed.
+
+Run from backend/:  python -m benchmarks.bench_tag_similarity [n_rows ...]
+"""
+import sys
+import time
+
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot
+from app.services.discovery.similarity import SimilarityEngine
+from benchmarks.bench_influencer_catalog import synthetic_rows, timed
+
+K = 20
+N_QUERIES = 20
+NAIVE_MAX_ROWS = 200_000  # the Python loop takes too long beyond this
+
+
+class StaticCatalog:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.loaded = True
+
+
+def naive_top_k(rows, query, k):
+    scored = []
+    for user_id, niche, *_ in rows:
+        niche = set(niche)
+        union = len(query | niche)
+        if union:
+            scored.append((len(query & niche) / union, user_id))
+    scored.sort(reverse=True)
+    return scored[:k]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print(f"{'rows':>9} {'method':>22} {'median ms':>10} {'p99 ms':>8} {'recall@' + str(K):>10}")
+    for n_rows in sizes:
+        rows = synthetic_rows(n_rows)
+        vocabulary = {}
+        snapshot = CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)
+        catalog = StaticCatalog(snapshot)
+        exact = SimilarityEngine(catalog)
+        approximate = SimilarityEngine(catalog, lsh_min_rows=0)
+
+        start = time.perf_counter()
+        index = approximate._lsh_index(snapshot)
+        print(f"{n_rows:>9} {'LSH build':>22} {(time.perf_counter() - start) * 1000:>10.0f} "
+              f"{'':>8} {'':>10}  ({index.memory() / 2**20:.1f} MB)")
+
+        queries = [rows[i][0] for i in range(0, n_rows, n_rows // N_QUERIES)][:N_QUERIES]
+        profile = queries[0]
+        tags = rows[0][1]
+
+        if n_rows <= NAIVE_MAX_ROWS:
+            median, p99 = timed(lambda: naive_top_k(rows, set(tags), K))
+            print(f"{n_rows:>9} {'Python loop (tags)':>22} {median:>10.1f} {p99:>8.1f}")
+
+        median, p99 = timed(lambda: exact.similar_to_tags(tags, K))
+        print(f"{n_rows:>9} {'exact (tags)':>22} {median:>10.2f} {p99:>8.2f}")
+        median, p99 = timed(lambda: exact.similar_to_influencer(profile, K))
+        print(f"{n_rows:>9} {'exact (influencer)':>22} {median:>10.2f} {p99:>8.2f}")
+
+        # Recall: share of the exact top-K scores reached by the LSH top-K, over N_QUERIES profiles
+        hits = total = 0
+        for user_id in queries:
+            truth = [score for _, score in exact.similar_to_influencer(user_id, K)]
+            found = sorted((score for _, score in approximate.similar_to_influencer(user_id, K)), reverse=True)
+            hits += sum(1 for want, got in zip(truth, found) if got >= want - 1e-6)
+            total += len(truth)
+        median, p99 = timed(lambda: approximate.similar_to_influencer(profile, K))
+        print(f"{n_rows:>9} {'LSH (influencer)':>22} {median:>10.2f} {p99:>8.2f} {hits / max(total, 1):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Replays a burst of signed `payment.captured` webhooks (with Razorpay-style retries mixed
+in) against the webhook endpoint and reports acknowledgement latency (p50/p99) and the
+time until every event is applied. Compared with applying each event inline in the
+request, which is what the endpoint would do without the queue.
+
+The DB write is simulated (DB_STATEMENT_MS per statement, DB_CONNECTIONS at once) so the
+numbers don't depend on a local Postgres.
+
+Run from backend/:  python -m benchmarks.bench_webhook_burst [n_events] [concurrency]
+"""
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from app.api.v1.endpoints import payments
+from app.core.config import settings
+from app.main import app
+from app.services.payment.webhooks import WebhookProcessor, parse_webhook
+
+SECRET = "bench-webhook-secret"
+DUPLICATE_RATE = 0.2
+DB_STATEMENT_MS = 4
+DB_CONNECTIONS = 30  # DB_POOL_SIZE + DB_MAX_OVERFLOW defaults
+
+db_slots = None
+
+
+async def fake_apply(events):
+    # One batch = one transaction of ~3 statements, regardless of its size
+    async with db_slots:
+        await asyncio.sleep(3 * DB_STATEMENT_MS / 1000)
+
+
+def make_burst(n_events: int, seed: int = 5):
+    rng = random.Random(seed)
+    originals = []
+    for i in range(n_events):
+        body = json.dumps({
+            "event": "payment.captured",
+            "payload": {"payment": {"entity": {
+                "id": f"pay_{i}", "order_id": f"order_{i}",
+                "notes": {"transaction_id": str(uuid.uuid4()), "campaign_id": str(uuid.uuid4())},
+            }}},
+        }).encode()
+        signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+        originals.append((f"evt_{i}", body, signature))
+
+    burst = list(originals)
+    burst += [rng.choice(originals) for _ in range(int(n_events * DUPLICATE_RATE))]
+    rng.shuffle(burst)
+    return burst
+
+
+def inline_app() -> FastAPI:
+    # Baseline: verify, then apply in the request before answering
+    baseline = FastAPI()
+
+    @baseline.post("/api/v1/payment/webhook")
+    async def webhook(request: Request):
+        body = await request.body()
+        event = parse_webhook(json.loads(body), request.headers.get("x-razorpay-event-id"), body)
+        await fake_apply([event])
+        return {"status": "applied"}
+
+    return baseline
+
+
+async def replay(target_app, burst, concurrency: int):
+    latencies = []
+    queue = list(burst)
+    transport = ASGITransport(app=target_app)
+
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def sender():
+            while queue:
+                event_id, body, signature = queue.pop()
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/payment/webhook", content=body,
+                    headers={"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": event_id},
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.text
+
+        await asyncio.gather(*(sender() for _ in range(concurrency)))
+    return latencies
+
+
+def report(name, latencies, total_s):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:>8} {statistics.median(latencies):>8.2f} {p99:>8.2f} {total_s:>11.2f}")
+
+
+async def main():
+    global db_slots
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    settings.RAZORPAY_WEBHOOK_SECRET = SECRET
+    db_slots = asyncio.Semaphore(DB_CONNECTIONS)
+    burst = make_burst(n_events)
+
+    print(f"{len(burst)} webhooks ({n_events} unique), {concurrency} concurrent senders")
+    print(f"{'mode':>8} {'p50 ms':>8} {'p99 ms':>8} {'applied in s':>11}")
+
+    start = time.perf_counter()
+    latencies = await replay(inline_app(), burst, concurrency)
+    report("inline", latencies, time.perf_counter() - start)
+
+    processor = WebhookProcessor(fake_apply)
+    payments.webhook_processor = processor
+    start = time.perf_counter()
+    latencies = await replay(app, burst, concurrency)
+    await processor.close()
+    report("queued", latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
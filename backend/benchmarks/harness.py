@@ -0,0 +1,140 @@
+"""
+Micro-benchmark harness for the regression suite (see benchmarks/suite.py): times single
+operations, reports ops/sec with p50/p99 latency, stores baselines as JSON and flags
+cases whose throughput or median latency got worse than a threshold.
+"""
+import asyncio
+import gc
+import json
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
+
+WARMUP_OPS = 50
+MIN_OPS = 200
+MIN_TIME = 0.3  # seconds measured per round (after warmup)
+ROUNDS = 3  # best round is kept, as timeit does: slower rounds are noise from other processes
+MAX_OPS = 200_000
+
+
+class Result(NamedTuple):
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+
+
+class Regression(NamedTuple):
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # relative, positive = worse
+
+
+Operation = Callable[[], Union[object, Awaitable[object]]]
+
+
+def _summarize(name: str, samples: List[float], elapsed: float) -> Result:
+    samples.sort()
+    p99 = samples[max(int(len(samples) * 0.99) - 1, 0)]
+    return Result(name, len(samples) / elapsed, statistics.median(samples) * 1e6, p99 * 1e6)
+
+
+def measure(name: str, op: Operation, min_time: float = MIN_TIME) -> Result:
+    """
+    Calls `op` (sync) until both MIN_OPS calls and `min_time` seconds are reached,
+    timing each call.
+    """
+    for _ in range(WARMUP_OPS):
+        op()
+    samples = []
+    clock = time.perf_counter
+    started = clock()
+    while len(samples) < MAX_OPS and (len(samples) < MIN_OPS or clock() - started < min_time):
+        start = clock()
+        op()
+        samples.append(clock() - start)
+    return _summarize(name, samples, clock() - started)
+
+
+async def measure_async(name: str, op: Operation, min_time: float = MIN_TIME) -> Result:
+    """
+    `measure` for coroutine functions, awaited one at a time.
+    """
+    for _ in range(WARMUP_OPS):
+        await op()
+    samples = []
+    clock = time.perf_counter
+    started = clock()
+    while len(samples) < MAX_OPS and (len(samples) < MIN_OPS or clock() - started < min_time):
+        start = clock()
+        await op()
+        samples.append(clock() - start)
+    return _summarize(name, samples, clock() - started)
+
+
+def run_case(name: str, op: Operation, min_time: float = MIN_TIME, rounds: int = ROUNDS) -> Result:
+    """
+    Best of `rounds` measurements of `op`, sync or async.
+    """
+    # Collector pauses land on whichever case happens to be running, so they're kept out (as timeit does)
+    gc.collect()
+    gc.disable()
+    try:
+        if asyncio.iscoroutinefunction(op):
+            async def measure_rounds():
+                return [await measure_async(name, op, min_time) for _ in range(rounds)]
+            results = asyncio.run(measure_rounds())
+        else:
+            results = [measure(name, op, min_time) for _ in range(rounds)]
+    finally:
+        gc.enable()
+    return max(results, key=lambda r: r.ops_per_sec)
+
+
+def load_baselines(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baselines(path: str, results: List[Result], previous: Optional[Dict[str, dict]] = None) -> None:
+    """
+    Writes `results` as the new baselines, keeping entries of cases that weren't run.
+    """
+    baselines = dict(previous or {})
+    baselines.update({r.name: {"ops_per_sec": round(r.ops_per_sec, 1), "p50_us": round(r.p50_us, 2), "p99_us": round(r.p99_us, 2)} for r in results})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write("\n")
+
+
+def find_regressions(results: List[Result], baselines: Dict[str, dict], threshold: float) -> List[Regression]:
+    """
+    Cases whose ops/sec fell, or whose p50 rose, by more than `threshold` (0.2 = 20%).
+    p99 is reported but not gated: single outliers make it too noisy on shared machines.
+    """
+    regressions = []
+    for result in results:
+        baseline = baselines.get(result.name)
+        if not baseline:
+            continue
+        slowdown = 1 - result.ops_per_sec / baseline["ops_per_sec"]
+        if slowdown > threshold:
+            regressions.append(Regression(result.name, "ops_per_sec", baseline["ops_per_sec"], result.ops_per_sec, slowdown))
+        latency = result.p50_us / baseline["p50_us"] - 1
+        if latency > threshold:
+            regressions.append(Regression(result.name, "p50_us", baseline["p50_us"], result.p50_us, latency))
+    return regressions
+
+
+def format_table(results: List[Result], baselines: Dict[str, dict]) -> str:
+    lines = [f"{'case':<40} {'ops/sec':>12} {'p50 us':>10} {'p99 us':>10} {'vs baseline':>12}"]
+    for r in results:
+        baseline = baselines.get(r.name)
+        change = f"{r.ops_per_sec / baseline['ops_per_sec'] - 1:+.0%}" if baseline else "new"
+        lines.append(f"{r.name:<40} {r.ops_per_sec:>12,.0f} {r.p50_us:>10.1f} {r.p99_us:>10.1f} {change:>12}")
+    return "\n".join(lines)
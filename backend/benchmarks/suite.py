@@ -0,0 +1,294 @@
+"""
+Hot-path regression suite: AIEngine over synthetic corpora, JWT verification, request
+schema validation and the /users endpoints end-to-end through ASGITransport (DB replaced
+by an in-memory session, so no database is needed). Each case reports ops/sec, p50 and
+p99; results are compared against benchmarks/baselines.json and the run exits with
+status 1 if any case regressed by more than the threshold.
+
+Baselines are machine-specific: record them with --save on the machine that runs the
+comparison (CI records them from the target branch in the same job).
+
+Run from backend/:  python -m benchmarks.suite [--save] [--baseline PATH] [--threshold 0.25]
+                    [--filter SUBSTRING] [--min-time SECONDS]
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from itertools import cycle
+from typing import Callable, Dict, List
+
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from sqlalchemy.dialects import postgresql
+
+from app.core import security
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.http_cache import profile_cache
+from app.main import app
+from app.models.user import Brand, Influencer, User
+from app.schemas.ingestion import CSVIngestionRow
+from app.schemas.user import InfluencerCreate, UserRole
+from app.services.ai.engine import AIEngine
+from benchmarks.bench_brand_mentions import make_brands, make_captions
+from benchmarks.bench_categorize import make_bios
+from benchmarks.harness import (
+    MIN_TIME, Operation, find_regressions, format_table, load_baselines, run_case, save_baselines
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_THRESHOLD = 0.25
+CORPUS_SIZE = 2000
+BATCH_SIZE = 500
+N_BRANDS = 200
+USER_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+WALLET = "0x" + "ab" * 20
+
+# name -> factory building the operation, so filtered-out cases pay no setup
+CASES: Dict[str, Callable[[], Operation]] = {}
+
+
+def case(name: str):
+    def register(factory):
+        CASES[name] = factory
+        return factory
+    return register
+
+
+# --- AIEngine ---
+
+@case("ai.categorize_bio")
+def categorize_bio():
+    engine = AIEngine()
+    bios = cycle(make_bios(engine.CATEGORY_KEYWORDS, CORPUS_SIZE))
+    return lambda: engine.categorize_bio(next(bios))
+
+
+@case("ai.categorize_many[500]")
+def categorize_many():
+    engine = AIEngine()
+    bios = make_bios(engine.CATEGORY_KEYWORDS, BATCH_SIZE)
+    return lambda: list(engine.categorize_many(bios))
+
+
+@case("ai.detect_brand_mentions[200 brands]")
+def detect_brand_mentions():
+    engine = AIEngine()
+    brands = make_brands(N_BRANDS)
+    captions = cycle(make_captions(brands, CORPUS_SIZE))
+    return lambda: engine.detect_brand_mentions(next(captions), brands)
+
+
+@case("ai.analyze_sentiment")
+def analyze_sentiment():
+    engine = AIEngine()
+    captions = cycle(make_captions(make_brands(N_BRANDS), CORPUS_SIZE))
+    return lambda: engine.analyze_sentiment_rule_based(next(captions))
+
+
+# --- JWT ---
+
+def make_token(secret: str = None, **claims) -> str:
+    payload = {
+        "sub": USER_ID,
+        "aud": "authenticated",
+        "email": "bench@example.com",
+        "exp": int(time.time()) + 3600,
+        "app_metadata": {"role": UserRole.BRAND.value},
+    }
+    payload.update(claims)
+    return jwt.encode(payload, secret or settings.JWT_SECRET, algorithm=security.ALGORITHM)
+
+
+@case("jwt.decode[cached]")
+def decode_cached():
+    token = make_token()
+    return lambda: security.decode_access_token(token)
+
+
+@case("jwt.decode[uncached]")
+def decode_uncached():
+    # Full signature check on every call: the verified-token cache is emptied first
+    token = make_token()
+
+    def op():
+        security._token_cache.clear()
+        return security.decode_access_token(token)
+    return op
+
+
+@case("jwt.decode[bad signature]")
+def decode_bad_signature():
+    token = make_token(secret="not-the-secret")
+    return lambda: security.decode_access_token(token)
+
+
+@case("jwt.decode[malformed]")
+def decode_malformed():
+    return lambda: security.decode_access_token("not.a.jwt")
+
+
+# --- Schema validation ---
+
+@case("schema.CSVIngestionRow")
+def validate_csv_row():
+    rows = cycle([
+        {
+            "handle": f"creator{i}",
+            "platform": ("instagram", "youtube", "linkedin")[i % 3],
+            "followers": str(1000 + i * 37),
+            "url": f"https://instagram.com/creator{i}",
+            "niche_tags": "fitness, travel, food",
+        }
+        for i in range(CORPUS_SIZE)
+    ])
+    return lambda: CSVIngestionRow.model_validate(next(rows))
+
+
+@case("schema.InfluencerCreate")
+def validate_influencer_create():
+    bios = make_bios(AIEngine.CATEGORY_KEYWORDS, CORPUS_SIZE)
+    payloads = cycle([
+        {"username": f"creator{i}", "bio": bio[:500], "niche": ["Fitness", "Travel"], "wallet_address": WALLET}
+        for i, bio in enumerate(bios)
+    ])
+    return lambda: InfluencerCreate.model_validate(next(payloads))
+
+
+# --- /users endpoints ---
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def scalar_one_or_none(self):
+        return self.row
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    """
+    Stands in for the database: every statement returns `row`, commits are no-ops.
+    Statements are still compiled by SQLAlchemy as they would be against Postgres.
+    """
+
+    dialect = postgresql.dialect()
+
+    def __init__(self, row):
+        self.row = row
+
+    async def execute(self, statement):
+        statement.compile(dialect=self.dialect)
+        return FakeResult(self.row)
+
+    async def commit(self):
+        pass
+
+
+def endpoint_case(method: str, path: str, row, json: dict = None, conditional: bool = False, cached: bool = True):
+    """
+    One request per op through the full app (middleware, routing, auth dependency with
+    a real JWT, validation, serialization) with `get_async_db` overridden.
+    `conditional` sends back the last ETag, as a polling client does.
+    `cached=False` empties the user's profile cache before each request.
+    """
+    def factory():
+        session = FakeSession(row)
+
+        async def get_session():
+            # Async like the real dependency: a sync override would add a threadpool hop
+            yield session
+        app.dependency_overrides[get_async_db] = get_session
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+        headers = {"Authorization": f"Bearer {make_token()}"}
+
+        async def op():
+            if not cached:
+                profile_cache.invalidate(USER_ID)
+            response = await client.request(method, path, headers=headers, json=json)
+            assert response.status_code in ((200, 304) if conditional else (200,)), response.text
+            if conditional:
+                headers["If-None-Match"] = response.headers["etag"]
+        return op
+    return factory
+
+
+case("api.GET /users/me")(endpoint_case(
+    "GET", "/api/v1/users/me",
+    User(id=uuid.UUID(USER_ID), email="bench@example.com", role=UserRole.BRAND,
+         created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+))
+case("api.GET /users/me[uncached]")(endpoint_case(
+    "GET", "/api/v1/users/me",
+    User(id=uuid.UUID(USER_ID), email="bench@example.com", role=UserRole.BRAND,
+         created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    cached=False
+))
+case("api.GET /users/me[304]")(endpoint_case(
+    "GET", "/api/v1/users/me",
+    User(id=uuid.UUID(USER_ID), email="bench@example.com", role=UserRole.BRAND,
+         created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)),
+    conditional=True
+))
+case("api.POST /users/onboard/brand")(endpoint_case(
+    "POST", "/api/v1/users/onboard/brand",
+    Brand(user_id=uuid.UUID(USER_ID), company_name="Acme", industry="tech", website=None, verified=False),
+    json={"company_name": "Acme", "industry": "tech", "website": "https://acme.example.com"}
+))
+case("api.POST /users/onboard/influencer")(endpoint_case(
+    "POST", "/api/v1/users/onboard/influencer",
+    Influencer(user_id=uuid.UUID(USER_ID), username="creator", bio="Gym and travel", niche=["Fitness"],
+               wallet_address=WALLET),
+    json={"username": "creator", "bio": "Gym and travel", "niche": ["Fitness"], "wallet_address": WALLET}
+))
+
+
+def run(names: List[str], min_time: float):
+    results = []
+    try:
+        for name in names:
+            results.append(run_case(name, CASES[name](), min_time))
+    finally:
+        app.dependency_overrides.clear()
+    return results
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed relative slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds measured per round")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if args.filter in name]
+    baselines = load_baselines(args.baseline)
+    results = run(names, args.min_time)
+    print(format_table(results, baselines))
+
+    if args.save:
+        save_baselines(args.baseline, results, baselines)
+        print(f"\nSaved {len(results)} baselines to {args.baseline}")
+        return 0
+
+    regressions = find_regressions(results, baselines, args.threshold)
+    for r in regressions:
+        print(f"REGRESSION {r.name}: {r.metric} {r.baseline:,.1f} -> {r.current:,.1f} ({r.change:+.0%} worse)")
+    if regressions:
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import uuid
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.database import engine, get_async_db
+from app.main import app
+from app.models.user import Influencer, User, metric_value
+from app.schemas.discovery import DiscoverySort, InfluencerSearch
+from app.services.discovery.search import build_search_query, decode_cursor, encode_cursor
+
+BRAND_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+N_INFLUENCERS = 20000
+
+
+def compiled(search: InfluencerSearch) -> str:
+    return str(build_search_query(search).compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    user_id = uuid.uuid4()
+    cursor = encode_cursor(DiscoverySort.FOLLOWERS, 12000, user_id)
+    value, decoded_id = decode_cursor(cursor, DiscoverySort.FOLLOWERS)
+    assert value == 12000 and decoded_id == user_id
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, DiscoverySort.ENGAGEMENT_RATE)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", DiscoverySort.FOLLOWERS)
+
+
+def test_filters_compile_to_indexed_expressions():
+    sql = compiled(InfluencerSearch(
+        niche=["tech"], min_followers=10000,
+        cursor=encode_cursor(DiscoverySort.FOLLOWERS, 50000, uuid.uuid4())
+    ))
+    followers = str(metric_value("followers").compile(dialect=postgresql.dialect()))
+    assert "'followers'" in followers  # inlined, not a bound parameter
+    assert "influencers.niche @> %(niche_1)s::JSONB" in sql
+    assert f"{followers} >= %(param_1)s" in sql
+    # Seek, not OFFSET
+    assert "OFFSET" not in sql
+    assert f"({followers}, influencers.user_id) < " in sql
+    assert f"ORDER BY {followers} DESC, influencers.user_id DESC" in sql
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return FakeResult(self.rows[:statement._limit])
+
+
+@pytest.fixture
+def fake_db():
+    rows = [
+        (Influencer(user_id=uuid.uuid4(), username=f"creator{i}", niche=["tech"], metrics={"followers": 1000 - i}), 1000 - i)
+        for i in range(5)
+    ]
+    session = FakeSession(rows)
+    app.dependency_overrides[get_async_db] = lambda: session
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=BRAND_ID, role="brand")
+    yield session
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.anyio
+async def test_search_pages_with_cursor(client, fake_db):
+    response = await client.get("/api/v1/discovery/influencers", params={"niche": "tech", "limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["username"] for item in body["items"]] == ["creator0", "creator1"]
+    value, user_id = decode_cursor(body["next_cursor"], DiscoverySort.FOLLOWERS)
+    assert value == 999 and str(user_id) == body["items"][1]["user_id"]
+
+    fake_db.rows = fake_db.rows[:1]
+    last = (await client.get("/api/v1/discovery/influencers", params={"cursor": body["next_cursor"]})).json()
+    assert last["next_cursor"] is None
+
+
+@pytest.mark.anyio
+async def test_search_rejects_bad_input(client, fake_db):
+    bad_cursor = await client.get("/api/v1/discovery/influencers", params={"cursor": "garbage"})
+    assert bad_cursor.status_code == 400
+    bad_range = await client.get("/api/v1/discovery/influencers", params={"min_followers": 10, "max_followers": 5})
+    assert bad_range.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_search_is_brand_only(client):
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=BRAND_ID, role="influencer")
+    try:
+        response = await client.get("/api/v1/discovery/influencers")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 403
+
+
+@pytest.fixture(scope="module")
+def seeded_db():
+    """
+    Influencers table with the model's indexes and N_INFLUENCERS rows, inside a
+    transaction that is rolled back afterwards. Skips when Postgres isn't reachable.
+    """
+    try:
+        conn = engine.connect()
+    except OperationalError:
+        pytest.skip("Postgres not reachable")
+    trans = conn.begin()
+    try:
+        User.__table__.create(conn, checkfirst=True)
+        Influencer.__table__.create(conn, checkfirst=True)
+        for index in Influencer.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        conn.execute(text("""
+            INSERT INTO users (id, email, role)
+            SELECT md5('discovery' || i)::uuid, 'discovery' || i || '@example.com', 'influencer'
+            FROM generate_series(1, :n) AS i
+        """), {"n": N_INFLUENCERS})
+        # 'rare' on 0.5% of rows; a few rows with a non-numeric follower count
+        conn.execute(text("""
+            INSERT INTO influencers (user_id, username, niche, metrics)
+            SELECT md5('discovery' || i)::uuid, 'creator' || i,
+                   CASE WHEN i % 200 = 0 THEN '["rare", "tech"]'::jsonb
+                        ELSE jsonb_build_array((ARRAY['tech', 'beauty', 'travel', 'food'])[i % 4 + 1]) END,
+                   CASE WHEN i % 1000 = 0 THEN '{"followers": "n/a"}'::jsonb
+                        ELSE jsonb_build_object('followers', (i * 7919) % 2000000,
+                                                'engagement_rate', ((i * 31) % 1000) / 10000.0) END
+            FROM generate_series(1, :n) AS i
+        """), {"n": N_INFLUENCERS})
+        conn.execute(text("ANALYZE users, influencers"))
+        yield conn
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+def explain(conn, search: InfluencerSearch) -> str:
+    # Run the query exactly as compiled (bound parameters included), prefixed with EXPLAIN
+    def prepend_explain(conn, cursor, statement, parameters, context, executemany):
+        return "EXPLAIN " + statement, parameters
+
+    event.listen(conn, "before_cursor_execute", prepend_explain, retval=True)
+    try:
+        result = conn.execute(build_search_query(search))
+        return "\n".join(row[0] for row in result.cursor.fetchall())
+    finally:
+        event.remove(conn, "before_cursor_execute", prepend_explain)
+
+
+def row_at(conn, position: int):
+    # (followers, user_id) of the row a keyset walk would stop at after `position` rows
+    return conn.execute(text("""
+        SELECT (metrics->>'followers')::numeric, user_id FROM influencers
+        WHERE jsonb_typeof(metrics->'followers') = 'number'
+        ORDER BY 1 DESC, 2 DESC OFFSET :position LIMIT 1
+    """), {"position": position - 1}).one()
+
+
+def test_explain_deep_page_seeks_the_followers_index(seeded_db):
+    value, user_id = row_at(seeded_db, 20 * 499)
+    cursor = encode_cursor(DiscoverySort.FOLLOWERS, value, user_id)
+    for search in (InfluencerSearch(), InfluencerSearch(cursor=cursor)):
+        plan = explain(seeded_db, search)
+        assert "Index Scan Backward using idx_influencers_followers" in plan, plan
+        assert "Sort" not in plan and "Seq Scan" not in plan, plan
+
+
+def test_explain_selective_niche_uses_gin(seeded_db):
+    plan = explain(seeded_db, InfluencerSearch(niche=["rare"]))
+    assert "Bitmap Index Scan on idx_influencers_niche" in plan, plan
+
+
+def test_explain_engagement_range_uses_its_index(seeded_db):
+    plan = explain(seeded_db, InfluencerSearch(
+        sort=DiscoverySort.ENGAGEMENT_RATE, min_engagement=0.02, max_engagement=0.03
+    ))
+    assert "idx_influencers_engagement" in plan, plan
+    assert "Seq Scan" not in plan, plan
+
+    # Broad follower band: walk the engagement index in order rather than sort the band
+    plan = explain(seeded_db, InfluencerSearch(sort=DiscoverySort.ENGAGEMENT_RATE, min_followers=100000))
+    assert "Index Scan Backward using idx_influencers_engagement" in plan, plan
+    assert "Sort" not in plan, plan
+
+
+def test_keyset_pages_match_offset_pages(seeded_db):
+    search = InfluencerSearch(limit=50)
+    seen = []
+    db = Session(bind=seeded_db)
+    for _ in range(3):
+        rows = db.execute(build_search_query(search)).all()
+        seen += [influencer.user_id for influencer, _ in rows[:search.limit]]
+        last_id, last_value = rows[search.limit - 1][0].user_id, rows[search.limit - 1][1]
+        search = InfluencerSearch(limit=50, cursor=encode_cursor(DiscoverySort.FOLLOWERS, last_value, last_id))
+    expected = seeded_db.execute(text("""
+        SELECT user_id FROM influencers WHERE jsonb_typeof(metrics->'followers') = 'number'
+        ORDER BY (metrics->>'followers')::numeric DESC, user_id DESC LIMIT 150
+    """)).scalars().all()
+    assert seen == expected
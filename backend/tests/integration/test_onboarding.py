@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.api import deps
+from app.core.database import get_async_db
+from app.main import app
+from app.models.user import Brand, Influencer
+from app.services.ai.engine import ai_engine
+from app.services.ai.enrichment import content_hash
+
+USER_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def scalar_one_or_none(self):
+        return self.row
+
+class FakeSession:
+    """Records statements; returns `row` for the INSERT ... RETURNING."""
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.params = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append(str(compiled))
+        self.params.append(compiled.params)
+        return FakeResult(self.row)
+
+    async def commit(self):
+        self.commits += 1
+
+@pytest.fixture
+def fake_db():
+    session = FakeSession(None)
+    app.dependency_overrides[get_async_db] = lambda: session
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=USER_ID, role="brand")
+    yield session
+    app.dependency_overrides.clear()
+
+BRAND_IN = {"company_name": "Acme", "industry": "tech"}
+
+@pytest.mark.anyio
+async def test_onboard_brand_single_statement(client, fake_db):
+    fake_db.row = Brand(user_id=USER_ID, company_name="Acme", industry="tech", website=None, verified=False)
+    response = await client.post("/api/v1/users/onboard/brand", json=BRAND_IN)
+
+    assert response.status_code == 200
+    assert response.json()["company_name"] == "Acme"
+    assert len(fake_db.statements) == 1 and fake_db.commits == 1
+    assert "ON CONFLICT (user_id) DO NOTHING RETURNING" in fake_db.statements[0]
+
+@pytest.mark.anyio
+async def test_onboard_brand_conflict_is_400(client, fake_db):
+    response = await client.post("/api/v1/users/onboard/brand", json=BRAND_IN)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Brand profile already exists"
+    assert fake_db.commits == 0
+
+@pytest.mark.anyio
+async def test_onboard_influencer_conflict_is_400(client, fake_db):
+    response = await client.post("/api/v1/users/onboard/influencer", json={"username": "creator"})
+
+    assert response.status_code == 400
+    assert len(fake_db.statements) == 1
+
+@pytest.mark.anyio
+async def test_onboard_influencer_enriches_niche_from_bio(client, fake_db):
+    bio = "Gym and protein every day"
+    fake_db.row = Influencer(user_id=USER_ID, username="lifter", bio=bio, niche=["Fitness"])
+    response = await client.post("/api/v1/users/onboard/influencer", json={"username": "lifter", "bio": bio})
+
+    assert response.status_code == 200
+    params = fake_db.params[0]
+    assert params["niche"] == ["Fitness"]
+    assert params["bio_hash"] == content_hash(bio)
+    assert params["taxonomy_version"] == ai_engine.taxonomy_version
+
+    # No bio: nothing to derive from, the submitted niche is kept
+    await client.post("/api/v1/users/onboard/influencer", json={"username": "lifter", "niche": ["Cooking"]})
+    assert fake_db.params[1]["niche"] == ["Cooking"] and fake_db.params[1]["bio_hash"] is None
+
+@pytest.mark.anyio
+async def test_onboard_influencer_keeps_submitted_niche(client, fake_db):
+    fake_db.row = Influencer(user_id=USER_ID, username="priya", niche=["Travel"])
+    # No taxonomy keyword in the bio: deriving would have stored []
+    await client.post("/api/v1/users/onboard/influencer", json={
+        "username": "priya", "bio": "Hi, I am Priya from Mumbai", "niche": ["Travel"]
+    })
+    params = fake_db.params[0]
+    assert params["niche"] == ["Travel"]
+    # Never picked up by taxonomy backfills, which only select enriched profiles
+    assert params["bio_hash"] is None and params["taxonomy_version"] is None
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path, body", [
+    ("/api/v1/users/onboard/brand", BRAND_IN),
+    ("/api/v1/users/onboard/influencer", {"username": "creator"}),
+])
+async def test_onboard_rejects_non_uuid_subject(client, fake_db, path, body):
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id="service-account", role="brand")
+    response = await client.post(path, json=body)
+
+    assert response.status_code == 401
+    assert fake_db.statements == []
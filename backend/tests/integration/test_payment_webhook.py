@@ -0,0 +1,127 @@
+import hashlib
+import hmac
+import json
+import uuid
+import pytest
+from app.api.v1.endpoints import payments
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.payment.webhooks import WebhookProcessor
+
+SECRET = "whsec_test"
+TRANSACTION_ID = str(uuid.uuid4())
+CAMPAIGN_ID = str(uuid.uuid4())
+
+
+def make_webhook(payment_id="pay_1", event="payment.captured"):
+    body = json.dumps({
+        "entity": "event",
+        "event": event,
+        "payload": {"payment": {"entity": {
+            "id": payment_id,
+            "order_id": "order_1",
+            "amount": 50000,
+            "notes": {"transaction_id": TRANSACTION_ID, "campaign_id": CAMPAIGN_ID},
+        }}},
+    }).encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return body, signature
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    batches = []
+
+    async def apply_batch(events):
+        batches.append(events)
+
+    monkeypatch.setattr(settings, "RAZORPAY_WEBHOOK_SECRET", SECRET)
+    processor = WebhookProcessor(apply_batch, workers=2, batch_size=50, queue_size=100)
+    processor.batches = batches
+    monkeypatch.setattr(payments, "webhook_processor", processor)
+    return processor
+
+
+async def post(client, body, signature, event_id="evt_1"):
+    return await client.post(
+        "/api/v1/payment/webhook",
+        content=body,
+        headers={"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": event_id},
+    )
+
+
+@pytest.mark.anyio
+async def test_rejects_bad_signature(client, processor):
+    body, _ = make_webhook()
+    response = await post(client, body, "0" * 64)
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_fails_closed_without_secret(client, processor, monkeypatch):
+    monkeypatch.setattr(settings, "RAZORPAY_WEBHOOK_SECRET", None)
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_SECRET", None)
+    body, signature = make_webhook()
+
+    response = await post(client, body, signature)
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Webhook secret not configured"
+    assert processor.seen.get("evt_1") is None
+
+    # Explicit dev opt-in only
+    monkeypatch.setattr(settings, "RAZORPAY_WEBHOOK_ALLOW_UNSIGNED", True)
+    assert (await post(client, body, "")).json() == {"status": "queued"}
+
+
+@pytest.mark.anyio
+async def test_queues_once_and_drops_duplicates(client, processor):
+    body, signature = make_webhook()
+    first = await post(client, body, signature)
+    retry = await post(client, body, signature)
+    await processor.close()
+
+    assert first.json() == {"status": "queued"}
+    assert retry.json() == {"status": "duplicate"}
+    events = [event for batch in processor.batches for event in batch]
+    assert len(events) == 1
+    assert str(events[0].transaction_id) == TRANSACTION_ID
+    assert events[0].payment_id == "pay_1"
+
+
+@pytest.mark.anyio
+async def test_burst_is_applied_in_batches(client, processor):
+    for i in range(60):
+        body, signature = make_webhook(payment_id=f"pay_{i}")
+        assert (await post(client, body, signature, event_id=f"evt_{i}")).status_code == 200
+    await processor.close()
+
+    assert sum(len(batch) for batch in processor.batches) == 60
+    assert len(processor.batches) < 60
+
+
+@pytest.mark.anyio
+async def test_ignores_unhandled_events(client, processor):
+    body = json.dumps({"event": "order.paid", "payload": {}}).encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    response = await post(client, body, signature)
+    assert response.json() == {"status": "ignored"}
+
+
+@pytest.mark.anyio
+async def test_full_queue_asks_for_retry(client, processor):
+    processor.queue_size = 1
+    processor.workers = 0
+    body, signature = make_webhook()
+    assert (await post(client, body, signature, event_id="evt_a")).status_code == 200
+    assert (await post(client, body, signature, event_id="evt_b")).status_code == 503
+    # Forgotten again, so Razorpay's retry isn't mistaken for a duplicate
+    assert processor.seen.get("evt_b") is None
+
+
+def test_cache_add_is_set_if_absent():
+    cache = LRUCache(max_entries=2)
+    assert cache.add("a") is True
+    assert cache.add("a") is False
+    cache.add("b")
+    cache.add("c")
+    assert cache.add("a") is True
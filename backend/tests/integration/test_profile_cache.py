@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+from uuid import UUID
+import pytest
+from app.api import deps
+from app.api.v1.endpoints import users
+from app.core import http_cache
+from app.core.database import get_async_db
+from app.core.http_cache import ProfileCache, cached_response
+from app.main import app
+from app.models.user import User
+
+USER_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+UPDATED_AT = datetime(2024, 3, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    """Serves the user for SELECTs; counts them."""
+    def __init__(self):
+        self.user = User(
+            id=UUID(USER_ID), email="brand@example.com", role="brand",
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=UPDATED_AT
+        )
+        self.selects = 0
+
+    async def execute(self, statement):
+        self.selects += 1
+        return FakeResult(self.user)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(users, "profile_cache", ProfileCache(ttl=30, max_entries=100))
+    app.dependency_overrides[get_async_db] = lambda: fake
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=USER_ID, role="brand")
+    yield fake
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.anyio
+async def test_repeat_reads_are_cached_and_conditional(client, session):
+    hits = http_cache.PROFILE_CACHE_LOOKUPS.value(users.ME, "hit")
+    not_modified = http_cache.NOT_MODIFIED.value(users.ME)
+
+    first = await client.get("/api/v1/users/me")
+    assert first.status_code == 200
+    assert first.json()["email"] == "brand@example.com"
+    assert first.headers["last-modified"] == "Fri, 01 Mar 2024 12:30:15 GMT"
+    assert first.headers["cache-control"] == "private, no-cache"
+    etag = first.headers["etag"]
+    assert etag.startswith('"')
+
+    second = await client.get("/api/v1/users/me")
+    assert second.content == first.content and second.headers["etag"] == etag
+    assert session.selects == 1
+    assert http_cache.PROFILE_CACHE_LOOKUPS.value(users.ME, "hit") == hits + 1
+    assert 0 < http_cache.PROFILE_CACHE_HIT_RATIO.value(users.ME) <= 1
+
+    unchanged = await client.get("/api/v1/users/me", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert (await client.get("/api/v1/users/me", headers={"If-None-Match": f'W/{etag}'})).status_code == 304
+    assert (await client.get("/api/v1/users/me", headers={"If-None-Match": '"stale"'})).status_code == 200
+
+    # Last-Modified can't see writes that skip the ORM's onupdate, so it never yields a 304
+    since = {"If-Modified-Since": first.headers["last-modified"]}
+    assert (await client.get("/api/v1/users/me", headers=since)).status_code == 200
+    assert http_cache.NOT_MODIFIED.value(users.ME) == not_modified + 2
+    assert session.selects == 1
+
+
+@pytest.mark.anyio
+async def test_etag_tracks_changes_made_outside_the_orm(client, session):
+    etag = (await client.get("/api/v1/users/me")).headers["etag"]
+
+    # e.g. an UPDATE through Supabase or SQL: `updated_at` stays the same
+    session.user.email = "renamed@example.com"
+    users.profile_cache.invalidate(USER_ID)  # as when the entry expires
+    response = await client.get("/api/v1/users/me", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    assert response.json()["email"] == "renamed@example.com"
+    assert response.headers["last-modified"] == "Fri, 01 Mar 2024 12:30:15 GMT"
+    assert session.selects == 2
+
+
+def test_read_racing_a_write_is_not_cached():
+    cache = ProfileCache(ttl=30, max_entries=10)
+    entry = cached_response(b"{}", UPDATED_AT)
+
+    version = cache.version(USER_ID)
+    cache.invalidate(USER_ID)  # write committed while the old row was being read
+    cache.set(USER_ID, "users.me", entry, version)
+    assert cache.get(USER_ID, "users.me") is None
+
+    cache.set(USER_ID, "users.me", entry, cache.version(USER_ID))
+    assert cache.get(USER_ID, "users.me") == entry
@@ -0,0 +1,187 @@
+import contextvars
+from datetime import datetime, timezone
+from uuid import UUID
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, select
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.api.v1.endpoints import users
+from app.core import cache, replicas
+from app.core.config import settings
+from app.core.database import get_async_db, read_router
+from app.core.http_cache import ProfileCache
+from app.core.replicas import PIN_COOKIE, ReplicaRouter
+from app.main import app
+from app.models.user import Brand, User
+
+USER_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def scalar_one_or_none(self):
+        return self.row
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    """
+    Session bound to a named fake engine; the returned user's email says which engine served the query.
+    """
+    def __init__(self, bind):
+        self.bind = bind
+        self.closed = False
+
+    async def execute(self, statement):
+        if getattr(statement, "is_insert", False):
+            return FakeResult(Brand(user_id=UUID(USER_ID), company_name="Acme", industry="tech", verified=False))
+        return FakeResult(User(
+            id=UUID(USER_ID), email=f"{self.bind}@example.com", role="brand",
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+        ))
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def routed(monkeypatch):
+    router = ReplicaRouter(["replica-a", "replica-b"], sticky_window=5)
+    sessions = []
+
+    def session_factory(bind):
+        sessions.append(FakeSession(bind))
+        return sessions[-1]
+
+    monkeypatch.setattr(deps, "read_router", router)
+    monkeypatch.setattr(deps, "AsyncSessionLocal", session_factory)
+    # Every read must reach a session
+    monkeypatch.setattr(users, "profile_cache", ProfileCache(ttl=0, max_entries=1))
+    app.dependency_overrides[get_async_db] = lambda: FakeSession("primary")
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=USER_ID, role="brand")
+    yield router, sessions
+    app.dependency_overrides.clear()
+
+
+async def served_by(client):
+    response = await client.get("/api/v1/users/me")
+    assert response.status_code == 200
+    return response.json()["email"].split("@")[0]
+
+
+@pytest.mark.anyio
+async def test_reads_balance_across_replicas_until_user_writes(client, routed, monkeypatch):
+    router, sessions = routed
+    assert [await served_by(client) for _ in range(4)] == ["replica-a", "replica-b", "replica-a", "replica-b"]
+    assert all(s.closed for s in sessions)
+
+    router.mark_written(USER_ID)
+    assert await served_by(client) == "primary"
+    # Other users keep reading from replicas
+    assert router.read_engine("someone-else") == "replica-a"
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 6)
+    assert await served_by(client) == "replica-b"
+
+
+@pytest.mark.anyio
+async def test_without_replicas_reads_use_primary_session(client, routed, monkeypatch):
+    monkeypatch.setattr(deps, "read_router", ReplicaRouter([], sticky_window=5))
+    assert await served_by(client) == "primary"
+    assert routed[1] == []
+
+
+def test_committed_writes_pin_the_request_user(monkeypatch):
+    monkeypatch.setattr(read_router, "replicas", ["replica-a"])
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    items = Table("items", metadata, Column("id", Integer, primary_key=True))
+    metadata.create_all(engine)
+
+    def request(user_id, statement, commit=True):
+        # Each request runs in its own context, as under the ASGI server
+        def run():
+            replicas.set_request_user(user_id)
+            with Session(engine) as session:
+                session.execute(statement)
+                session.commit() if commit else session.rollback()
+        contextvars.copy_context().run(run)
+
+    try:
+        request("reader", select(items))
+        request("rolled-back", insert(items).values(id=1), commit=False)
+        request("writer", insert(items).values(id=2))
+        assert read_router.read_engine("reader") == "replica-a"
+        assert read_router.read_engine("rolled-back") == "replica-a"
+        assert read_router.read_engine("writer") is None
+    finally:
+        read_router._recent_writers.clear()
+
+
+class CommittingSession(FakeSession):
+    """
+    Primary session whose commit runs a real write transaction, so the session events fire.
+    """
+    def __init__(self, engine, table):
+        super().__init__("primary")
+        self.engine, self.table = engine, table
+
+    async def commit(self):
+        with Session(self.engine) as session:
+            session.execute(insert(self.table))
+            session.commit()
+
+
+@pytest.mark.anyio
+async def test_write_pin_follows_the_client_to_other_workers(client, routed, monkeypatch):
+    monkeypatch.setattr(read_router, "replicas", ["replica-a"])
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    items = Table("items", metadata, Column("id", Integer, primary_key=True))
+    metadata.create_all(engine)
+    app.dependency_overrides[get_async_db] = lambda: CommittingSession(engine, items)
+
+    async def writer():
+        # As get_current_user does, so the commit is attributed to the user
+        replicas.set_request_user(USER_ID)
+        return deps.TokenData(id=USER_ID, role="brand")
+    app.dependency_overrides[deps.get_current_user] = writer
+
+    try:
+        response = await client.post("/api/v1/users/onboard/brand", json={"company_name": "Acme", "industry": "tech"})
+        assert response.status_code == 200
+        pin = response.cookies[PIN_COOKIE]
+        assert "Max-Age=5" in response.headers["set-cookie"]
+    finally:
+        read_router._recent_writers.clear()
+    client.cookies.clear()
+
+    # The next read lands on a worker that never saw the write (`routed` has a fresh router)
+    async def read(cookie):
+        client.cookies.clear()
+        if cookie:
+            client.cookies.set(PIN_COOKIE, cookie)
+        try:
+            return await served_by(client)
+        finally:
+            client.cookies.clear()
+
+    assert await read(pin) == "primary"
+    assert await read(None) == "replica-a"
+    user, stamp, signature = pin.split(":")
+    assert await read(f"{user}:{float(stamp) + 60}:{signature}") == "replica-b"  # forged time
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id="someone-else", role="brand")
+    assert await read(pin) == "replica-a"  # another user's pin
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + settings.READ_AFTER_WRITE_WINDOW + 1)
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=USER_ID, role="brand")
+    assert await read(pin) == "replica-b"
@@ -0,0 +1,52 @@
+import time
+import pytest
+from jose import jwt
+from app.core import security
+from app.core.config import settings
+
+def make_token(exp_in: int = 3600, **claims) -> str:
+    payload = {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + exp_in, **claims}
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm=security.ALGORITHM)
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    security._token_cache.clear()
+    yield
+    security._token_cache.clear()
+
+class TestVerifiedTokenCache:
+    def test_repeat_token_skips_verification(self, monkeypatch):
+        token = make_token()
+        assert security.decode_access_token(token)["sub"] == "user-1"
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("signature re-verified on a cache hit")
+        monkeypatch.setattr(security.jwt, "decode", fail_decode)
+
+        assert security.decode_access_token(token)["sub"] == "user-1"
+        stats = security.token_cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_invalid_token_is_not_cached(self):
+        bad = jwt.encode({"sub": "x", "aud": "authenticated"}, "wrong-secret", algorithm=security.ALGORITHM)
+        assert security.decode_access_token(bad) is None
+        assert security.decode_access_token(bad) is None
+        assert security.token_cache_stats()["size"] == 0
+
+    def test_entry_expires_with_token(self, monkeypatch):
+        token = make_token(exp_in=60)
+        assert security.decode_access_token(token) is not None
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 120)
+        calls = []
+        monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: calls.append(1) or {"sub": "user-1"})
+        # Past its `exp` the cached entry is dropped and the token is verified again
+        security.decode_access_token(token)
+        assert calls == [1]
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(security._token_cache, "max_entries", 2)
+        for i in range(3):
+            security.decode_access_token(make_token(sub=f"user-{i}"))
+        assert security.token_cache_stats()["size"] == 2
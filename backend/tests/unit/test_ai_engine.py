@@ -1,5 +1,11 @@
+import re
+from collections import Counter
+
 import pytest
-from app.services.ai.engine import ai_engine
+from app.services.ai import engine as engine_module
+from app.services.ai.engine import AIEngine, ai_engine
+from app.services.ai.brands import get_brand_matcher
+from app.services.ai.taxonomy import TaxonomyMatcher
 
 class TestAIEngine:
     def test_fitness_categorization(self):
@@ -23,3 +29,102 @@ class TestAIEngine:
         text = "This is the worst scam ever. Hate it."
         score = ai_engine.analyze_sentiment_rule_based(text)
         assert score < -0.3
+
+class TestTaxonomyMatcher:
+    def _legacy(self, bio, taxonomy):
+        # Original per-keyword regex loop the compiled matcher must reproduce
+        bio_lower = bio.lower()
+        scores = Counter()
+        for category, keywords in taxonomy.items():
+            for word in keywords:
+                if re.search(r'\b' + re.escape(word) + r'\b', bio_lower):
+                    scores[category] += 1
+        return [cat for cat, score in scores.most_common() if score > 0]
+
+    def test_matches_legacy_on_default_taxonomy(self):
+        bios = [
+            "Gym rat, yoga teacher & foodie. Travel + adventure!",
+            "AI developer writing code about crypto. gyms_and_code",
+            "Skincare/makeup/style — cooking recipes on weekends",
+            "Protein-packed recipe ideas for your next trip",
+            "",
+        ]
+        for bio in bios:
+            assert ai_engine.categorize_bio(bio) == self._legacy(bio, AIEngine.CATEGORY_KEYWORDS)
+
+    def test_ties_keep_taxonomy_order(self):
+        taxonomy = {"B": ["beta"], "A": ["alpha"], "C": ["gamma", "delta"]}
+        matcher = TaxonomyMatcher(taxonomy)
+        assert matcher.categorize("alpha beta gamma delta") == ["C", "B", "A"]
+
+    def test_phrase_and_punctuation_keywords(self):
+        taxonomy = {"Dev": ["c++", "machine learning"], "Misc": ["learning"]}
+        matcher = TaxonomyMatcher(taxonomy)
+        for bio in ["Machine Learning in C++", "deep learning", "c++11 fan"]:
+            assert matcher.categorize(bio) == self._legacy(bio, taxonomy)
+
+    def test_reassigned_taxonomy_is_recompiled(self):
+        engine = AIEngine()
+        engine.CATEGORY_KEYWORDS = {"Gaming": ["esports"]}
+        assert engine.categorize_bio("Pro esports player") == ["Gaming"]
+
+class TestBatchEnrichment:
+    BIOS = [
+        "Gym and protein every day",
+        "Travel vlogger, hotel reviews",
+        "",
+        "Makeup artist who also loves cooking",
+        "I hate this scam",
+    ]
+
+    def test_small_batch_runs_in_process(self):
+        assert list(ai_engine.categorize_many(self.BIOS)) == [ai_engine.categorize_bio(b) for b in self.BIOS]
+        assert list(ai_engine.analyze_many(self.BIOS)) == [ai_engine.analyze_sentiment_rule_based(b) for b in self.BIOS]
+
+    def test_process_pool_preserves_order(self, monkeypatch):
+        monkeypatch.setattr(engine_module, "PARALLEL_THRESHOLD", 10)
+        bios = self.BIOS * 20
+        results = list(ai_engine.categorize_many(bios, workers=2, chunk_size=7))
+        assert results == [ai_engine.categorize_bio(b) for b in bios]
+
+    def test_workers_use_instance_taxonomy(self, monkeypatch):
+        monkeypatch.setattr(engine_module, "PARALLEL_THRESHOLD", 2)
+        engine = AIEngine()
+        engine.CATEGORY_KEYWORDS = {"Gaming": ["esports"]}
+        results = list(engine.categorize_many(["esports", "gym", "esports"], workers=2, chunk_size=1))
+        assert results == [["Gaming"], [], ["Gaming"]]
+
+    def test_workers_below_one_are_rejected(self, monkeypatch):
+        with pytest.raises(ValueError):
+            ai_engine.categorize_many(self.BIOS, workers=0)
+        with pytest.raises(ValueError):
+            ai_engine.analyze_many(self.BIOS, workers=-2)
+        # None still means one worker per CPU
+        monkeypatch.setattr(engine_module.os, "cpu_count", lambda: None)
+        assert list(ai_engine.categorize_many(self.BIOS)) == [ai_engine.categorize_bio(b) for b in self.BIOS]
+
+class TestBrandMentions:
+    BRANDS = ["Nike", "Under Armour", "H&M", "Apple", "nike", "Pineapple Co"]
+
+    def _legacy(self, text, brands):
+        text_lower = text.lower()
+        return [b for b in brands if re.search(r'\b' + re.escape(b.lower()) + r'\b', text_lower)]
+
+    def test_matches_legacy_output(self):
+        texts = [
+            "Wearing NIKE and Under Armour today, not H&M",
+            "Pineapple smoothie, no Apple products",
+            "nikes are not nike_x",
+            "Pineapple Co. collab!",
+            "",
+        ]
+        for text in texts:
+            assert ai_engine.detect_brand_mentions(text, self.BRANDS) == (self._legacy(text, self.BRANDS) if text else [])
+
+    def test_locate_reports_offsets_and_counts(self):
+        located = ai_engine.locate_brand_mentions("Nike shoes, nike socks", ["Nike", "Adidas"])
+        assert located == {"Nike": {"count": 2, "offsets": [(0, 4), (12, 16)]}}
+
+    def test_matcher_is_cached_per_brand_list(self):
+        assert get_brand_matcher(list(self.BRANDS)) is get_brand_matcher(list(self.BRANDS))
+        assert get_brand_matcher(self.BRANDS) is not get_brand_matcher(self.BRANDS[::-1])
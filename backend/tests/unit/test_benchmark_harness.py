@@ -0,0 +1,33 @@
+import asyncio
+from benchmarks.harness import Result, find_regressions, load_baselines, run_case, save_baselines
+
+
+def test_run_case_sync_and_async():
+    async def op():
+        await asyncio.sleep(0)
+
+    for fn in (lambda: sum(range(10)), op):
+        result = run_case("case", fn, min_time=0.01, rounds=2)
+        assert result.ops_per_sec > 0
+        assert 0 < result.p50_us <= result.p99_us
+
+
+def test_baselines_round_trip_and_regressions(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    assert load_baselines(path) == {}
+
+    save_baselines(path, [Result("a", 1000.0, 10.0, 20.0), Result("b", 500.0, 20.0, 40.0)])
+    # Re-saving a subset keeps the other cases
+    save_baselines(path, [Result("b", 400.0, 25.0, 50.0)], load_baselines(path))
+    baselines = load_baselines(path)
+    assert baselines["a"]["ops_per_sec"] == 1000.0 and baselines["b"]["ops_per_sec"] == 400.0
+
+    current = [
+        Result("a", 800.0, 12.0, 90.0),   # 20% slower: within threshold, p99 is not gated
+        Result("b", 200.0, 26.0, 50.0),   # throughput halved
+        Result("new", 1.0, 1e6, 1e6),     # no baseline yet
+    ]
+    regressions = find_regressions(current, baselines, threshold=0.25)
+    assert [(r.name, r.metric) for r in regressions] == [("b", "ops_per_sec")]
+    assert regressions[0].change == 0.5
+    assert find_regressions(current, baselines, threshold=0.1)[0].name == "a"
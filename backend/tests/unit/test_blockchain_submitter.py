@@ -0,0 +1,197 @@
+import pytest
+from web3 import Web3
+from app.services.blockchain.nonce import NonceManager, is_already_known, is_nonce_error
+from app.services.blockchain.service import BlockchainService
+from app.services.blockchain.submitter import TransactionSubmitter
+
+ESCROW = "0x000000000000000000000000000000000000dEaD"
+
+
+class FakeEth:
+    """
+    Minimal node mempool: queues future nonces like a real node, rejects reused ones.
+    """
+    def __init__(self):
+        self.count_calls = 0
+        self.confirmed = {}
+        self.sent = []
+        self.fail_next = None
+
+    def get_transaction_count(self, address, block="latest"):
+        self.count_calls += 1
+        return self.confirmed.get(address, 0)
+
+    def send_raw_transaction(self, raw):
+        address, nonce = raw
+        if self.fail_next:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        if nonce < self.confirmed.get(address, 0) or nonce in self.sent:
+            raise ValueError(f"nonce too low: {nonce}")
+        self.sent.append(nonce)
+        while self.confirmed.get(address, 0) in self.sent:
+            self.confirmed[address] = self.confirmed.get(address, 0) + 1
+        return f"0x{nonce:064x}"
+
+
+class FakeW3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+    def to_hex(self, value):
+        return value
+
+
+class FakeSigned:
+    def __init__(self, raw):
+        self.raw_transaction = raw
+        self.hash = f"0x{raw[1]:064x}"
+
+
+class FakeAccount:
+    address = "0xabc"
+
+    def sign_transaction(self, tx):
+        return FakeSigned((self.address, tx["nonce"]))
+
+
+class TestNonceManager:
+    def test_reads_chain_once(self):
+        w3 = FakeW3()
+        manager = NonceManager(w3)
+        assert [manager.allocate("0xabc") for _ in range(3)] == [0, 1, 2]
+        assert w3.eth.count_calls == 1
+
+    def test_release_and_resync(self):
+        w3 = FakeW3()
+        manager = NonceManager(w3)
+        first = manager.allocate("0xabc")
+        second = manager.allocate("0xabc")
+        assert manager.release("0xabc", first) is False
+        assert manager.release("0xabc", second) is True
+        assert manager.allocate("0xabc") == second
+
+        w3.eth.confirmed["0xabc"] = 7
+        manager.resync("0xabc")
+        assert manager.allocate("0xabc") == 7
+        assert w3.eth.count_calls == 2
+
+    def test_nonce_error_detection(self):
+        assert is_nonce_error(ValueError("nonce too low"))
+        assert not is_nonce_error(ValueError("insufficient funds"))
+        assert is_already_known(ValueError("already known"))
+        assert not is_nonce_error(ValueError("already known"))
+
+
+class TestTransactionSubmitter:
+    @pytest.mark.anyio
+    async def test_pipelined_submissions_get_unique_nonces(self):
+        w3 = FakeW3()
+        submitter = TransactionSubmitter(w3, FakeAccount(), NonceManager(w3), max_in_flight=8)
+        ids = [submitter.submit({"value": i}) for i in range(20)]
+        await submitter.join()
+        await submitter.stop()
+
+        assert sorted(w3.eth.sent) == list(range(20))
+        assert w3.eth.count_calls == 1
+        assert all(submitter.status(i)["state"] == "sent" for i in ids)
+
+    @pytest.mark.anyio
+    async def test_resyncs_after_nonce_error(self):
+        w3 = FakeW3()
+        manager = NonceManager(w3)
+        submitter = TransactionSubmitter(w3, FakeAccount(), manager, max_in_flight=1)
+        # Another process used nonces 0-4 behind our back
+        manager.allocate("0xabc")
+        w3.eth.confirmed["0xabc"] = 5
+
+        tracking_id = submitter.submit({})
+        await submitter.join()
+        await submitter.stop()
+
+        status = submitter.status(tracking_id)
+        assert status["state"] == "sent"
+        assert status["nonce"] == 5
+
+    @pytest.mark.anyio
+    async def test_already_known_is_sent_not_resent(self):
+        w3 = FakeW3()
+        manager = NonceManager(w3)
+        submitter = TransactionSubmitter(w3, FakeAccount(), manager, max_in_flight=1)
+        # The node kept an earlier broadcast of the same signed bytes
+        w3.eth.fail_next = ValueError("already known")
+
+        tracking_id = submitter.submit({})
+        await submitter.join()
+        await submitter.stop()
+
+        status = submitter.status(tracking_id)
+        assert status["state"] == "sent"
+        assert status["tx_hash"] == f"0x{0:064x}"
+        assert w3.eth.count_calls == 1
+        assert manager.allocate("0xabc") == 1
+
+    def test_send_now_returns_hash_when_already_known(self):
+        w3 = FakeW3()
+        service = BlockchainService(w3=w3)
+        service.account = FakeAccount()
+        w3.eth.fail_next = ValueError("already known")
+
+        assert service._send_now({}) == f"0x{0:064x}"
+        assert w3.eth.sent == [] and w3.eth.count_calls == 1
+        assert service.nonce_manager.allocate("0xabc") == 1
+
+    @pytest.mark.anyio
+    async def test_failure_releases_nonce(self):
+        w3 = FakeW3()
+        submitter = TransactionSubmitter(w3, FakeAccount(), NonceManager(w3), max_in_flight=1)
+        w3.eth.fail_next = ValueError("insufficient funds for gas")
+
+        failed = submitter.submit({})
+        ok = submitter.submit({})
+        await submitter.join()
+        await submitter.stop()
+
+        assert submitter.status(failed)["state"] == "failed"
+        assert "insufficient funds" in submitter.status(failed)["error"]
+        assert submitter.status(ok)["nonce"] == 0
+
+
+class TestBlockchainServiceOnTestChain:
+    """
+    Runs against an in-process eth-tester chain.
+    """
+    @pytest.fixture
+    def service(self, monkeypatch):
+        pytest.importorskip("eth_tester")
+        from app.core.config import settings
+        w3 = Web3(Web3.EthereumTesterProvider())
+        monkeypatch.setattr(settings, "CONTRACT_ADDRESS", ESCROW)
+        monkeypatch.setattr(settings, "BLOCKCHAIN_GAS_PRICE_GWEI", 1)
+        # eth-tester pre-funds the account with private key 0x...01
+        return BlockchainService(w3=w3, private_key="0x" + "0" * 63 + "1")
+
+    def test_create_record(self, service):
+        tx_hash = service.create_record("8d3c1f2e-0000-4000-8000-000000000001", ESCROW)
+        receipt = service.w3.eth.get_transaction_receipt(tx_hash)
+        assert receipt["status"] == 1
+
+    @pytest.mark.anyio
+    async def test_submit_record_queued(self, service):
+        # eth-tester mines each send synchronously and is not thread-safe
+        service.submitter.max_in_flight = 1
+        ids = [service.submit_record(f"campaign-{i}", ESCROW) for i in range(10)]
+        await service.submitter.join()
+        await service.submitter.stop()
+
+        nonces = sorted(service.submission_status(i)["nonce"] for i in ids)
+        assert nonces == list(range(10))
+        assert all(service.submission_status(i)["state"] == "sent" for i in ids)
+        assert service.w3.eth.get_transaction_count(service.account.address) == 10
+
+    def test_anchor_root(self, service):
+        root = "0x" + "ab" * 32
+        tx_hash = service.anchor_root(root, 1000)
+        tx = service.w3.eth.get_transaction(tx_hash)
+        assert Web3.to_hex(tx["input"]) == root
+        assert service.w3.eth.get_transaction_receipt(tx_hash)["status"] == 1
@@ -0,0 +1,136 @@
+import json
+import math
+import threading
+import uuid
+import numpy as np
+import pytest
+from app.api import deps
+from app.core.database import get_async_db
+from app.main import app
+from app.models.campaign import Campaign
+from app.services.discovery import matching
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot, InfluencerCatalog
+from app.services.discovery.matching import (
+    COST_PER_FOLLOWER, CampaignProfile, MatchingEngine, campaign_profile, match_campaigns, matching_engine
+)
+
+BRAND_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+CATEGORIES = ["Fitness", "Tech", "Beauty", "Food", "Travel"]
+
+
+def random_rows(n, seed=9):
+    rng = np.random.default_rng(seed)
+    return [
+        (
+            uuid.uuid4(),
+            rng.choice(CATEGORIES, size=rng.integers(0, 3), replace=False).tolist(),
+            None if i % 17 == 0 else float(rng.integers(100, 5 * 10**6)),
+            None if i % 13 == 0 else float(rng.random() * 0.15),
+            None,
+        )
+        for i in range(n)
+    ]
+
+
+def catalog_of(rows):
+    catalog = InfluencerCatalog()
+    vocabulary = {}
+    catalog._snapshot = CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)
+    catalog.loaded = True
+    return catalog
+
+
+def brute_force(rows, tags, budget, k):
+    target = math.log10(budget / COST_PER_FOLLOWER)
+    scored = []
+    for user_id, niche, followers, engagement, _ in rows:
+        overlap = len(set(tags) & set(niche)) / len(tags) if tags else 0.0
+        if tags and not overlap:
+            continue
+        tier = max(0.0, 1 - abs(math.log10(followers) - target)) if followers else 0.0
+        engagement = min(engagement / 0.1, 1.0) if engagement is not None else 0.0
+        scored.append(0.5 * overlap + 0.3 * tier + 0.2 * engagement)
+    return sorted(scored, reverse=True)[:k]
+
+
+def test_rank_matches_brute_force(monkeypatch):
+    monkeypatch.setattr(matching, "MATCH_CHUNK", 256)  # several chunks through the heap
+    rows = random_rows(3000)
+    engine = MatchingEngine(catalog_of(rows))
+    for tags, budget in ((["Fitness"], 20000.0), (["Tech", "Food"], 500.0), ([], 10**6), (["Travel", "Gaming"], 5000.0)):
+        got = engine.rank(CampaignProfile(tags, budget, "r"), k=15)
+        assert [m.score for m in got] == pytest.approx(brute_force(rows, tags, budget, 15), abs=1e-5)
+        assert all(0 <= m.tier_fit <= 1 and 0 <= m.engagement <= 1 for m in got)
+    assert engine.rank(CampaignProfile(["Gaming"], 100.0, "r")) == []
+
+
+def test_campaign_profile():
+    profile = campaign_profile("Summer gym launch", "Protein bars for your workout", 50000)
+    assert profile.tags == ["Fitness"]
+    assert campaign_profile("Summer gym launch", "Protein bars for your workout", 50000).revision == profile.revision
+    assert campaign_profile("Summer gym launch", "Protein bars for your workout", 60000).revision != profile.revision
+
+
+def test_results_are_cached_per_revision_and_snapshot():
+    rows = random_rows(500)
+    catalog = catalog_of(rows)
+    engine = MatchingEngine(catalog)
+    profile = CampaignProfile(["Tech"], 10000.0, "rev-1")
+    first = engine.match(profile)
+    assert engine.match(profile) is first and engine.cache.hits == 1
+    assert engine.match(profile._replace(revision="rev-2")) is not first
+
+    vocabulary = dict(catalog.snapshot.vocabulary)
+    catalog._snapshot = catalog.snapshot.apply(CatalogChunk(rows[:1], vocabulary), vocabulary)
+    assert engine.match(profile) is not first
+
+
+def test_nightly_job_writes_matches(tmp_path):
+    engine = MatchingEngine(catalog_of(random_rows(500)))
+    campaigns = [(uuid.uuid4(), campaign_profile(f"Campaign {i}", "travel and hotel deals", 1000 * (i + 1))) for i in range(3)]
+    out = tmp_path / "matches.jsonl"
+    assert match_campaigns(campaigns, str(out), k=5, engine=engine) == 3
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [line["campaign_id"] for line in lines] == [str(c[0]) for c in campaigns]
+    assert all(line["tags"] == ["Travel"] and len(line["matches"]) == 5 for line in lines)
+    assert len(engine.cache) == 3
+
+
+class FakeAsyncSession:
+    def __init__(self, campaigns):
+        self.campaigns = {c.id: c for c in campaigns}
+
+    async def get(self, model, key):
+        return self.campaigns.get(key)
+
+
+@pytest.mark.anyio
+async def test_match_endpoints(client, monkeypatch):
+    rows = random_rows(300)
+    monkeypatch.setattr(matching_engine, "catalog", catalog_of(rows))
+    own = Campaign(id=uuid.uuid4(), brand_id=uuid.UUID(BRAND_ID), title="Cooking week", description="recipes", budget=2000)
+    other = Campaign(id=uuid.uuid4(), brand_id=uuid.uuid4(), title="Cooking week", description="recipes", budget=2000)
+    app.dependency_overrides[get_async_db] = lambda: FakeAsyncSession([own, other])
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=BRAND_ID, role="brand")
+    try:
+        response = await client.post("/api/v1/discovery/matches", json={
+            "title": "Cooking week", "description": "recipes", "budget": 2000, "limit": 5
+        })
+        assert response.status_code == 200
+        body = response.json()
+        assert body["tags"] == ["Food"] and len(body["items"]) == 5
+        assert [item["score"] for item in body["items"]] == pytest.approx(brute_force(rows, ["Food"], 2000, 5), abs=1e-5)
+
+        ranked_on = []
+        rank = matching_engine.rank
+        monkeypatch.setattr(matching_engine, "rank", lambda *args: ranked_on.append(threading.current_thread()) or rank(*args))
+        response = await client.get(f"/api/v1/discovery/campaigns/{own.id}/matches", params={"limit": 3})
+        assert response.status_code == 200 and response.json()["items"] == body["items"][:3]
+        # Ranked in the threadpool, not on the event loop
+        assert ranked_on and threading.main_thread() not in ranked_on
+        assert (await client.get(f"/api/v1/discovery/campaigns/{other.id}/matches")).status_code == 404
+
+        response = await client.post("/api/v1/discovery/matches", json={"title": "Cooking week", "budget": -1})
+        assert response.status_code == 422
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,52 @@
+import io
+import pytest
+from app.services.ingestion.csv_ingestion import ingest_csv
+
+HEADER = "handle, platform, followers, url, niche_tags\n"
+
+def _upload(text: str) -> io.BytesIO:
+    return io.BytesIO(text.encode("utf-8"))
+
+class TestCSVIngestion:
+    def test_valid_rows_are_normalized_in_batches(self):
+        csv_text = HEADER + "".join(
+            f"@creator{i}, Instagram, {1000 + i}, https://instagram.com/creator{i}, \"fitness, yoga\"\n"
+            for i in range(5)
+        )
+        batches = []
+        report = ingest_csv(_upload(csv_text), writer=batches.append, batch_size=2)
+
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert report.rows_total == 5 and report.rows_ingested == 5 and report.rows_failed == 0
+        first = batches[0][0]
+        assert first.username == "creator0"
+        assert first.platform_id == "creator0"
+        assert first.platform.value == "instagram"
+        assert first.follower_count == 1000
+        assert first.tags == ["fitness", "yoga"]
+
+    def test_bad_rows_are_reported_without_aborting(self):
+        csv_text = HEADER + (
+            "good, youtube, 10, https://youtube.com/@good, tech\n"
+            "bad_followers, youtube, lots, https://youtube.com/@bad, tech\n"
+            "bad_platform, tiktok, 5, https://tiktok.com/@x, dance\n"
+            "also_good, linkedin, 7, https://linkedin.com/in/also, \n"
+        )
+        batches = []
+        report = ingest_csv(_upload(csv_text), writer=batches.append, batch_size=10)
+
+        assert report.rows_ingested == 2 and report.rows_failed == 2
+        assert [e.row for e in report.errors] == [3, 4]
+        assert any("followers" in msg for msg in report.errors[0].errors)
+        assert [p.username for p in batches[0]] == ["good", "also_good"]
+        assert batches[0][1].tags == []
+
+    def test_error_list_is_capped(self):
+        csv_text = HEADER + "x, myspace, 1, https://a.com, t\n" * 5
+        report = ingest_csv(_upload(csv_text), writer=lambda batch: None, max_errors=2)
+        assert report.rows_failed == 5
+        assert len(report.errors) == 2 and report.errors_truncated is True
+
+    def test_missing_columns_rejected(self):
+        with pytest.raises(ValueError, match="followers"):
+            ingest_csv(_upload("handle,platform,url,niche_tags\n"), writer=lambda batch: None)
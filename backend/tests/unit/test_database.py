@@ -0,0 +1,29 @@
+import inspect
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.endpoints import users
+from app.core.config import settings
+from app.core.database import async_engine, engine, get_async_db
+
+class TestDatabaseLayer:
+    def test_pool_settings_applied_to_both_engines(self):
+        for eng in (engine, async_engine):
+            pool = eng.pool
+            assert pool.size() == settings.DB_POOL_SIZE
+            assert pool._max_overflow == settings.DB_MAX_OVERFLOW
+            assert pool._recycle == settings.DB_POOL_RECYCLE
+            assert pool._timeout == settings.DB_POOL_TIMEOUT
+
+    def test_async_engine_uses_async_driver(self):
+        assert async_engine.dialect.driver == "asyncpg"
+
+    @pytest.mark.anyio
+    async def test_get_async_db_yields_session(self):
+        gen = get_async_db()
+        db = await gen.__anext__()
+        assert isinstance(db, AsyncSession)
+        await gen.aclose()
+
+    def test_user_endpoints_are_async(self):
+        for endpoint in (users.onboard_brand, users.onboard_influencer, users.read_user_me):
+            assert inspect.iscoroutinefunction(endpoint)
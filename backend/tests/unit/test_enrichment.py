@@ -0,0 +1,166 @@
+import operator
+import uuid
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.models.user import Influencer
+from app.services.ai.engine import AIEngine, ai_engine
+from app.services.ai.enrichment import (
+    backfill_taxonomy_change, content_hash, diff_taxonomies, enrich_influencer, needs_enrichment
+)
+from app.services.ai.taxonomy import taxonomy_fingerprint
+
+class TestIncrementalEnrichment:
+    def test_enrich_runs_once_per_bio(self):
+        inf = Influencer(username="lifter", bio="Gym and protein")
+        assert enrich_influencer(inf) is True
+        assert inf.niche == ["Fitness"]
+        assert inf.bio_hash == content_hash("Gym and protein")
+        assert inf.taxonomy_version == ai_engine.taxonomy_version
+
+        assert needs_enrichment(inf) is False
+        assert enrich_influencer(inf) is False
+
+        inf.bio = "Travel and hotel reviews"
+        assert enrich_influencer(inf) is True
+        assert inf.niche == ["Travel"]
+
+    def test_taxonomy_change_invalidates(self):
+        inf = Influencer(username="gamer", bio="esports all day")
+        enrich_influencer(inf)
+        engine = AIEngine()
+        engine.CATEGORY_KEYWORDS = {**AIEngine.CATEGORY_KEYWORDS, "Gaming": ["esports"]}
+        assert needs_enrichment(inf, engine) is True
+        enrich_influencer(inf, engine)
+        assert inf.niche == ["Gaming"]
+
+class TestTaxonomyDiff:
+    def test_detects_touched_categories_and_new_keywords(self):
+        old = {"Fitness": ["gym"], "Tech": ["code"], "Food": ["eat"]}
+        new = {"Fitness": ["gym", "pilates"], "Tech": ["code"], "Travel": ["trip"]}
+        diff = diff_taxonomies(old, new)
+        assert diff.changed_categories == {"Fitness", "Food", "Travel"}
+        assert diff.added_keywords == {"pilates", "trip"}
+
+    def test_reordering_counts_as_change(self):
+        diff = diff_taxonomies({"A": ["a"], "B": ["b"]}, {"B": ["b"], "A": ["a"]})
+        assert diff.changed_categories == {"A", "B"}
+        assert diff.added_keywords == set()
+
+    def test_unchanged_taxonomy(self):
+        diff = diff_taxonomies(AIEngine.CATEGORY_KEYWORDS, dict(AIEngine.CATEGORY_KEYWORDS))
+        assert diff.changed_categories == set() and diff.added_keywords == set()
+
+
+
+class FakeQuery:
+    """
+    `db.query(Influencer)` over an in-memory table. The SQL prefilter itself is only
+    compiled and recorded; rows are selected with the Python `prefilter` the test mirrors it with.
+    """
+    def __init__(self, session):
+        self.session = session
+        self.criteria = []
+        self.limit_to = None
+
+    def filter(self, *criteria):
+        self.criteria.extend(criteria)
+        return self
+
+    def order_by(self, *columns):
+        return self
+
+    def limit(self, n):
+        self.limit_to = n
+        return self
+
+    def all(self):
+        compiled = [c.compile(dialect=postgresql.dialect()) for c in self.criteria]
+        self.session.queries.append((" AND ".join(map(str, compiled)), [c.params for c in compiled]))
+        after = next((c.right.value for c in self.criteria if getattr(c, "operator", None) is operator.gt), None)
+        rows = sorted(
+            (i for i in self.session.rows if self.session.prefilter(i) and (after is None or i.user_id > after)),
+            key=lambda i: i.user_id
+        )
+        return rows[:self.limit_to]
+
+
+class FakeUpdateResult:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+
+
+class FakeBackfillSession:
+    def __init__(self, rows, prefilter):
+        self.rows = rows
+        self.prefilter = prefilter
+        self.queries = []
+        self.updates = []
+        self.commits = 0
+
+    def query(self, model):
+        return FakeQuery(self)
+
+    def execute(self, statement):
+        # The bulk re-stamp: UPDATE influencers SET taxonomy_version=new WHERE taxonomy_version=old
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.updates.append(str(compiled))
+        old, new = compiled.params["taxonomy_version_1"], compiled.params["taxonomy_version"]
+        stamped = [i for i in self.rows if i.taxonomy_version == old]
+        for influencer in stamped:
+            influencer.taxonomy_version = new
+        return FakeUpdateResult(len(stamped))
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestTaxonomyBackfill:
+    def test_only_affected_profiles_are_recategorized(self):
+        previous = AIEngine.CATEGORY_KEYWORDS
+        old_version = taxonomy_fingerprint(previous)
+        engine = AIEngine()
+        # Adds a category with a keyword containing a LIKE wildcard, and extends Fitness
+        engine.CATEGORY_KEYWORDS = {
+            **previous, "Fitness": previous["Fitness"] + ["pilates"], "Gaming": ["esports", "speed_run"]
+        }
+
+        def profile(bio):
+            inf = Influencer(user_id=uuid.uuid4(), username="u", bio=bio)
+            enrich_influencer(inf)
+            return inf
+        lifter = profile("Gym and protein")            # carries a changed category
+        gamer = profile("esports commentator")         # bio has a new keyword
+        speedrunner = profile("weekly speed_run streams")
+        traveller = profile("Travel and hotel reviews")  # untouched: re-stamped only
+        rows = [lifter, gamer, speedrunner, traveller]
+
+        new_keywords = ("pilates", "esports", "speed_run")
+        prefilter = lambda i: i.taxonomy_version == old_version and (
+            "Fitness" in (i.niche or []) or "Gaming" in (i.niche or [])
+            or any(k in (i.bio or "").lower() for k in new_keywords)
+        )
+        db = FakeBackfillSession(rows, prefilter)
+        recategorized = []
+        categorize_many = engine.categorize_many
+        engine.categorize_many = lambda bios: recategorized.extend(bios) or categorize_many(bios)
+
+        stats = backfill_taxonomy_change(db, previous, engine, batch_size=2)
+
+        assert stats == {"candidates": 3, "changed": 2, "restamped": 1}
+        assert sorted(recategorized) == sorted([lifter.bio, gamer.bio, speedrunner.bio])
+        assert gamer.niche == ["Gaming"] and speedrunner.niche == ["Gaming"] and lifter.niche == ["Fitness"]
+        assert traveller.niche == ["Travel"]
+        assert all(i.taxonomy_version == engine.taxonomy_version for i in rows)
+
+        sql, params = db.queries[0]
+        assert "influencers.niche ?| ARRAY" in sql
+        assert sql.count("influencers.bio ILIKE") == 3 and sql.count("ESCAPE") == 3
+        assert {"%esports%", "%pilates%", "%speed\\_run%"} <= {v for p in params for v in p.values()}
+        # Keyset pages of 2, then an empty page
+        assert len(db.queries) == 3 and "influencers.user_id >" in db.queries[1][0]
+        assert len(db.updates) == 1 and db.commits == 3
+
+    def test_unchanged_taxonomy_is_a_no_op(self):
+        db = FakeBackfillSession([], lambda i: True)
+        assert backfill_taxonomy_change(db, AIEngine.CATEGORY_KEYWORDS) == {"candidates": 0, "changed": 0, "restamped": 0}
+        assert db.queries == [] and db.updates == []
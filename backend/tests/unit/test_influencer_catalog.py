@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from app.schemas.discovery import DiscoverySort, InfluencerSearch, NicheMatch
+from app.services.discovery import catalog as catalog_module
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot, InfluencerCatalog
+
+T0 = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def row(followers, engagement=None, niche=("tech",), user_id=None, updated_at=T0):
+    return (user_id or uuid.uuid4(), list(niche), followers, engagement, updated_at)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def partitions(self):
+        if self.rows:
+            yield self.rows
+
+
+class FakeSession:
+    """
+    Stands in for the `influencers` table: `execute` returns the rows changed since the
+    catalog's watermark, `scalar` the row count or every id (packed, as `uuid_send` would).
+    """
+
+    def __init__(self, rows):
+        self.table = {r[0]: r for r in rows}
+
+    def execute(self, query):
+        watermark = query.whereclause.right.value if query.whereclause is not None else None
+        return FakeResult([r for r in self.table.values() if watermark is None or r[4] >= watermark])
+
+    def scalar(self, query):
+        if "string_agg" in str(query):
+            return b"".join(user_id.bytes for user_id in self.table)
+        return len(self.table)
+
+
+def snapshot_of(rows):
+    vocabulary = {}
+    return CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)
+
+
+def test_filter_and_rank_matches_brute_force():
+    rng = np.random.default_rng(3)
+    tags = ["tech", "beauty", "travel", "food"] + [f"tag{i}" for i in range(80)]
+    rows = [
+        row(
+            None if i % 50 == 0 else float(rng.integers(0, 10**6)),
+            float(rng.random()),
+            niche=rng.choice(tags, size=rng.integers(0, 4), replace=False).tolist(),
+        )
+        for i in range(5000)
+    ]
+    snapshot = snapshot_of(rows)
+
+    for search in (
+        InfluencerSearch(limit=10),
+        InfluencerSearch(niche=["tech", "tag70"], niche_match=NicheMatch.ANY, limit=25),
+        InfluencerSearch(niche=["tech", "beauty"], min_followers=10000, limit=5),
+        InfluencerSearch(niche=["tag79"], sort=DiscoverySort.ENGAGEMENT_RATE, max_engagement=0.5),
+    ):
+        def passes(r):
+            niche = set(r[1])
+            wanted = set(search.niche)
+            if wanted and not (wanted <= niche if search.niche_match == NicheMatch.ALL else wanted & niche):
+                return False
+            if search.min_followers is not None and not (r[2] is not None and r[2] >= search.min_followers):
+                return False
+            return search.max_engagement is None or r[3] <= search.max_engagement
+
+        key = 2 if search.sort == DiscoverySort.FOLLOWERS else 3
+        expected = sorted((r for r in rows if passes(r) and r[key] is not None), key=lambda r: -r[key])
+        got = snapshot.search(search)
+        assert [value for _, value in got] == pytest.approx([r[key] for r in expected[:search.limit]])
+        assert {user_id for user_id, _ in got} <= {r[0] for r in expected}
+
+
+def test_unknown_tag():
+    snapshot = snapshot_of([row(10.0)])
+    assert snapshot.search(InfluencerSearch(niche=["nope"])) == []
+    assert len(snapshot.search(InfluencerSearch(niche=["nope", "tech"], niche_match=NicheMatch.ANY))) == 1
+
+
+def test_refresh_is_incremental(monkeypatch):
+    monkeypatch.setattr(catalog_module, "REFRESH_OVERLAP", timedelta(0))
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = FakeSession([row(100.0, user_id=a), row(200.0, user_id=b)])
+    catalog = InfluencerCatalog()
+    assert catalog.refresh(db) == 2
+    assert [user_id for user_id, _ in catalog.search(InfluencerSearch())] == [b, a]
+
+    # One update, one new profile (with a tag the catalog hasn't seen), one deletion
+    c = uuid.uuid4()
+    later = T0 + timedelta(minutes=1)
+    db.table[a] = row(300.0, niche=["gaming"] + [f"t{i}" for i in range(70)], user_id=a, updated_at=later)
+    db.table[c] = row(150.0, user_id=c, updated_at=later)
+    del db.table[b]
+    assert catalog.refresh(db) == 2
+
+    assert catalog.search(InfluencerSearch()) == [(a, 300.0), (c, 150.0)]
+    assert catalog.search(InfluencerSearch(niche=["gaming", "t69"])) == [(a, 300.0)]
+    assert catalog.search(InfluencerSearch(niche=["tech"])) == [(c, 150.0)]
+    assert catalog.snapshot.row_of(b) is None
+    assert len(catalog) == 2
+
+
+def test_idle_refresh_keeps_the_snapshot():
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = FakeSession([row(100.0, user_id=a), row(None, niche=(), user_id=b)])
+    catalog = InfluencerCatalog()
+    catalog.refresh(db)
+    first = catalog.snapshot
+
+    # The overlap re-reads both rows (NaN followers included) without any change
+    assert catalog.refresh(db) == 2 and catalog.refresh(db) == 2
+    assert catalog.snapshot is first
+
+    # Same values with a newer stamp: only the watermark moves
+    later = T0 + timedelta(minutes=1)
+    db.table[a] = row(100.0, user_id=a, updated_at=later)
+    catalog.refresh(db)
+    assert catalog.snapshot is first and first.watermark == later
+
+    for changed in (row(100.0, niche=("food",), user_id=a, updated_at=later), row(100.0, 0.05, user_id=a, updated_at=later)):
+        db.table[a] = changed
+        catalog.refresh(db)
+        assert catalog.snapshot is not first
+        first = catalog.snapshot
+    assert catalog.search(InfluencerSearch(niche=["tech"])) == [(a, 100.0)]
+
+
+def test_compaction_drops_deleted_rows():
+    rows = [row(float(i)) for i in range(10)]
+    snapshot = snapshot_of(rows).without(np.array([r[0].bytes for r in rows[:5]], dtype="S16"))
+    assert len(snapshot.ids) == 5 and snapshot.alive.all()
+    assert [value for _, value in snapshot.search(InfluencerSearch())] == [4.0, 3.0, 2.0, 1.0, 0.0]
+    assert snapshot.row_of(rows[2][0]) is not None
+
+
+def test_memory_report():
+    report = snapshot_of([row(float(i)) for i in range(1000)]).memory_report()
+    assert report["rows"] == 1000
+    assert report["total"] == sum(v for k, v in report.items() if k not in ("total", "rows"))
+    assert report["ids"] == 16 * 1000
@@ -0,0 +1,157 @@
+import logging
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.instrumentation import InstrumentationMiddleware, instrument_engine, timed
+from app.core.metrics import Registry
+from app.main import app as main_app
+
+engine = create_engine("sqlite://")
+instrument_engine(engine)
+
+
+def slow_dependency():
+    with timed("jwt"):
+        pass
+    return 1
+
+
+instrumented_app = FastAPI()
+instrumented_app.add_middleware(InstrumentationMiddleware)
+
+
+@instrumented_app.get("/items/{n}")
+def run_statements(n: int, _: int = Depends(slow_dependency)):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text("SELECT :i"), {"i": i})
+    return {"ran": n}
+
+
+@instrumented_app.get("/failing")
+def run_failing_statements():
+    with engine.connect() as conn:
+        info = dict(conn.info)
+        for _ in range(3):
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except OperationalError:
+                pass
+        conn.execute(text("SELECT 1"))
+        # Connection state that the failed statements left behind
+        return {"leaked": [key for key, value in conn.info.items() if info.get(key) != value]}
+
+
+@pytest.fixture
+async def test_client():
+    async with AsyncClient(transport=ASGITransport(app=instrumented_app), base_url="http://test") as c:
+        yield c
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.mark.anyio
+async def test_server_timing_and_histograms(test_client):
+    before = instrumentation.REQUEST_STATEMENTS.count("GET", "/items/{n}")
+    response = await test_client.get("/items/3")
+    assert response.status_code == 200
+
+    timing = parse_server_timing(response.headers["server-timing"])
+    assert float(timing["app"]["dur"]) >= float(timing["db"]["dur"]) >= 0
+    assert timing["db"]["desc"] == '"3 queries"'
+    assert "jwt" in timing
+    # Labelled by route template, not the raw path
+    assert instrumentation.REQUEST_STATEMENTS.count("GET", "/items/{n}") == before + 1
+    assert instrumentation.REQUESTS.value("GET", "/items/{n}", "200") >= 1
+
+    # Statements outside a request are not attributed to anything
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert instrumentation.current_timings() is None
+
+
+@pytest.mark.anyio
+async def test_failed_statements_leave_no_state_behind(test_client):
+    response = await test_client.get("/failing")
+    assert parse_server_timing(response.headers["server-timing"])["db"]["desc"] == '"1 queries"'
+    assert response.json() == {"leaked": []}
+
+
+@pytest.mark.anyio
+async def test_statement_budget_flags_n_plus_one(test_client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "REQUEST_STATEMENT_BUDGET", 5)
+    before = instrumentation.STATEMENT_BUDGET_EXCEEDED.value("GET", "/items/{n}")
+    with caplog.at_level(logging.WARNING, logger="app.core.instrumentation"):
+        await test_client.get("/items/5")
+        assert instrumentation.STATEMENT_BUDGET_EXCEEDED.value("GET", "/items/{n}") == before
+        await test_client.get("/items/8")
+    assert instrumentation.STATEMENT_BUDGET_EXCEEDED.value("GET", "/items/{n}") == before + 1
+    assert "ran 8 SQL statements (budget 5)" in caplog.text
+    assert "(8x): SELECT ?" in caplog.text
+
+
+def test_prometheus_text_format():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    counter = registry.counter("hits_total", "Hits")
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, '/a"b')
+    counter.inc()
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="1"} 3',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a\\"b"} 4.05',
+        'latency_seconds_count{route="/a\\"b"} 4',
+        "# HELP hits_total Hits",
+        "# TYPE hits_total counter",
+        "hits_total 1",
+    ]
+
+
+def test_collectors_run_at_render():
+    registry = Registry()
+    gauge = registry.gauge("queue_depth", "Depth")
+    depth = [3]
+    registry.collector(lambda: gauge.set(value=depth[0]))
+    assert registry.render().endswith("queue_depth 3\n")
+    depth[0] = 7
+    assert registry.render().endswith("queue_depth 7\n")
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint(client):
+    await client.get("/health")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in response.text
+    for cache in ("token", "role"):
+        assert f'auth_cache_entries{{cache="{cache}"}}' in response.text
+        assert f'auth_cache_lookups{{cache="{cache}",result="hit"}}' in response.text
+    assert "server-timing" in response.headers
+
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_is_restricted(monkeypatch):
+    remote = AsyncClient(transport=ASGITransport(app=main_app, client=("203.0.113.7", 4000)), base_url="http://test")
+    async with remote:
+        assert (await remote.get("/metrics")).status_code == 403
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+        assert (await remote.get("/metrics")).status_code == 401
+        assert (await remote.get("/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+        response = await remote.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        assert response.status_code == 200 and "http_requests_total" in response.text
@@ -0,0 +1,246 @@
+import asyncio
+import uuid
+from decimal import Decimal
+import pytest
+from sqlalchemy.dialects import postgresql
+from app.models.campaign import Transaction
+from app.schemas.transaction import TransactionStatus
+from app.services.blockchain import anchoring
+from app.services.blockchain.anchoring import (
+    AnchorBatcher, anchor_batch, queue_paid_transactions, reanchor_unanchored, store_anchors, transaction_leaf,
+    verify_transaction
+)
+from app.services.blockchain.receipts import apply_receipt_statuses
+from app.services.blockchain.merkle import MerkleTree, leaf_hash, node_hash, verify_proof
+
+
+class FakeAnchorService:
+    def __init__(self):
+        self.anchored = []
+
+    def anchor_root(self, merkle_root, record_count):
+        self.anchored.append((merkle_root, record_count))
+        return f"0x{len(self.anchored):064x}"
+
+
+class TestMerkleTree:
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13, 100])
+    def test_every_proof_verifies(self, size):
+        records = [f"record-{i}".encode() for i in range(size)]
+        tree = MerkleTree(records)
+        for index, record in enumerate(records):
+            assert verify_proof(record, tree.proof(index), tree.root_hex)
+
+    def test_tampering_is_detected(self):
+        records = [f"record-{i}".encode() for i in range(6)]
+        tree = MerkleTree(records)
+        proof = tree.proof(2)
+
+        assert not verify_proof(b"record-X", proof, tree.root_hex)
+        assert not verify_proof(records[2], tree.proof(3), tree.root_hex)
+        flipped = [{**proof[0], "position": "right" if proof[0]["position"] == "left" else "left"}] + proof[1:]
+        assert not verify_proof(records[2], flipped, tree.root_hex)
+        assert not verify_proof(records[2], [{"hash": "zz"}], tree.root_hex)
+
+    def test_odd_leaf_is_not_duplicated(self):
+        # Duplicating the last leaf would give [a, b, c] and [a, b, c, c] the same root
+        a, b, c = b"a", b"b", b"c"
+        assert MerkleTree([a, b, c]).root != MerkleTree([a, b, c, c]).root
+        assert MerkleTree([a, b, c]).root == node_hash(node_hash(leaf_hash(a), leaf_hash(b)), leaf_hash(c))
+
+    def test_leaf_cannot_pose_as_node(self):
+        tree = MerkleTree([b"a", b"b"])
+        inner = leaf_hash(b"a") + leaf_hash(b"b")
+        assert MerkleTree([inner]).root != tree.root
+
+
+class TestAnchoring:
+    def _transaction(self, amount="150.5"):
+        return Transaction(
+            id=uuid.uuid4(), campaign_id=uuid.uuid4(), influencer_id=uuid.uuid4(), amount=Decimal(amount)
+        )
+
+    def test_one_transaction_per_batch(self):
+        service = FakeAnchorService()
+        transactions = [self._transaction() for _ in range(50)]
+        anchored = anchor_batch([(t.id, transaction_leaf(t)) for t in transactions], service)
+
+        assert len(service.anchored) == 1
+        assert service.anchored[0][1] == 50
+        assert {a.tx_hash for a in anchored} == {"0x" + "0" * 63 + "1"}
+
+        for transaction, record in zip(transactions, anchored):
+            transaction.blockchain_tx_hash = record.tx_hash
+            transaction.merkle_root = record.merkle_root
+            transaction.merkle_proof = record.merkle_proof
+            assert verify_transaction(transaction)
+
+        transactions[0].amount = Decimal("999")
+        assert not verify_transaction(transactions[0])
+
+    def test_leaf_amount_is_canonical(self):
+        transaction = self._transaction("10")
+        padded = Transaction(
+            id=transaction.id, campaign_id=transaction.campaign_id,
+            influencer_id=transaction.influencer_id, amount=Decimal("10.00")
+        )
+        assert transaction_leaf(transaction) == transaction_leaf(padded)
+
+    def test_unanchored_transaction_does_not_verify(self):
+        assert verify_transaction(self._transaction()) is False
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeTransactionsSession:
+    """
+    `transactions` table in memory: SELECTs return unanchored paid rows (`limit` at a time),
+    executemany UPDATEs by id are applied, other statements are only recorded.
+    """
+    def __init__(self, transactions, limit):
+        self.rows = {t.id: t for t in transactions}
+        self.limit = limit
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, statement, params=None, execution_options=None):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        if statement.is_select:
+            return FakeResult([
+                t for t in self.rows.values() if t.status == TransactionStatus.PAID and t.blockchain_tx_hash is None
+            ][:self.limit])
+        for values in params or []:
+            for name, value in values.items():
+                setattr(self.rows[values["id"]], name, value)
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestReanchoring:
+    def _transaction(self, status=TransactionStatus.PAID, tx_hash=None):
+        return Transaction(
+            id=uuid.uuid4(), campaign_id=uuid.uuid4(), influencer_id=uuid.uuid4(), amount=Decimal("20"),
+            status=status, blockchain_tx_hash=tx_hash
+        )
+
+    def test_receipt_statuses(self):
+        db = FakeTransactionsSession([], limit=10)
+        apply_receipt_statuses(db, confirmed=["0xaa"], reverted=["0xbb", "0xcc"])
+
+        (confirm_sql, confirm_params), (revert_sql, revert_params) = db.statements
+        assert "SET status=%(status)s" in confirm_sql and "blockchain_tx_hash IN" in confirm_sql
+        assert confirm_params["status"] == TransactionStatus.VERIFIED_ON_CHAIN
+        assert confirm_params["status_1"] == TransactionStatus.FAILED  # failed rows are left alone
+        assert "blockchain_tx_hash=%(blockchain_tx_hash)s, merkle_root=%(merkle_root)s, merkle_proof=NULL" in revert_sql
+        assert revert_params["blockchain_tx_hash"] is None and "status" not in revert_params
+        assert list(revert_params["blockchain_tx_hash_1"]) == ["0xbb", "0xcc"]
+        assert db.commits == 1
+
+    def test_store_anchors_returns_hashes_to_track(self):
+        transactions = [self._transaction() for _ in range(3)]
+        db = FakeTransactionsSession(transactions, limit=10)
+        anchored = anchor_batch([(t.id, transaction_leaf(t)) for t in transactions], FakeAnchorService())
+
+        assert store_anchors(db, anchored) == [anchored[0].tx_hash]
+        assert all(verify_transaction(t) for t in transactions) and db.commits == 1
+        assert store_anchors(db, []) == []
+
+    def test_reverted_and_unanchored_rows_are_anchored_again(self):
+        service = FakeAnchorService()
+        # Reverted rows end up like this: still paid, no hash
+        unanchored = [self._transaction() for _ in range(5)]
+        anchored = self._transaction(tx_hash="0x" + "ab" * 32)
+        pending = self._transaction(status=TransactionStatus.PENDING)
+        db = FakeTransactionsSession(unanchored + [anchored, pending], limit=2)
+
+        assert reanchor_unanchored(db, service, batch_size=2) == 5
+        assert [count for _, count in service.anchored] == [2, 2, 1]
+        assert all(t.blockchain_tx_hash and verify_transaction(t) for t in unanchored)
+        assert anchored.blockchain_tx_hash == "0x" + "ab" * 32
+        assert pending.blockchain_tx_hash is None
+        select_sql = db.statements[0][0]
+        assert "transactions.blockchain_tx_hash IS NULL" in select_sql and "LIMIT" in select_sql
+        assert reanchor_unanchored(db, service, batch_size=2) == 0
+
+
+class TestAnchorBatcher:
+    @pytest.mark.anyio
+    async def test_size_window(self):
+        service = FakeAnchorService()
+        batches = []
+        batcher = AnchorBatcher(service, max_batch_size=4, max_wait=60, on_anchored=batches.append)
+
+        futures = [batcher.add(i, f"r{i}".encode()) for i in range(10)]
+        await batcher.close()
+        results = await asyncio.gather(*futures)
+
+        assert sorted(count for _, count in service.anchored) == [2, 4, 4]
+        assert sorted(len(b) for b in batches) == [2, 4, 4]
+        assert all(verify_proof(f"r{r.record_id}".encode(), r.merkle_proof, r.merkle_root) for r in results)
+
+    @pytest.mark.anyio
+    async def test_time_window(self):
+        service = FakeAnchorService()
+        batcher = AnchorBatcher(service, max_batch_size=1000, max_wait=0.01)
+
+        first = batcher.add("a", b"a")
+        second = batcher.add("b", b"b")
+        records = await asyncio.wait_for(asyncio.gather(first, second), timeout=5)
+
+        assert service.anchored == [(records[0].merkle_root, 2)]
+
+    @pytest.mark.anyio
+    async def test_failed_anchor_fails_every_future(self):
+        class BrokenService:
+            def anchor_root(self, merkle_root, record_count):
+                raise RuntimeError("rpc down")
+
+        batcher = AnchorBatcher(BrokenService(), max_batch_size=2, max_wait=60)
+        futures = [batcher.add(i, b"x") for i in range(2)]
+        await batcher.close()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                await future
+
+    @pytest.mark.anyio
+    async def test_paid_transactions_are_queued(self, monkeypatch):
+        class FakeAsyncSession:
+            def __init__(self, rows):
+                self.rows = rows
+                self.statements = []
+
+            async def execute(self, statement):
+                self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+                return FakeResult(self.rows)
+
+        transactions = [
+            Transaction(id=uuid.uuid4(), campaign_id=uuid.uuid4(), influencer_id=uuid.uuid4(), amount=Decimal("20"))
+            for _ in range(3)
+        ]
+        db = FakeAsyncSession(transactions)
+        monkeypatch.setattr(anchoring.settings, "WALLET_PRIVATE_KEY", None)
+        assert await queue_paid_transactions(db, [t.id for t in transactions]) == 0  # no wallet, no batcher
+
+        service = FakeAnchorService()
+        batches = []
+        batcher = AnchorBatcher(service, max_batch_size=100, max_wait=60, on_anchored=batches.append)
+        monkeypatch.setattr(anchoring, "_anchor_batcher", batcher)
+
+        assert await queue_paid_transactions(db, [t.id for t in transactions]) == 3
+        assert "transactions.blockchain_tx_hash IS NULL" in db.statements[0]
+        assert await queue_paid_transactions(db, []) == 0
+        await anchoring.close_anchor_batcher()
+
+        assert [count for _, count in service.anchored] == [3]
+        assert [r.record_id for r in batches[0]] == [t.id for t in transactions]
@@ -0,0 +1,93 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from app.core.config import settings
+from app.services.payment.razorpay_service import OrderRequest, PaymentService
+
+
+def fake_gateway(latency: float = 0.0):
+    """
+    Stand-in for the Razorpay orders API; records requests and peak concurrency.
+    """
+    gateway = FastAPI()
+    gateway.state.requests = []
+    gateway.state.in_flight = 0
+    gateway.state.peak = 0
+
+    @gateway.post("/v1/orders")
+    async def create_order(request: Request):
+        state = gateway.state
+        state.in_flight += 1
+        state.peak = max(state.peak, state.in_flight)
+        try:
+            body = await request.json()
+            state.requests.append((request.headers.get("authorization"), body))
+            await asyncio.sleep(latency)
+            if body["amount"] <= 0:
+                raise HTTPException(status_code=400, detail="amount must be positive")
+            return {"id": f"order_{len(state.requests)}", "entity": "order", **body}
+        finally:
+            state.in_flight -= 1
+
+    return gateway
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_ID", "rzp_test_key")
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_SECRET", "rzp_test_secret")
+    monkeypatch.setattr(settings, "RAZORPAY_MAX_CONCURRENCY", 4)
+    return fake_gateway(latency=0.01)
+
+
+@pytest.mark.anyio
+async def test_create_order_async(gateway):
+    service = PaymentService(transport=httpx.ASGITransport(app=gateway))
+    order = await service.create_order_async(199.99, notes={"campaign_id": "c1"})
+    await service.aclose()
+
+    auth, body = gateway.state.requests[0]
+    assert auth.startswith("Basic ")
+    assert body == {"amount": 19999, "currency": "INR", "notes": {"campaign_id": "c1"}, "payment_capture": 1}
+    assert order["id"] == "order_1"
+
+
+@pytest.mark.anyio
+async def test_notes_are_not_shared_between_calls(gateway):
+    service = PaymentService(transport=httpx.ASGITransport(app=gateway))
+    first = await service.create_order_async(10)
+    first["notes"]["campaign_id"] = "mutated"
+    await service.create_order_async(10)
+    await service.aclose()
+
+    assert gateway.state.requests[1][1]["notes"] == {}
+
+
+@pytest.mark.anyio
+async def test_batch_is_ordered_and_bounded(gateway):
+    service = PaymentService(transport=httpx.ASGITransport(app=gateway))
+    orders = [OrderRequest(amount=100 + i, notes={"campaign_id": str(i)}) for i in range(20)]
+    results = await service.create_orders(orders)
+    await service.aclose()
+
+    assert [r["notes"]["campaign_id"] for r in results] == [str(i) for i in range(20)]
+    assert gateway.state.peak <= settings.RAZORPAY_MAX_CONCURRENCY
+
+
+@pytest.mark.anyio
+async def test_batch_reports_failures_without_losing_orders(gateway):
+    service = PaymentService(transport=httpx.ASGITransport(app=gateway))
+    results = await service.create_orders([OrderRequest(50), OrderRequest(0), OrderRequest(75)])
+    await service.aclose()
+
+    assert results[0]["amount"] == 5000
+    assert isinstance(results[1], HTTPException) and results[1].status_code == 500
+    assert results[2]["amount"] == 7500
+
+
+@pytest.mark.anyio
+async def test_mock_mode_without_keys(monkeypatch):
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_ID", None)
+    order = await PaymentService().create_order_async(5)
+    assert order["id"] == "order_mock_123"
@@ -0,0 +1,211 @@
+import asyncio
+import threading
+import pytest
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from app.services.blockchain import receipts
+from app.services.blockchain.receipts import ReceiptTracker, run_receipt_tracking
+
+
+class FakeChain:
+    def __init__(self):
+        self.block_number = 100
+        self.mined = {}  # tx hash -> (block, status)
+
+
+class FakeEth:
+    def __init__(self, chain):
+        self.chain = chain
+
+    @property
+    def block_number(self):
+        return self.chain.block_number
+
+    def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.chain.mined:
+            raise TransactionNotFound(tx_hash)
+        block, status = self.chain.mined[tx_hash]
+        return {"blockNumber": block, "status": status}
+
+
+class BatchProvider:
+    def __init__(self, chain):
+        self.chain = chain
+        self.batches = []
+
+    def make_batch_request(self, requests):
+        self.batches.append(len(requests))
+        responses = []
+        for i, (method, (tx_hash,)) in enumerate(requests):
+            mined = self.chain.mined.get(tx_hash)
+            result = {"blockNumber": hex(mined[0]), "status": hex(mined[1])} if mined else None
+            responses.append({"jsonrpc": "2.0", "id": i, "result": result})
+        return responses
+
+
+class FakeW3:
+    def __init__(self, provider_cls=BatchProvider):
+        self.chain = FakeChain()
+        self.eth = FakeEth(self.chain)
+        self.provider = provider_cls(self.chain)
+
+
+def _hashes(n):
+    return [f"0x{i:064x}" for i in range(n)]
+
+
+class TestReceiptTracker:
+    def test_rpc_calls_bounded_per_block(self):
+        w3 = FakeW3()
+        tracker = ReceiptTracker(w3, confirmations=3, batch_size=500, max_receipts=5000)
+        for tx_hash in _hashes(3000):
+            tracker.track(tx_hash)
+
+        assert tracker.poll_once() == ([], [])
+        # eth_blockNumber + 6 batches of 500
+        assert tracker.rpc_calls == 7
+        assert w3.provider.batches == [500] * 6
+
+        # Same head: receipts can't have changed, so only eth_blockNumber
+        tracker.poll_once()
+        assert tracker.rpc_calls == 8
+
+    def test_confirms_after_depth_and_skips_known_receipts(self):
+        w3 = FakeW3()
+        tracker = ReceiptTracker(w3, confirmations=3)
+        mined, reverted, waiting = _hashes(3)
+        for tx_hash in (mined, reverted, waiting):
+            tracker.track(tx_hash)
+        w3.chain.mined[mined] = (101, 1)
+        w3.chain.mined[reverted] = (101, 0)
+
+        w3.chain.block_number = 101
+        assert tracker.poll_once() == ([], [])
+
+        # Seen-but-shallow receipts aren't re-fetched; only the unmined hash is
+        w3.chain.block_number = 102
+        tracker.poll_once()
+        assert w3.provider.batches[-1] == 1
+
+        w3.chain.block_number = 103
+        assert tracker.poll_once() == ([mined], [reverted])
+        assert len(tracker) == 1
+
+    def test_reorged_out_receipt_is_tracked_again(self):
+        w3 = FakeW3()
+        tracker = ReceiptTracker(w3, confirmations=2)
+        tx_hash = _hashes(1)[0]
+        tracker.track(tx_hash)
+        w3.chain.mined[tx_hash] = (101, 1)
+        w3.chain.block_number = 101
+        tracker.poll_once()
+
+        del w3.chain.mined[tx_hash]
+        w3.chain.block_number = 102
+        assert tracker.poll_once() == ([], [])
+        assert len(tracker) == 1
+
+    def test_falls_back_without_batch_support(self):
+        class NoBatchProvider:
+            def __init__(self, chain):
+                pass
+
+            def make_batch_request(self, requests):
+                raise NotImplementedError
+
+        w3 = FakeW3(NoBatchProvider)
+        tracker = ReceiptTracker(w3, confirmations=1, batch_size=2)
+        hashes = _hashes(3)
+        for tx_hash in hashes:
+            tracker.track(tx_hash)
+        w3.chain.mined[hashes[0]] = (100, 1)
+
+        assert tracker.poll_once() == ([hashes[0]], [])
+        assert tracker.batch_supported is False
+
+    def test_max_receipts_rotates(self):
+        w3 = FakeW3()
+        tracker = ReceiptTracker(w3, confirmations=1, max_receipts=2)
+        hashes = _hashes(4)
+        for tx_hash in hashes:
+            tracker.track(tx_hash)
+            w3.chain.mined[tx_hash] = (100, 1)
+
+        assert tracker.poll_once() == (hashes[:2], [])
+        w3.chain.block_number = 101
+        assert tracker.poll_once() == (hashes[2:], [])
+
+    @pytest.mark.anyio
+    async def test_run_reports_settled_hashes(self):
+        w3 = FakeW3()
+        settled = []
+        tracker = ReceiptTracker(
+            w3, confirmations=1, min_interval=0.001, max_interval=0.01,
+            on_settled=lambda confirmed, reverted: settled.append((confirmed, reverted))
+        )
+        task = asyncio.create_task(tracker.run())
+        tx_hash = _hashes(1)[0]
+        tracker.track(tx_hash)
+        w3.chain.mined[tx_hash] = (100, 1)
+
+        for _ in range(500):
+            if settled:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+        assert settled == [([tx_hash], [])]
+
+    @pytest.mark.anyio
+    async def test_tracking_task_seeds_from_paid_rows(self, monkeypatch):
+        w3 = FakeW3()
+        settled = []
+        tracker = ReceiptTracker(
+            w3, confirmations=1, min_interval=0.001, max_interval=0.01,
+            on_settled=lambda confirmed, reverted: settled.append((confirmed, reverted))
+        )
+        monkeypatch.setattr(receipts, "_receipt_tracker", tracker)
+        seeded, stored = _hashes(2)
+
+        class FakeSession:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def scalars(self, query):
+                # Paid rows that still wait for their anchor's receipt
+                assert "DISTINCT" in str(query) and "blockchain_tx_hash IS NOT NULL" in str(query)
+                return iter([seeded])
+
+        task = asyncio.create_task(run_receipt_tracking(FakeSession, rescan_interval=0.01))
+        for _ in range(500):
+            if seeded in tracker.pending_hashes():
+                break
+            await asyncio.sleep(0.01)
+        # Anchors stored from a worker thread are tracked too
+        thread = threading.Thread(target=tracker.track, args=(stored,))
+        thread.start()
+        thread.join()
+        w3.chain.mined[seeded] = w3.chain.mined[stored] = (100, 1)
+        w3.chain.block_number = 101
+
+        for _ in range(500):
+            if sum(len(confirmed) for confirmed, _ in settled) == 2:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert sorted(h for confirmed, _ in settled for h in confirmed) == sorted([seeded, stored])
+
+    def test_eth_tester_chain(self):
+        pytest.importorskip("eth_tester")
+        w3 = Web3(Web3.EthereumTesterProvider())
+        accounts = w3.eth.accounts
+        tx_hash = w3.to_hex(w3.eth.send_transaction({"from": accounts[0], "to": accounts[1], "value": 1}))
+
+        tracker = ReceiptTracker(w3, confirmations=1)
+        tracker.track(tx_hash)
+        assert tracker.poll_once() == ([tx_hash], [])
@@ -0,0 +1,160 @@
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.schemas.transaction import MismatchKind
+from app.services.payment.razorpay_service import PaymentService
+from app.services.payment.reconciliation import (
+    PartitionSpill, join_partitions, recheck_gateway_misses, spill_gateway_payments
+)
+
+START = datetime(2026, 9, 1, tzinfo=timezone.utc)
+
+
+def fake_gateway(payments):
+    """
+    Razorpay GET /v1/payments over a fixed list of (created_at, payment) pairs.
+    """
+    gateway = FastAPI()
+
+    @gateway.get("/v1/payments")
+    async def list_payments(request: Request, count: int = 10, skip: int = 0):
+        lo, hi = int(request.query_params["from"]), int(request.query_params["to"])
+        matching = [p for ts, p in payments if lo <= ts <= hi]
+        return {"entity": "collection", "items": matching[skip:skip + count]}
+
+    @gateway.get("/v1/payments/{payment_id}")
+    async def fetch_payment(payment_id: str):
+        for _, payment in payments:
+            if payment["id"] == payment_id:
+                return payment
+        return JSONResponse({"error": {"code": "BAD_REQUEST_ERROR"}}, status_code=400)
+
+    return gateway
+
+
+def _payment(i, status="captured", amount=10000):
+    return {"id": f"pay_{i}", "amount": amount, "status": status, "order_id": f"order_{i}"}
+
+
+@pytest.mark.anyio
+async def test_pages_every_slice(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_ID", "rzp_test")
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_SECRET", "secret")
+    start_ts = int(START.timestamp())
+    # 250 payments spread over two days -> several slices, some with more than one page
+    payments = [(start_ts + i * 600, _payment(i)) for i in range(250)]
+    gateway = fake_gateway(payments)
+    service = PaymentService(transport=httpx.ASGITransport(app=gateway))
+
+    spill = PartitionSpill(str(tmp_path), "gateway", partitions=8)
+    await spill_gateway_payments(service, START, START + timedelta(days=2), spill)
+    spill.close()
+    await service.aclose()
+
+    ids = {p["id"] for partition in range(8) for p in spill.read(partition)}
+    assert ids == {f"pay_{i}" for i in range(250)}
+    assert spill.count == 250
+
+
+def row(i, amount_paise=10000, status="paid", tx_hash="0xabc", proof_ok=True):
+    return {
+        "id": f"tx_{i}", "payment_id": f"pay_{i}", "amount_paise": amount_paise,
+        "status": status, "tx_hash": tx_hash, "proof_ok": proof_ok,
+    }
+
+
+def test_join_reports_each_mismatch_kind(tmp_path):
+    gateway = PartitionSpill(str(tmp_path), "gateway", partitions=4)
+    rows = PartitionSpill(str(tmp_path), "db", partitions=4)
+
+    for i in range(10):
+        gateway.write(f"pay_{i}", _payment(i))
+    gateway.write("pay_late", _payment("late"))       # row exists, created before the window
+    gateway.write("pay_orphan", _payment("orphan"))   # no row anywhere
+    gateway.write("pay_failed", _payment("failed", status="failed"))
+
+    for i in range(5):
+        rows.write(f"pay_{i}", row(i))
+    rows.write("pay_5", row(5, amount_paise=9999))
+    rows.write("pay_6", row(6, status="pending"))
+    rows.write("pay_7", row(7, tx_hash=None, proof_ok=None))
+    rows.write("pay_8", row(8, proof_ok=False))
+    rows.write("pay_9", row(9, status="verified_on_chain"))
+    rows.write("pay_ghost", row("ghost"))
+    gateway.close()
+    rows.close()
+
+    mismatches = []
+    hashes = set()
+    matched = join_partitions(gateway, rows, mismatches.append, lambda ids: {"pay_late"} & set(ids), hashes)
+
+    kinds = sorted((m["kind"].value, m["payment_id"]) for m in mismatches)
+    assert kinds == [
+        ("amount_mismatch", "pay_5"),
+        ("bad_merkle_proof", "pay_8"),
+        ("missing_at_gateway", "pay_ghost"),
+        ("missing_in_db", "pay_orphan"),
+        ("not_anchored", "pay_7"),
+        ("status_mismatch", "pay_6"),
+    ]
+    assert matched == 10
+    assert hashes == {"0xabc"}
+
+
+@pytest.mark.anyio
+async def test_rows_at_the_window_edge_are_rechecked_by_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_ID", "rzp_test")
+    monkeypatch.setattr(settings, "RAZORPAY_KEY_SECRET", "secret")
+    end = START + timedelta(days=1)
+    end_ts = int(end.timestamp())
+    # Rows created just before `end`; their payments were created just after it
+    payments = [(end_ts + 2, _payment("edge")), (end_ts + 5, _payment("short", amount=5000))]
+    service = PaymentService(transport=httpx.ASGITransport(app=fake_gateway(payments)))
+
+    gateway = PartitionSpill(str(tmp_path), "gateway", partitions=4)
+    rows = PartitionSpill(str(tmp_path), "db", partitions=4)
+    await spill_gateway_payments(service, START, end, gateway)
+    for i in ("edge", "short", "ghost"):
+        rows.write(f"pay_{i}", row(i))
+    gateway.close()
+    rows.close()
+
+    mismatches, misses = [], []
+    assert join_partitions(gateway, rows, mismatches.append, lambda ids: set(), on_gateway_miss=misses.append) == 0
+    assert mismatches == [] and sorted(m["payment_id"] for m in misses) == ["pay_edge", "pay_ghost", "pay_short"]
+
+    assert await recheck_gateway_misses(service, misses, mismatches.append) == 2
+    await service.aclose()
+    assert sorted((m["kind"].value, m["payment_id"]) for m in mismatches) == [
+        ("amount_mismatch", "pay_short"),
+        ("missing_at_gateway", "pay_ghost"),
+    ]
+
+
+@pytest.mark.anyio
+async def test_failed_lookups_are_reported_per_row():
+    class FlakyService:
+        def __init__(self):
+            self.in_flight = self.peak = 0
+
+        async def fetch_payment_async(self, payment_id):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0)
+            self.in_flight -= 1
+            if payment_id == "pay_busy":
+                raise HTTPException(status_code=500, detail="Payment Gateway Error: 429 Too Many Requests")
+            return _payment(payment_id.removeprefix("pay_"))
+
+    service = FlakyService()
+    mismatches = []
+    rows = (row(i) for i in ["busy"] + list(range(9)))
+    assert await recheck_gateway_misses(service, rows, mismatches.append, chunk_size=4) == 9
+
+    assert service.peak == 4
+    assert [(m["kind"], m["payment_id"]) for m in mismatches] == [(MismatchKind.GATEWAY_LOOKUP_FAILED, "pay_busy")]
+    assert "429" in mismatches[0]["error"]
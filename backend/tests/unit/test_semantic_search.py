@@ -0,0 +1,120 @@
+import uuid
+import numpy as np
+import pytest
+from app.api import deps
+from app.main import app
+from app.services.ai.embeddings import EMBEDDING_DIM, TextEmbedder, embed_to_memmap, hashed_ngrams
+from app.services.ai.vector_index import IVFIndex, exact_search
+from app.services.discovery import semantic
+from app.services.discovery.semantic import SemanticIndex, build_semantic_index
+
+BIOS = [
+    "Gym rat and fitness coach, daily workout plans",
+    "Fitness trainer sharing workout and protein tips",
+    "Software developer building AI gadgets",
+    "Crypto and blockchain developer, writing code daily",
+    "Foodie sharing delicious recipes from my restaurant",
+    "",
+]
+
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return iter(self.values)
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = sorted(rows)
+
+    def execute(self, query):
+        column = query.selected_columns[0].key
+        return FakeResult([user_id if column == "user_id" else bio for user_id, bio in self.rows])
+
+
+def test_ngrams_stay_within_documents():
+    pairs = hashed_ngrams(["ab", "cd"])
+    # " ab " and " cd " have two 3-grams and one 4-gram each; nothing spans both
+    assert sorted(np.bincount(pairs[:, 0]).tolist()) == [3, 3]
+    assert hashed_ngrams([""]).shape == (0, 2)
+
+
+def test_embeddings():
+    embedder = TextEmbedder().fit(BIOS)
+    vectors = embedder.transform(BIOS)
+    assert vectors.shape == (len(BIOS), EMBEDDING_DIM) and vectors.dtype == np.float32
+    assert np.linalg.norm(vectors[:-1], axis=1) == pytest.approx(1, abs=1e-5)
+    assert not vectors[-1].any()
+    similarity = vectors @ vectors.T
+    assert similarity[0, 1] > similarity[0, 2] and similarity[2, 3] > similarity[2, 4]
+    # Deterministic: a reloaded embedder gives the same vectors
+    np.testing.assert_allclose(TextEmbedder(idf=embedder.idf).transform(BIOS), vectors)
+
+
+def test_memmap_and_ivf_match_exact_search(tmp_path):
+    rng = np.random.default_rng(0)
+    texts = [" ".join(rng.choice(BIOS[0].split() + BIOS[2].split() + BIOS[4].split(), size=6)) for _ in range(600)]
+    embedder = TextEmbedder().fit(texts)
+    vectors = embed_to_memmap(embedder, texts, len(texts), str(tmp_path / "v.npy"), batch_size=100)
+    np.testing.assert_allclose(np.load(tmp_path / "v.npy", mmap_mode="r"), embedder.transform(texts), rtol=1e-5)
+    with pytest.raises(ValueError):
+        embed_to_memmap(embedder, texts, len(texts) + 1, str(tmp_path / "w.npy"))
+
+    index = IVFIndex.build(vectors, n_lists=8, path=str(tmp_path / "ivf.npy"))
+    assert sorted(index.order.tolist()) == list(range(len(texts)))
+    query = embedder.embed("daily workout code")
+    # Probing every list is exhaustive
+    rows, scores = index.search(query, k=5, n_probe=8)
+    _, expected_scores = exact_search(vectors, query, k=5)
+    assert scores == pytest.approx(expected_scores, abs=1e-5)
+    approximate, _ = index.search(query, k=5, n_probe=2)
+    assert len(approximate) == 5
+
+
+def test_ivf_with_more_lists_than_vectors():
+    vectors = TextEmbedder().fit(BIOS[:3]).transform(BIOS[:3])
+    index = IVFIndex.build(vectors, n_lists=8)
+    assert index.n_lists == 3 and index.offsets[-1] == 3
+    rows, _ = index.search(vectors[0], k=2, n_probe=8)
+    assert rows[0] == 0 and len(rows) == 2
+    empty = IVFIndex.build(vectors[:0])
+    assert empty.n_lists == 0 and len(empty.search(vectors[0])[0]) == 0
+
+
+def test_build_and_load_semantic_index(tmp_path):
+    rows = [(uuid.uuid4(), bio) for bio in BIOS] + [(uuid.uuid4(), None)]
+    directory = str(tmp_path / "semantic")
+    built = build_semantic_index(FakeSession(rows), directory, n_lists=2, batch_size=3)
+
+    loaded = SemanticIndex.load(directory)
+    assert len(loaded) == len(rows)
+    by_id = dict(rows)
+    for index in (built, loaded):
+        results = index.search("protein workout at the gym", k=2, n_probe=2)
+        assert {by_id[user_id] for user_id, _ in results} == set(BIOS[:2])
+        assert index.search("", k=2) == []
+
+
+@pytest.mark.anyio
+async def test_semantic_search_endpoint(client, tmp_path, monkeypatch):
+    rows = [(uuid.uuid4(), bio) for bio in BIOS]
+    directory = str(tmp_path / "semantic")
+    build_semantic_index(FakeSession(rows), directory, n_lists=2)
+    monkeypatch.setattr(semantic, "_semantic_index", None)
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=str(uuid.uuid4()), role="brand")
+    try:
+        monkeypatch.setattr(semantic.settings, "SEMANTIC_INDEX_DIR", None)
+        assert (await client.get("/api/v1/discovery/semantic", params={"q": "gym"})).status_code == 503
+
+        monkeypatch.setattr(semantic.settings, "SEMANTIC_INDEX_DIR", directory)
+        response = await client.get("/api/v1/discovery/semantic", params={"q": "protein workout at the gym", "limit": 2})
+        assert response.status_code == 200
+        by_id = {str(user_id): bio for user_id, bio in rows}
+        assert {by_id[item["user_id"]] for item in response.json()["items"]} == set(BIOS[:2])
+        assert semantic.get_semantic_index() is semantic.get_semantic_index()
+        assert (await client.get("/api/v1/discovery/semantic", params={"q": ""})).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
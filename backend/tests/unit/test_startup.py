@@ -0,0 +1,95 @@
+import re
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from app.services.blockchain import service as blockchain
+from app.services.payment import razorpay_service
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Heavy SDKs that only the code paths using them may import
+LAZY_MODULES = ("web3", "eth_account", "razorpay")
+# `python -X importtime` cumulative time of `import app.main` (instrumented, so slower than a plain import)
+IMPORT_BUDGET_SECONDS = 3.5
+# Time spent executing app.* module bodies themselves, excluding the libraries they import
+APP_MODULES_BUDGET_SECONDS = 0.5
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def import_profile(module: str):
+    """
+    Runs `python -X importtime -c "import <module>"` in a fresh interpreter.
+    Returns {module name: (self us, cumulative us)}.
+    """
+    run = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert run.returncode == 0, run.stderr[-2000:]
+    profile = {}
+    for line in run.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            profile[match[4]] = (int(match[1]), int(match[2]))
+    return profile
+
+
+def test_app_import_time_budget():
+    profile = import_profile("app.main")
+
+    loaded = {name.split(".")[0] for name in profile}
+    assert not loaded & set(LAZY_MODULES), f"imported at startup: {sorted(loaded & set(LAZY_MODULES))}"
+
+    total = profile["app.main"][1] / 1e6
+    assert total < IMPORT_BUDGET_SECONDS, f"import app.main took {total:.2f}s"
+
+    app_self = sum(self_us for name, (self_us, _) in profile.items() if name.split(".")[0] == "app") / 1e6
+    slowest = sorted((self_us, name) for name, (self_us, _) in profile.items() if name.startswith("app"))[-3:]
+    assert app_self < APP_MODULES_BUDGET_SECONDS, f"app modules took {app_self:.2f}s, slowest: {slowest}"
+
+
+def test_services_are_built_on_first_use(monkeypatch):
+    monkeypatch.setattr(razorpay_service, "_payment_service", None)
+    monkeypatch.setattr(blockchain, "_blockchain_service", None)
+    monkeypatch.setattr(blockchain.settings, "WALLET_PRIVATE_KEY", None)
+
+    payments = razorpay_service.get_payment_service()
+    assert razorpay_service.get_payment_service() is payments
+    chain = blockchain.get_blockchain_service()
+    assert blockchain.get_blockchain_service() is chain and chain.account is None
+
+
+def test_concurrent_first_calls_build_one_service(monkeypatch):
+    monkeypatch.setattr(razorpay_service, "_payment_service", None)
+    monkeypatch.setattr(blockchain, "_blockchain_service", None)
+    built = []
+
+    def slow_service(*args, **kwargs):
+        # Widen the window between the None check and the assignment
+        time.sleep(0.05)
+        built.append(object())
+        return built[-1]
+
+    for module, getter, name in (
+        (razorpay_service, razorpay_service.get_payment_service, "PaymentService"),
+        (blockchain, blockchain.get_blockchain_service, "BlockchainService"),
+    ):
+        monkeypatch.setattr(module, name, slow_service)
+        built.clear()
+        barrier = threading.Barrier(8)
+        results = []
+
+        def first_call():
+            barrier.wait()
+            results.append(getter())
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(built) == 1, name
+        assert all(result is built[0] for result in results)
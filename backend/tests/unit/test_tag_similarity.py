@@ -0,0 +1,104 @@
+import uuid
+import numpy as np
+import pytest
+from app.api import deps
+from app.main import app
+from app.services.discovery.catalog import CatalogChunk, CatalogSnapshot, InfluencerCatalog
+from app.services.discovery.similarity import SimilarityEngine, similarity_engine
+
+BRAND_ID = "8d5e6f2a-1b3c-4d5e-9f70-123456789abc"
+
+
+def random_rows(n, seed=5):
+    rng = np.random.default_rng(seed)
+    tags = [f"tag{i}" for i in range(40)]
+    return [
+        (uuid.uuid4(), rng.choice(tags, size=rng.integers(0, 6), replace=False).tolist(), 1.0, 0.1, None)
+        for _ in range(n)
+    ]
+
+
+def catalog_of(rows):
+    catalog = InfluencerCatalog()
+    vocabulary = {}
+    catalog._snapshot = CatalogSnapshot.empty().apply(CatalogChunk(rows, vocabulary), vocabulary)
+    catalog.loaded = True
+    return catalog
+
+
+def brute_force(rows, query, k, exclude=None):
+    scores = []
+    for user_id, niche, *_ in rows:
+        union = len(query | set(niche))
+        score = len(query & set(niche)) / union if union else 0
+        if score > 0 and user_id != exclude:
+            scores.append(score)
+    return sorted(scores, reverse=True)[:k]
+
+
+def test_exact_matches_brute_force():
+    rows = random_rows(3000)
+    engine = SimilarityEngine(catalog_of(rows))
+    for query in ({"tag1"}, {"tag2", "tag30", "tag39"}, {"tag5", "unknown"}):
+        got = engine.similar_to_tags(query, k=15)
+        assert [score for _, score in got] == pytest.approx(brute_force(rows, query, 15))
+
+    user_id, niche = rows[7][0], set(rows[7][1] or ["tag0"])
+    rows[7] = (user_id, sorted(niche), 1.0, 0.1, None)
+    engine = SimilarityEngine(catalog_of(rows))
+    got = engine.similar_to_influencer(user_id, k=10)
+    assert user_id not in {u for u, _ in got}
+    assert [score for _, score in got] == pytest.approx(brute_force(rows, niche, 10, exclude=user_id))
+    assert engine.similar_to_influencer(uuid.uuid4()) is None
+    assert engine.similar_to_tags(["nobody-has-this"]) == []
+
+
+def test_lsh_finds_near_duplicates():
+    rows = random_rows(5000)
+    query = {"tag1", "tag2", "tag3", "tag4", "tag5"}
+    twins = [(uuid.uuid4(), sorted(query), 1.0, 0.1, None) for _ in range(5)]
+    rows += twins
+    catalog = catalog_of(rows)
+
+    approximate = SimilarityEngine(catalog, lsh_min_rows=1)
+    got = approximate.similar_to_tags(query, k=5)
+    assert {u for u, _ in got} == {t[0] for t in twins}
+    assert all(score == 1.0 for _, score in got)
+    # Candidates are scored exactly: nothing is ranked above the true similarity
+    partial = {"tag1", "tag2", "tag3"}
+    exact = dict(SimilarityEngine(catalog).similar_to_tags(partial, k=len(rows)))
+    for user_id, score in approximate.similar_to_tags(partial, k=50):
+        assert exact[user_id] == pytest.approx(score)
+
+
+@pytest.fixture
+def brand_user():
+    app.dependency_overrides[deps.get_current_user] = lambda: deps.TokenData(id=BRAND_ID, role="brand")
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.anyio
+async def test_similar_endpoints(client, brand_user, monkeypatch):
+    rows = random_rows(200)
+    target = rows[0][0]
+    rows[0] = (target, ["tag1", "tag2"], 1.0, 0.1, None)
+    catalog = catalog_of(rows)
+    monkeypatch.setattr(similarity_engine, "catalog", catalog)
+
+    response = await client.get("/api/v1/discovery/similar", params={"tags": ["tag1", "tag2"], "limit": 3})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert items[0] == {"user_id": str(target), "similarity": 1.0}
+    assert len(items) <= 3
+
+    response = await client.get(f"/api/v1/discovery/influencers/{target}/similar")
+    assert response.status_code == 200
+    assert str(target) not in {item["user_id"] for item in response.json()["items"]}
+
+    response = await client.get(f"/api/v1/discovery/influencers/{uuid.uuid4()}/similar")
+    assert response.status_code == 404
+    assert (await client.get("/api/v1/discovery/similar")).status_code == 422
+
+    catalog.loaded = False
+    assert (await client.get("/api/v1/discovery/similar", params={"tags": "tag1"})).status_code == 503
@@ -29,9 +29,29 @@ CREATE TABLE public.influencers (
     user_id UUID REFERENCES public.users(id) ON DELETE CASCADE PRIMARY KEY,
     username TEXT NOT NULL,
     bio TEXT,
-    niche TEXT[],  -- Array of tags for AI matching
-    metrics JSONB DEFAULT '{}', -- Flexible metrics (follower count, engagement rate)
-    wallet_address TEXT -- For Blockchain verification
+    niche JSONB,  -- Array of tags for AI matching: ["tech", "ai"]
+    metrics JSONB DEFAULT '{}', -- Flexible metrics; 'followers' and 'engagement_rate' must be JSON numbers
+    wallet_address TEXT, -- For Blockchain verification
+    bio_hash TEXT, -- SHA-256 of the bio 'niche' was derived from (AI enrichment)
+    taxonomy_version TEXT, -- AIEngine taxonomy fingerprint used for 'niche'
+    updated_at TIMESTAMPTZ DEFAULT NOW() -- bumped on every update (ORM onupdate); catalog refresh watermark
+);
+
+-- 4b. SOCIAL PROFILES (Ingested from CSV / API sync, see NormalizedInfluencerData)
+CREATE TABLE public.social_profiles (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    platform TEXT NOT NULL,
+    platform_id TEXT NOT NULL, -- External ID (e.g. YouTube Channel ID, or handle for CSV uploads)
+    username TEXT NOT NULL,
+    display_name TEXT,
+    follower_count BIGINT DEFAULT 0,
+    engagement_rate DOUBLE PRECISION,
+    profile_url TEXT NOT NULL,
+    tags JSONB DEFAULT '[]',
+    raw_metrics_snapshot JSONB DEFAULT '{}',
+    source TEXT NOT NULL,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    CONSTRAINT uq_social_profiles_platform_id UNIQUE (platform, platform_id)
 );
 
 -- 5. CAMPAIGNS (Owned by Brands)
@@ -53,7 +73,9 @@ CREATE TABLE public.transactions (
     influencer_id UUID REFERENCES public.influencers(user_id),
     amount DECIMAL(10, 2) NOT NULL,
     razorpay_payment_id TEXT, -- Payment Gateway Reference
-    blockchain_tx_hash TEXT UNIQUE, -- Immutable Blockchain Record
+    blockchain_tx_hash TEXT, -- Immutable Blockchain Record (shared by every record of a Merkle batch)
+    merkle_root TEXT, -- Root anchored on-chain for the batch this record belongs to
+    merkle_proof JSONB, -- Inclusion proof: [{"position": "left"|"right", "hash": "0x.."}]
     status transaction_status DEFAULT 'pending',
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -66,6 +88,7 @@ CREATE TABLE public.transactions (
 ALTER TABLE public.users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.brands ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.influencers ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.social_profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.campaigns ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.transactions ENABLE ROW LEVEL SECURITY;
 
@@ -104,7 +127,23 @@ CREATE POLICY "View transactions involved in" ON public.transactions
 CREATE INDEX idx_campaigns_brand ON public.campaigns(brand_id);
 CREATE INDEX idx_transactions_campaign ON public.transactions(campaign_id);
 CREATE INDEX idx_transactions_influencer ON public.transactions(influencer_id);
+CREATE INDEX idx_transactions_tx_hash ON public.transactions(blockchain_tx_hash);
 
 -- Search optimization for Influencer discovery
 CREATE INDEX idx_influencers_niche ON public.influencers USING GIN(niche);
 CREATE INDEX idx_influencers_metrics ON public.influencers USING GIN(metrics);
+-- Hot metric keys: range filters + keyset pagination order (value DESC, user_id DESC).
+-- NULL unless the key holds a JSON number, so stray strings never break a cast.
+-- Queries must use these exact expressions (app/models/user.py: metric_value).
+CREATE INDEX idx_influencers_followers ON public.influencers ((
+    CASE WHEN jsonb_typeof(metrics->'followers') = 'number' THEN (metrics->>'followers')::numeric END
+), user_id);
+CREATE INDEX idx_influencers_engagement ON public.influencers ((
+    CASE WHEN jsonb_typeof(metrics->'engagement_rate') = 'number' THEN (metrics->>'engagement_rate')::numeric END
+), user_id);
+
+-- Targeted AI re-enrichment after taxonomy edits
+CREATE INDEX idx_influencers_taxonomy_version ON public.influencers(taxonomy_version);
+
+-- Incremental loads of the in-memory influencer catalog
+CREATE INDEX idx_influencers_updated_at ON public.influencers(updated_at);